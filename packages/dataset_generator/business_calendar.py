@@ -0,0 +1,130 @@
+import datetime
+from functools import lru_cache
+from itertools import chain
+import holidays
+import numpy as np
+
+
+DEFAULT_COUNTRY = 'PT'
+
+DAYS_IN_INDEX = 31  # Every month is indexed over days 1-31, days that do not exist are never business days
+
+CALENDAR_CACHE_SIZE = 256   # Number of (country, year, month) entries kept before the least recently used is evicted
+
+
+@lru_cache(maxsize=32)
+def get_country_holidays(country, year):
+    """
+    Returns the holidays of a country for a year (cached so they are only built once)
+    :param country: The country code
+    :param year: The year
+    :return: The holidays object
+    """
+    return holidays.country_holidays(country, years=year)
+
+
+@lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def get_business_day_bitmask(country, year, month):
+    """
+    Returns the business days of a month as a bitmask where bit i - 1 is set if day i is a business day
+    :param country: The country code used for the holidays
+    :param year: The year
+    :param month: The month
+    :return: The business day bitmask
+    """
+    country_holidays = get_country_holidays(country, year)
+    bitmask = 0
+    for i in range(1, DAYS_IN_INDEX + 1):
+        try:
+            this_date = datetime.date(year, month, i)
+        except ValueError:
+            break
+        # Monday == 0, Sunday == 6
+        if this_date.weekday() < 5 and this_date not in country_holidays:
+            bitmask |= 1 << (i - 1)
+
+    return bitmask
+
+
+@lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def get_business_day_mask(country, year, month):
+    """
+    Returns the business days of a month as a read-only boolean array over days 1-31
+    :param country: The country code used for the holidays
+    :param year: The year
+    :param month: The month
+    :return: The business day mask (index 0 is day 1)
+    """
+    bitmask = get_business_day_bitmask(country, year, month)
+    mask = (bitmask >> np.arange(DAYS_IN_INDEX)) & 1 == 1
+    mask.flags.writeable = False    # Shared between callers through the cache
+
+    return mask
+
+
+def leave_days_to_bitmask(leave_days):
+    """
+    Converts a collection of days of the month to a bitmask (days outside 1-31 are ignored)
+    :param leave_days: The days of the month
+    :return: The bitmask
+    """
+    bitmask = 0
+    for day in leave_days:
+        if 1 <= day <= DAYS_IN_INDEX:
+            bitmask |= 1 << (int(day) - 1)  # A Python int, numpy integers have no bit_count
+
+    return bitmask
+
+
+def leave_days_to_mask(leave_days_batch):
+    """
+    Converts a batch of leave day collections to a (batch x 31) boolean mask
+    :param leave_days_batch: A sequence with a collection of days of the month for each employee
+    :return: The leave day mask
+    """
+    lengths = [len(leave_days) for leave_days in leave_days_batch]
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    days = np.fromiter(chain.from_iterable(leave_days_batch), dtype=np.int64, count=sum(lengths))
+
+    in_range = (days >= 1) & (days <= DAYS_IN_INDEX)
+    mask = np.zeros((len(lengths), DAYS_IN_INDEX), dtype=bool)
+    mask[rows[in_range], days[in_range] - 1] = True
+
+    return mask
+
+
+def is_leave_days_batch(leave_days):
+    """
+    Checks if leave days are a batch (a 2D mask or a sequence of collections) rather than a single collection of days
+    :param leave_days: The leave days
+    :return: True if the leave days are a batch
+    """
+    if isinstance(leave_days, np.ndarray):
+        return leave_days.ndim == 2
+
+    return any(not isinstance(day, (int, np.integer)) for day in leave_days)
+
+
+def count_business_days(leave_days=None, year=None, month=None, country=DEFAULT_COUNTRY):
+    """
+    Returns the number of business days in a month with the leave days subtracted
+    :param leave_days: The days that the employee is on leave, or a batch of them (a sequence of collections of days
+    or a (batch x 31) boolean mask)
+    :param year: The year (defaults to the current one)
+    :param month: The month (defaults to the current one)
+    :param country: The country code used for the holidays
+    :return: The number of business days, or an array with one count per batch entry
+    """
+    now = datetime.datetime.now()
+    year = now.year if year is None else year
+    month = now.month if month is None else month
+
+    if leave_days is None:
+        leave_days = []
+
+    if is_leave_days_batch(leave_days):
+        leave_mask = leave_days if isinstance(leave_days, np.ndarray) else leave_days_to_mask(leave_days)
+        return (get_business_day_mask(country, year, month) & ~leave_mask).sum(axis=1)
+
+    business_days = get_business_day_bitmask(country, year, month) & ~leave_days_to_bitmask(leave_days)
+    return business_days.bit_count()
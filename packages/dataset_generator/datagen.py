@@ -1,7 +1,8 @@
 import random
+import numpy as np
 import pandas as pd
 import datetime
-import holidays
+from packages.dataset_generator.business_calendar import count_business_days
 
 
 MIN_UNITS_PROCESSED = 100
@@ -12,27 +13,24 @@ PERCENTAGE_OF_ALLOWED_DEFECTS = 0.1
 EFFICIENCY_FACTOR_MIN = 0.8
 EFFICIENCY_FACTOR_MAX = 1.0
 
+MAX_LEAVE_DAYS = 5
+HOURS_PER_BUSINESS_DAY = 8
+
+# Narrowest dtypes that hold every value the generator can produce
+COMPACT_DTYPES = {'units_processed': np.int16,
+                  'number_of_defects': np.int16,
+                  'total_labor_hours': np.int16,
+                  'efficiency_factor': np.float32,
+                  'unit_processing_time': np.float32,
+                  }
+
 def get_business_days(leave_days=None):
     """
     Returns the number of business days in the current month
-    :param leave_days: The days that the employee is on leave
+    :param leave_days: The days that the employee is on leave (or a batch of them, see count_business_days)
     :return: The number of business days
     """
-    if leave_days is None:
-        leave_days = []
-    now = datetime.datetime.now()
-    pt_holidays = holidays.country_holidays('PT')
-    business_days = 0
-    for i in range(1, 32):
-        try:
-            this_date = datetime.date(now.year, now.month, i)
-        except ValueError:
-            break
-        # Monday == 0, Sunday == 6
-        if this_date.weekday() < 5 and this_date not in pt_holidays and this_date.day not in leave_days:
-            business_days += 1
-
-    return business_days
+    return count_business_days(leave_days)
 
 
 # units per hour
@@ -43,7 +41,20 @@ def get_productivity(units_processed, number_of_defects, total_labor_hours, effi
 def get_unit_processing_time(units_processed, number_of_defects, total_labor_hours, efficiency_factor):
     return (total_labor_hours * efficiency_factor) / (units_processed - number_of_defects)
 
-def generate_dataset(number_of_employees):
+def generate_dataset(number_of_employees, seed=None, vectorized=False, compact=False, categorical_ids=False):
+    """
+    Generates a monthly dataset of employee performance data for a task
+    :param number_of_employees: The number of employees
+    :param seed: The seed used for the vectorized generation (ignored otherwise)
+    :param vectorized: Whether to draw all columns at once with NumPy instead of looping over the employees
+    :param compact: Whether to store the columns with the narrow dtypes of COMPACT_DTYPES
+    :param categorical_ids: Whether to store the employee ids as a categorical index (only used if compact)
+    :return: The dataset dataframe indexed by employee id
+    """
+    if vectorized:
+        df = generate_dataset_vectorized(number_of_employees, seed)
+        return compact_dataset(df, categorical_ids) if compact else df
+
     data = {'units_processed': [],
             'number_of_defects': [],
             'total_labor_hours': [],
@@ -64,8 +75,8 @@ def generate_dataset(number_of_employees):
         max_number_of_defects = int(units_processed * PERCENTAGE_OF_ALLOWED_DEFECTS)    # Round down number
         number_of_defects = random.randint(0, max_number_of_defects)
         
-        leave_days = random.sample(range(1, 32), random.randint(0, 5))  # Randomly select a number of days to be on leave
-        total_labor_hours = get_business_days(leave_days) * 8
+        leave_days = random.sample(range(1, 32), random.randint(0, MAX_LEAVE_DAYS))  # Randomly select a number of days to be on leave
+        total_labor_hours = get_business_days(leave_days) * HOURS_PER_BUSINESS_DAY
 
         efficiency_factor = random.uniform(EFFICIENCY_FACTOR_MIN, EFFICIENCY_FACTOR_MAX)
 
@@ -90,4 +101,82 @@ def generate_dataset(number_of_employees):
     df = pd.DataFrame(data, index=index)
     df.index.name = "employee_id"
 
+    return compact_dataset(df, categorical_ids) if compact else df
+
+
+def compact_dataset(df, categorical_ids=False):
+    """
+    Converts a dataset to the narrow dtypes of COMPACT_DTYPES
+    :param df: The dataset dataframe
+    :param categorical_ids: Whether to convert the employee id index to a categorical index
+    :return: The compact dataset dataframe
+    """
+    df = df.astype({column: dtype for column, dtype in COMPACT_DTYPES.items() if column in df.columns})
+
+    if categorical_ids:
+        df.index = pd.CategoricalIndex(df.index, name=df.index.name)
+
+    return df
+
+
+def draw_leave_mask(rng, number_of_employees):
+    """
+    Draws the leave days of every employee at once, mirroring random.sample(range(1, 32), randint(0, MAX_LEAVE_DAYS))
+    :param rng: The numpy random generator
+    :param number_of_employees: The number of employees
+    :return: A (employees x 31) boolean mask of the days each employee is on leave
+    """
+    number_of_leave_days = rng.integers(0, MAX_LEAVE_DAYS, size=number_of_employees, endpoint=True)
+    # Ranking random keys gives a uniform permutation of the days for each employee
+    day_ranks = rng.random((number_of_employees, 31)).argsort(axis=1).argsort(axis=1)
+    return day_ranks < number_of_leave_days[:, None]
+
+
+def draw_dataset_columns(rng, number_of_employees, year, month):
+    """
+    Draws the dataset columns of a month for a number of employees
+    :param rng: The numpy random generator
+    :param number_of_employees: The number of employees
+    :param year: The year of the month to simulate
+    :param month: The month to simulate
+    :return: A dictionary with an array for each dataset column
+    """
+    units_processed = rng.integers(MIN_UNITS_PROCESSED, MAX_UNITS_PROCESSED, size=number_of_employees, endpoint=True)
+
+    max_number_of_defects = (units_processed * PERCENTAGE_OF_ALLOWED_DEFECTS).astype(np.int64)  # Round down number
+    number_of_defects = rng.integers(0, max_number_of_defects, endpoint=True)
+
+    leave_mask = draw_leave_mask(rng, number_of_employees)
+    business_days = count_business_days(leave_mask, year, month)
+    total_labor_hours = business_days * HOURS_PER_BUSINESS_DAY
+
+    efficiency_factor = rng.uniform(EFFICIENCY_FACTOR_MIN, EFFICIENCY_FACTOR_MAX, size=number_of_employees)
+
+    unit_processing_time = get_unit_processing_time(units_processed, number_of_defects, total_labor_hours, efficiency_factor)
+
+    return {'units_processed': units_processed,
+            'number_of_defects': number_of_defects,
+            'total_labor_hours': total_labor_hours,
+            'efficiency_factor': efficiency_factor,
+            'unit_processing_time': unit_processing_time,
+            }
+
+
+def generate_dataset_vectorized(number_of_employees, seed=None, year=None, month=None):
+    """
+    Generates the same dataset as generate_dataset, drawing every column at once from a seeded numpy generator
+    :param number_of_employees: The number of employees
+    :param seed: The seed (or numpy SeedSequence/Generator) used to make the dataset reproducible
+    :param year: The year of the month to simulate (defaults to the current one)
+    :param month: The month to simulate (defaults to the current one)
+    :return: The dataset dataframe indexed by employee id
+    """
+    now = datetime.datetime.now()
+    year = now.year if year is None else year
+    month = now.month if month is None else month
+
+    data = draw_dataset_columns(np.random.default_rng(seed), number_of_employees, year, month)
+
+    df = pd.DataFrame(data, index=pd.RangeIndex(number_of_employees, name="employee_id"))
+
     return df
@@ -0,0 +1,229 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections.abc import MutableMapping
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_STORE_DIRECTORY = os.environ.get("DATASET_STORE_DIRECTORY", "dataset_store")
+STORE_MAX_AGE = 7 * 24 * 3600   # Seconds after which the store of a workspace nobody opened is removed
+
+MANIFEST_FILE = "manifest.json"
+METADATA_FILE = "metadata.json"
+INDEX_FILE = "index.npy"
+
+
+def write_json(path, data):
+    """
+    Writes a JSON file atomically so other sessions never read a partially written file. Every writer uses its own
+    temporary file, so concurrent writers never replace each other's temporary file
+    :param path: The path of the file
+    :param data: The data to write
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                                       prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def is_valid_dataset_name(name):
+    """
+    Checks if a dataset name can be used as the name of its directory in the store
+    :param name: The name of the dataset
+    :return: True if the name is not empty, has no path separators and does not start with a dot
+    """
+    return bool(name) and os.sep not in name and not (os.altsep and os.altsep in name) and not name.startswith(".")
+
+
+def get_workspace_store_directory(workspace_id, directory=DEFAULT_STORE_DIRECTORY):
+    """
+    Returns the directory of the dataset store of a workspace. Sessions of different workspaces never change each
+    other's datasets, and a session that opens an existing workspace (e.g. after a reload or a restart of the server)
+    finds its datasets again
+    :param workspace_id: The identifier of the workspace
+    :param directory: The directory shared by the stores of every workspace
+    :return: The directory of the store of the workspace
+    """
+    return os.path.join(directory, workspace_id)
+
+
+def remove_stale_stores(directory=DEFAULT_STORE_DIRECTORY, max_age=STORE_MAX_AGE):
+    """
+    Removes the workspace stores that were neither opened nor written for a while, so abandoned workspaces do not
+    keep their datasets on disk forever
+    :param directory: The directory shared by the stores of every workspace
+    :param max_age: The number of seconds since the last use after which a store is removed
+    """
+    if not os.path.isdir(directory):
+        return
+
+    now = time.time()
+    for entry in os.listdir(directory):
+        store_directory = os.path.join(directory, entry)
+        if not os.path.isdir(store_directory):
+            continue
+
+        # Opening a store touches its directory, writing a dataset replaces its manifest
+        manifest_path = os.path.join(store_directory, MANIFEST_FILE)
+        last_use = max(os.path.getmtime(store_directory),
+                       os.path.getmtime(manifest_path) if os.path.exists(manifest_path) else 0)
+        if now - last_use > max_age:
+            shutil.rmtree(store_directory, ignore_errors=True)
+
+
+class DatasetStore(MutableMapping):
+    """
+    Dataset store backed by one memory-mapped .npy file per column. It behaves like the datasets dictionary
+    ({name: (dataset, capacity, difficulty)}) but datasets are read as zero-copy views of the files. Each workspace uses
+    its own directory (see get_workspace_store_directory). Writing a dataset creates a new version directory and
+    switches the manifest to it, so files that may still be memory-mapped are never written over
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIRECTORY):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        os.utime(directory)     # Mark the store as used (see remove_stale_stores)
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def _dataset_directory(self, name):
+        if not is_valid_dataset_name(name):
+            raise ValueError(f"Invalid dataset name: {name!r}")
+
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self):
+        """
+        Returns the manifest, which maps the name of each dataset to its current version
+        """
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _version_directory(self, name):
+        manifest = self._read_manifest()
+        if name not in manifest:
+            raise KeyError(name)
+
+        return os.path.join(self._dataset_directory(name), manifest[name])
+
+    def _read_metadata(self, name):
+        with open(os.path.join(self._version_directory(name), METADATA_FILE)) as f:
+            return json.load(f)
+
+    def __setitem__(self, name, value):
+        dataset, capacity, difficulty = value
+        version = uuid.uuid4().hex
+        version_directory = os.path.join(self._dataset_directory(name), version)
+        os.makedirs(version_directory)
+
+        for column in dataset.columns:
+            np.save(os.path.join(version_directory, f"{column}.npy"), dataset[column].to_numpy())
+
+        range_index = isinstance(dataset.index, pd.RangeIndex) and dataset.index.start == 0 and dataset.index.step == 1
+        if not range_index:
+            np.save(os.path.join(version_directory, INDEX_FILE), np.asarray(dataset.index))
+
+        write_json(os.path.join(version_directory, METADATA_FILE),
+                   {"columns": list(dataset.columns),
+                    "length": len(dataset),
+                    "index_name": dataset.index.name,
+                    "range_index": range_index,
+                    "categorical_index": isinstance(dataset.index, pd.CategoricalIndex),
+                    "capacity": int(capacity),
+                    "difficulty": int(difficulty)})
+
+        manifest = self._read_manifest()
+        previous_version = manifest.get(name)
+        manifest[name] = version
+        write_json(self._manifest_path(), manifest)
+
+        # Removing the files of the previous version keeps the memory maps already open on them valid
+        if previous_version is not None:
+            shutil.rmtree(os.path.join(self._dataset_directory(name), previous_version), ignore_errors=True)
+
+    def __getitem__(self, name):
+        metadata = self._read_metadata(name)
+
+        return self._load_dataset(name, metadata), metadata["capacity"], metadata["difficulty"]
+
+    def __delitem__(self, name):
+        manifest = self._read_manifest()
+        if name not in manifest:
+            raise KeyError(name)
+
+        del manifest[name]
+        write_json(self._manifest_path(), manifest)
+        shutil.rmtree(self._dataset_directory(name), ignore_errors=True)
+
+    def __iter__(self):
+        return iter(self._read_manifest())
+
+    def __len__(self):
+        return len(self._read_manifest())
+
+    def __contains__(self, name):
+        return name in self._read_manifest()
+
+    def _load_dataset(self, name, metadata):
+        dataset_directory = self._version_directory(name)
+
+        if metadata["range_index"]:
+            index = pd.RangeIndex(metadata["length"], name=metadata["index_name"])
+        else:
+            values = np.load(os.path.join(dataset_directory, INDEX_FILE), mmap_mode="r")
+            index_type = pd.CategoricalIndex if metadata["categorical_index"] else pd.Index
+            index = index_type(values, name=metadata["index_name"])
+
+        columns = {column: np.load(os.path.join(dataset_directory, f"{column}.npy"), mmap_mode="r")
+                   for column in metadata["columns"]}
+
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def get_column(self, name, column):
+        """
+        Returns a read-only memory-mapped view of a dataset column
+        :param name: The name of the dataset
+        :param column: The name of the column
+        :return: The column array
+        """
+        return np.load(os.path.join(self._version_directory(name), f"{column}.npy"), mmap_mode="r")
+
+    def get_settings(self, name):
+        """
+        Returns the settings of a dataset without opening its columns
+        :param name: The name of the dataset
+        :return: The capacity and difficulty of the dataset
+        """
+        metadata = self._read_metadata(name)
+
+        return metadata["capacity"], metadata["difficulty"]
+
+    def get_number_of_employees(self):
+        """
+        Returns the number of employees of the stored datasets (every dataset has the same number of employees)
+        :return: The number of employees, 0 if the store is empty
+        """
+        manifest = self._read_manifest()
+
+        return self._read_metadata(next(iter(manifest)))["length"] if manifest else 0
+
+    def clear(self):
+        write_json(self._manifest_path(), {})
+        for entry in os.listdir(self.directory):
+            entry_path = os.path.join(self.directory, entry)
+            if os.path.isdir(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
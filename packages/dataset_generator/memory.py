@@ -0,0 +1,33 @@
+import pandas as pd
+
+
+def get_dataset_memory_usage(df):
+    """
+    Returns the memory used by a dataset, including its index
+    :param df: The dataset dataframe
+    :return: The number of bytes
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def get_memory_report(datasets):
+    """
+    Builds a memory report of the datasets
+    :param datasets: The datasets dictionary ({name: (dataset, capacity, difficulty)})
+    :return: A dataframe with the number of employees, bytes per column, total bytes and bytes per employee of each dataset
+    """
+    rows = {}
+    for dataset_name, (dataset, _, _) in datasets.items():
+        usage = dataset.memory_usage(index=True, deep=True)
+        total = int(usage.sum())
+
+        rows[dataset_name] = {"Employees": len(dataset),
+                              **{f"{column} (bytes)": int(usage[column]) for column in dataset.columns},
+                              "Index (bytes)": int(usage["Index"]),
+                              "Total (bytes)": total,
+                              "Bytes per employee": total / len(dataset) if len(dataset) else 0.0}
+
+    report = pd.DataFrame.from_dict(rows, orient="index")
+    report.index.name = "Dataset"
+
+    return report
@@ -0,0 +1,85 @@
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from packages.dataset_generator.datagen import COMPACT_DTYPES, draw_dataset_columns
+
+
+DEFAULT_SHARD_SIZE = 50_000 # Maximum number of employees generated by each shard
+
+
+def get_shard_seed(entropy, task_index, shard_index):
+    """
+    Derives the seed of a shard from the master seed entropy
+    :param entropy: The entropy of the master seed sequence
+    :param task_index: The index of the task of the shard
+    :param shard_index: The index of the shard inside the task
+    :return: The seed sequence of the shard
+    """
+    return np.random.SeedSequence(entropy, spawn_key=(task_index, shard_index))
+
+
+def generate_shard(shard):
+    """
+    Generates the dataset columns of a shard (runs inside the worker processes)
+    :param shard: A (task_index, shard_index, number_of_employees, year, month, entropy) tuple
+    :return: The task index, shard index and a dictionary with an array for each dataset column
+    """
+    task_index, shard_index, number_of_employees, year, month, entropy = shard
+    rng = np.random.default_rng(get_shard_seed(entropy, task_index, shard_index))
+
+    return task_index, shard_index, draw_dataset_columns(rng, number_of_employees, year, month)
+
+
+def generate_datasets_parallel(task_names, number_of_employees, seed=None, shard_size=DEFAULT_SHARD_SIZE,
+                               max_workers=None, year=None, month=None, compact=False):
+    """
+    Generates one dataset per task, splitting the tasks and employees into shards generated on a process pool.
+    Shards only depend on the shard size and the master seed, so the output is the same for any number of workers
+    :param task_names: The names of the tasks
+    :param number_of_employees: The number of employees of every dataset
+    :param seed: The master seed
+    :param shard_size: The maximum number of employees of each shard
+    :param max_workers: The number of worker processes (1 generates every shard in this process)
+    :param year: The year of the month to simulate (defaults to the current one)
+    :param month: The month to simulate (defaults to the current one)
+    :param compact: Whether to store the columns with the narrow dtypes of COMPACT_DTYPES
+    :return: A dictionary with the dataset dataframe of each task
+    """
+    now = datetime.datetime.now()
+    year = now.year if year is None else year
+    month = now.month if month is None else month
+
+    entropy = np.random.SeedSequence(seed).entropy
+    shard_starts = range(0, number_of_employees, shard_size)
+    shards = [(task_index, shard_index, min(shard_size, number_of_employees - first_employee), year, month, entropy)
+              for task_index in range(len(task_names))
+              for shard_index, first_employee in enumerate(shard_starts)]
+
+    # Every shard is copied once into its slice of the preallocated task columns
+    columns = [None] * len(task_names)
+
+    def store_shard(task_index, shard_index, data):
+        if columns[task_index] is None:
+            columns[task_index] = {name: np.empty(number_of_employees,
+                                                  dtype=COMPACT_DTYPES.get(name, values.dtype) if compact else values.dtype)
+                                   for name, values in data.items()}
+
+        first_employee = shard_starts[shard_index]
+        for name, values in data.items():
+            columns[task_index][name][first_employee:first_employee + len(values)] = values
+
+    if max_workers == 1:
+        for shard in shards:
+            store_shard(*generate_shard(shard))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(generate_shard, shards):
+                store_shard(*result)
+
+    datasets = {}
+    for task_index, task_name in enumerate(task_names):
+        df = pd.DataFrame(columns[task_index], index=pd.RangeIndex(number_of_employees, name="employee_id"), copy=False)
+        datasets[task_name] = df
+
+    return datasets
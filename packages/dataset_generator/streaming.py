@@ -0,0 +1,159 @@
+import os
+import numpy as np
+import pandas as pd
+from packages.dataset_generator.business_calendar import DEFAULT_COUNTRY, DAYS_IN_INDEX, get_business_day_mask
+from packages.dataset_generator.datagen import (PERCENTAGE_OF_ALLOWED_DEFECTS, EFFICIENCY_FACTOR_MIN, EFFICIENCY_FACTOR_MAX,
+                                                HOURS_PER_BUSINESS_DAY, draw_dataset_columns, draw_leave_mask,
+                                                get_unit_processing_time)
+
+
+# Record frequencies
+MONTHLY = "monthly"
+DAILY = "daily"
+
+# Daily records use the monthly unit range spread over a typical month of business days
+MIN_UNITS_PROCESSED_PER_DAY = 5
+MAX_UNITS_PROCESSED_PER_DAY = 15
+
+DEFAULT_CHUNK_SIZE = 50_000 # Maximum number of rows in each chunk
+
+# Output formats
+CSV = "csv"
+PARQUET = "parquet"
+
+
+def get_periods(year, month, number_of_months):
+    """
+    Returns the consecutive (year, month) periods starting at a given month
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months
+    :return: The list of (year, month) tuples
+    """
+    first = year * 12 + month - 1
+    return [(i // 12, i % 12 + 1) for i in range(first, first + number_of_months)]
+
+
+def get_chunk_generator(seed_sequence, period_index, chunk_index):
+    """
+    Returns the random generator of a chunk, derived from the master seed so each chunk is reproducible on its own
+    :param seed_sequence: The master seed sequence
+    :param period_index: The index of the period of the chunk
+    :param chunk_index: The index of the chunk inside the period
+    :return: The numpy random generator
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed_sequence.entropy, spawn_key=(period_index, chunk_index)))
+
+
+def draw_daily_records(rng, first_employee, number_of_employees, year, month):
+    """
+    Draws one record per employee for each business day of a month they are not on leave
+    :param rng: The numpy random generator
+    :param first_employee: The id of the first employee
+    :param number_of_employees: The number of employees
+    :param year: The year
+    :param month: The month
+    :return: A dictionary with an array for each record column
+    """
+    working_days = get_business_day_mask(DEFAULT_COUNTRY, year, month) & ~draw_leave_mask(rng, number_of_employees)
+    employees, days = np.nonzero(working_days)
+    number_of_records = len(employees)
+
+    units_processed = rng.integers(MIN_UNITS_PROCESSED_PER_DAY, MAX_UNITS_PROCESSED_PER_DAY, size=number_of_records,
+                                   endpoint=True)
+    max_number_of_defects = (units_processed * PERCENTAGE_OF_ALLOWED_DEFECTS).astype(np.int64)  # Round down number
+    number_of_defects = rng.integers(0, max_number_of_defects, endpoint=True)
+    total_labor_hours = np.full(number_of_records, HOURS_PER_BUSINESS_DAY)
+    efficiency_factor = rng.uniform(EFFICIENCY_FACTOR_MIN, EFFICIENCY_FACTOR_MAX, size=number_of_records)
+
+    return {'employee_id': employees + first_employee,
+            'day': days + 1,
+            'units_processed': units_processed,
+            'number_of_defects': number_of_defects,
+            'total_labor_hours': total_labor_hours,
+            'efficiency_factor': efficiency_factor,
+            'unit_processing_time': get_unit_processing_time(units_processed, number_of_defects, total_labor_hours,
+                                                             efficiency_factor),
+            }
+
+
+def iter_dataset_chunks(number_of_employees, year, month, number_of_months=12, frequency=MONTHLY,
+                        chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Generates employee records over many periods as a stream of bounded-size dataframes
+    :param number_of_employees: The number of employees
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months to simulate
+    :param frequency: MONTHLY for one record per employee and month, DAILY for one record per worked day
+    :param chunk_size: The maximum number of rows of each chunk
+    :param seed: The master seed, the same seed always yields the same chunks
+    :return: A generator of dataframes with the year, month (and day) and employee id of each record
+    """
+    if frequency not in (MONTHLY, DAILY):
+        raise ValueError(f"Unknown frequency: {frequency}")
+
+    # A daily chunk holds at most DAYS_IN_INDEX records per employee
+    employees_per_chunk = max(1, chunk_size // DAYS_IN_INDEX if frequency == DAILY else chunk_size)
+    seed_sequence = np.random.SeedSequence(seed)
+
+    for period_index, (period_year, period_month) in enumerate(get_periods(year, month, number_of_months)):
+        for chunk_index, first_employee in enumerate(range(0, number_of_employees, employees_per_chunk)):
+            rng = get_chunk_generator(seed_sequence, period_index, chunk_index)
+            chunk_employees = min(employees_per_chunk, number_of_employees - first_employee)
+
+            if frequency == DAILY:
+                data = draw_daily_records(rng, first_employee, chunk_employees, period_year, period_month)
+            else:
+                data = {'employee_id': np.arange(first_employee, first_employee + chunk_employees),
+                        **draw_dataset_columns(rng, chunk_employees, period_year, period_month)}
+
+            chunk = pd.DataFrame(data)
+            chunk.insert(0, 'year', period_year)
+            chunk.insert(1, 'month', period_month)
+
+            yield chunk
+
+
+def write_dataset_chunks(chunks, path, file_format=None):
+    """
+    Writes a stream of dataframe chunks to a single CSV or Parquet file, one chunk at a time
+    :param chunks: An iterable of dataframes with the same columns
+    :param path: The path of the output file
+    :param file_format: CSV or PARQUET (inferred from the file extension if not given)
+    :return: The number of rows written
+    """
+    if file_format is None:
+        file_format = PARQUET if os.path.splitext(path)[1].lower() == ".parquet" else CSV
+
+    number_of_rows = 0
+
+    if file_format == CSV:
+        with open(path, "w", newline="") as f:
+            for chunk in chunks:
+                chunk.to_csv(f, header=number_of_rows == 0, index=False)
+                number_of_rows += len(chunk)
+
+    elif file_format == PARQUET:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet files requires pyarrow (pip install pyarrow)") from e
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                number_of_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    else:
+        raise ValueError(f"Unknown file format: {file_format}")
+
+    return number_of_rows
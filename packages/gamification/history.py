@@ -0,0 +1,292 @@
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager, nullcontext
+import numpy as np
+import pandas as pd
+from packages.dataset_generator.dataset_store import write_json
+
+try:
+    import fcntl
+except ImportError:     # Not available on Windows, where only the threads of one process are synchronized
+    fcntl = None
+
+
+DEFAULT_HISTORY_DIRECTORY = os.environ.get("LEADERBOARD_HISTORY_DIRECTORY", "leaderboard_history")
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "lock"
+COLUMNS = {"timestamp": "datetime64[s]", "player": np.int64, "points": np.float64, "rank": np.int32}
+
+COMPACTION_THRESHOLD = 16       # Number of segments from which the small ones are compacted
+MAX_SEGMENT_ROWS = 1_000_000    # Segments with this many rows are not compacted further
+
+
+def to_seconds(timestamp):
+    """
+    Converts a timestamp to seconds since the epoch
+    :param timestamp: The timestamp (anything numpy.datetime64 accepts, None for no bound)
+    :return: The number of seconds, None if there is no timestamp
+    """
+    if timestamp is None:
+        return None
+    return int(np.datetime64(timestamp, "s").astype(np.int64))
+
+
+def get_ranks(df):
+    """
+    Returns the placement of each player of an unordered leaderboard (by total points in descending order, then by
+    player, like finalize_leaderboard)
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :return: The placement of each row, starting from 1
+    """
+    order = np.lexsort((df.index.to_numpy(), -df["Total Points"].to_numpy(dtype=np.float64)))
+    ranks = np.empty(len(order), dtype=np.int32)
+    ranks[order] = np.arange(1, len(order) + 1)
+
+    return ranks
+
+
+class SnapshotHistory:
+    """
+    Append-only history of leaderboard snapshots. Every append writes a new segment, a directory with one .npy file per
+    column (timestamp, player, points, rank), and the manifest keeps the row count and the timestamp range of each
+    segment. Queries only open the segments whose range overlaps the requested window, as read-only memory maps, and
+    only materialize the matching rows. Small segments are compacted into larger ones once there are too many.
+    The history can be shared by threads and processes: appends and compactions hold an exclusive lock, and queries
+    hold a shared lock while they read the manifest and open their segments, so a compaction never deletes a segment
+    that a query is about to open
+    """
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIRECTORY):
+        self.directory = directory
+        self.lock = threading.Lock()    # Appends and compactions of the threads of this process
+        os.makedirs(directory, exist_ok=True)
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    @contextmanager
+    def _locked(self, shared=False):
+        """
+        Locks the history
+        :param shared: Whether the lock is shared with other readers (to read the manifest and open segments)
+        """
+        if fcntl is None:
+            with self.lock:
+                yield
+            return
+
+        # Each acquisition opens the lock file, so the lock also applies between the threads of this process
+        with self.lock if not shared else nullcontext(), open(os.path.join(self.directory, LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_segment": 0, "segments": []}
+
+    def _write_segment(self, manifest, columns):
+        """
+        Writes the columns of a new segment
+        :param manifest: The manifest, whose segment counter is advanced
+        :param columns: The dictionary of column arrays
+        :return: The manifest entry of the segment
+        """
+        name = f"segment_{manifest['next_segment']:06d}"
+        manifest["next_segment"] += 1
+
+        segment_directory = os.path.join(self.directory, name)
+        os.makedirs(segment_directory, exist_ok=True)
+        for column, dtype in COLUMNS.items():
+            np.save(os.path.join(segment_directory, f"{column}.npy"), np.asarray(columns[column], dtype=dtype))
+
+        seconds = columns["timestamp"].astype("datetime64[s]").astype(np.int64)
+        return {"name": name, "rows": len(seconds), "min_timestamp": int(seconds.min()),
+                "max_timestamp": int(seconds.max())}
+
+    def _read_segment(self, segment):
+        """
+        Returns read-only memory-mapped views of the columns of a segment
+        :param segment: The manifest entry of the segment
+        :return: The dictionary of column arrays
+        """
+        segment_directory = os.path.join(self.directory, segment["name"])
+
+        return {column: np.load(os.path.join(segment_directory, f"{column}.npy"), mmap_mode="r") for column in COLUMNS}
+
+    def __len__(self):
+        """
+        Returns the number of stored rows (one per player and snapshot)
+        """
+        return sum(segment["rows"] for segment in self._read_manifest()["segments"])
+
+    def append(self, df, timestamp=None):
+        """
+        Appends a snapshot of a leaderboard
+        :param df: The unordered leaderboard dataframe, indexed by player
+        :param timestamp: The time of the snapshot (now if not given)
+        """
+        if len(df) == 0:
+            return
+
+        timestamp = np.datetime64("now", "s") if timestamp is None else np.datetime64(timestamp, "s")
+        columns = {"timestamp": np.full(len(df), timestamp),
+                   "player": df.index.to_numpy(),
+                   "points": df["Total Points"].to_numpy(dtype=np.float64),
+                   "rank": get_ranks(df)}
+
+        with self._locked():
+            manifest = self._read_manifest()
+            manifest["segments"].append(self._write_segment(manifest, columns))
+            write_json(self._manifest_path(), manifest)
+
+            if len(manifest["segments"]) >= COMPACTION_THRESHOLD:
+                self._compact(manifest)
+
+    def compact(self):
+        """
+        Merges the consecutive runs of small segments into single segments sorted by timestamp
+        """
+        with self._locked():
+            self._compact(self._read_manifest())
+
+    def _compact(self, manifest):
+        """
+        Compacts the segments of a manifest (the history must be locked). The new segments are written before the
+        manifest is replaced, so a reader never sees a partial history, and the old segments are deleted while no
+        reader can be opening them
+        :param manifest: The current manifest
+        """
+        runs, run, run_rows = [], [], 0
+        for segment in manifest["segments"]:
+            if run_rows + segment["rows"] > MAX_SEGMENT_ROWS:
+                runs.append(run)
+                run, run_rows = [], 0
+            run.append(segment)
+            run_rows += segment["rows"]
+        runs.append(run)
+
+        segments, removed = [], []
+        for run in runs:
+            if len(run) < 2:
+                segments.extend(run)
+                continue
+
+            parts = [self._read_segment(segment) for segment in run]
+            columns = {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+            order = np.argsort(columns["timestamp"], kind="stable")
+            segments.append(self._write_segment(manifest, {column: values[order] for column, values in columns.items()}))
+            removed.extend(segment["name"] for segment in run)
+
+        manifest["segments"] = segments
+        write_json(self._manifest_path(), manifest)
+
+        for name in removed:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def iter_rows(self, start=None, end=None, player=None):
+        """
+        Iterates over the rows of a time window, one segment at a time. Segments outside the window are skipped using
+        the timestamp range of the manifest
+        :param start: The start of the window, included (no bound if not given)
+        :param end: The end of the window, included (no bound if not given)
+        :param player: The only player whose rows are returned (every player if not given)
+        :return: The dictionaries of the column arrays of the matching rows of each segment
+        """
+        start_seconds, end_seconds = to_seconds(start), to_seconds(end)
+
+        # The segments are mapped before the lock is released, a mapped segment stays readable once it is deleted
+        with self._locked(shared=True):
+            segments = [(segment, self._read_segment(segment)) for segment in self._read_manifest()["segments"]
+                        if (start_seconds is None or segment["max_timestamp"] >= start_seconds)
+                        and (end_seconds is None or segment["min_timestamp"] <= end_seconds)]
+
+        for segment, columns in segments:
+            mask = np.ones(segment["rows"], dtype=bool)
+            if start_seconds is not None:
+                mask &= columns["timestamp"] >= np.datetime64(start_seconds, "s")
+            if end_seconds is not None:
+                mask &= columns["timestamp"] <= np.datetime64(end_seconds, "s")
+            if player is not None:
+                mask &= columns["player"] == player
+
+            if mask.any():
+                yield {column: values[mask] for column, values in columns.items()}
+
+    def _get_extremes(self, start, end):
+        """
+        Returns the first and last row of each player in a time window, reading one segment at a time
+        :param start: The start of the window
+        :param end: The end of the window
+        :return: The dataframe with the first and last timestamp, points and rank of each player, indexed by player
+        """
+        first, last = None, None
+        for rows in self.iter_rows(start, end):
+            chunk = pd.DataFrame(rows).sort_values("timestamp", kind="stable")
+            chunk_first = chunk.groupby("player").head(1).set_index("player")
+            chunk_last = chunk.groupby("player").tail(1).set_index("player")
+
+            first = chunk_first if first is None else pd.concat([first, chunk_first]).sort_values(
+                "timestamp", kind="stable").groupby(level=0).head(1)
+            last = chunk_last if last is None else pd.concat([last, chunk_last]).sort_values(
+                "timestamp", kind="stable").groupby(level=0).tail(1)
+
+        if first is None:
+            empty = pd.DataFrame({column: np.empty(0, dtype=dtype) for column, dtype in COLUMNS.items()})
+            first = last = empty.set_index("player")
+
+        return first.sort_index().join(last.sort_index(), lsuffix="_first", rsuffix="_last")
+
+    def get_standings(self, start=None, end=None):
+        """
+        Returns the standings of a time window: the points of each player in the last snapshot of the window it is in
+        :param start: The start of the window, included (no bound if not given)
+        :param end: The end of the window, included (no bound if not given)
+        :return: The unordered leaderboard dataframe of the window, indexed by player
+        """
+        extremes = self._get_extremes(start, end)
+
+        return pd.DataFrame({"Player": extremes.index, "Total Points": extremes["points_last"].to_numpy()},
+                            index=extremes.index.rename(None))
+
+    def get_rank_history(self, player, start=None, end=None):
+        """
+        Returns the points and placement of a player in each snapshot
+        :param player: The player
+        :param start: The start of the window, included (no bound if not given)
+        :param end: The end of the window, included (no bound if not given)
+        :return: The dataframe with the points and placement of the player, indexed by timestamp
+        """
+        parts = [pd.DataFrame(rows) for rows in self.iter_rows(start, end, player)]
+        if not parts:
+            return pd.DataFrame({"points": np.empty(0), "rank": np.empty(0, dtype=np.int32)},
+                                index=pd.DatetimeIndex([], name="timestamp"))
+
+        history = pd.concat(parts, ignore_index=True).sort_values("timestamp", kind="stable")
+
+        return history.set_index("timestamp")[["points", "rank"]]
+
+    def get_movers(self, start=None, end=None, k=10):
+        """
+        Returns the players whose placement changed the most between their first and last snapshot of a time window
+        :param start: The start of the window, included (no bound if not given)
+        :param end: The end of the window, included (no bound if not given)
+        :param k: The number of players
+        :return: The dataframe with the first and last placement and points of the players and their change (positive
+        if the player climbed), sorted by the size of the change
+        """
+        extremes = self._get_extremes(start, end)
+        movers = pd.DataFrame({"First Placement": extremes["rank_first"], "Last Placement": extremes["rank_last"],
+                               "Change": extremes["rank_first"].astype(np.int64) - extremes["rank_last"],
+                               "Points Change": extremes["points_last"] - extremes["points_first"]})
+        movers.index.name = "Player"
+
+        size = movers["Change"].abs().to_numpy()
+        order = np.lexsort((movers.index.to_numpy(), -size))[:k]
+
+        return movers.iloc[order]
@@ -1,14 +1,21 @@
+import threading
+import numpy as np
 import pandas as pd
-from pandas.api.types import CategoricalDtype
 
-def create_unordered_empty_leaderboard(number_of_players, columns):
+
+ordinal_labels = []     # Cached ordinal labels (1st, 2nd, 3rd, ...), extended when more placements are needed
+ordinal_labels_lock = threading.Lock()  # Sessions run in threads of the same process and share the cache
+
+
+def create_unordered_empty_leaderboard(number_of_players, columns, players=None):
     """
     Creates an unordered empty leaderboard dataframe with the specified number of players and columns
     :param number_of_players: The number of players
     :param columns: The columns of the leaderboard
+    :param players: The players of the leaderboard, used as its index (0 to number_of_players - 1 if not given)
     :return: The leaderboard dataframe
     """
-    placements = [i for i in range(number_of_players)]
+    placements = [i for i in range(number_of_players)] if players is None else list(players)
     df = pd.DataFrame(index=placements, columns=["Player"] + columns + ["Total Points"])
     df["Total Points"] = 0
 
@@ -29,18 +36,133 @@ def finalize_leaderboard(df):
 
     df.reset_index(drop=True, inplace=True)  # Reset the index
 
-    ordinal_suffixes = generate_ordinal_suffixes(len(df.index))  # Generate the ordinal suffixes
+    df.index = get_placement_index(len(df.index))
 
-    # Convert the index to Ordinal type with the defined suffixes
-    df.index = (df.index + 1).to_series().astype(CategoricalDtype(ordered=True)).map(
-        lambda x: f"{x}{ordinal_suffixes[x - 1]}")
-    
-    # Rename the index to Placement
-    df.index.name = "Placement"
-    
     return df
 
 
+def get_placement_index(number_of_players):
+    """
+    Returns the placement index of a leaderboard (1st, 2nd, 3rd, ...) as an ordered categorical index
+    :param number_of_players: The number of players
+    :return: The placement index
+    """
+    return get_placement_labels(0, number_of_players)
+
+
+def get_placement_labels(start, stop):
+    """
+    Returns the placement labels of a range of positions from the cached ordinal labels, as an ordered categorical index
+    :param start: The first position, starting from 0
+    :param stop: The position after the last one
+    :return: The placement index
+    """
+    if len(ordinal_labels) < stop:
+        with ordinal_labels_lock:
+            # Another session may have extended the labels while this one waited for the lock
+            ordinal_labels.extend(f"{i}{get_ordinal_suffix(i)}" for i in range(len(ordinal_labels) + 1, stop + 1))
+
+    categories = pd.Categorical.from_codes(np.arange(stop - start), categories=ordinal_labels[start:stop], ordered=True)
+    return pd.CategoricalIndex(categories, name="Placement")
+
+
+def get_players_before(df, player, player_points=None):
+    """
+    Returns which players are placed before a player in an unordered leaderboard (the players are ordered by total
+    points in descending order, then by player), without sorting the leaderboard
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param player: The player
+    :param player_points: The total points of the player (read from the leaderboard if not given, which is needed when
+    the player is not in the leaderboard)
+    :return: The boolean mask of the players placed before the player
+    """
+    points = df["Total Points"].to_numpy()
+    players = df.index.to_numpy()
+    if player_points is None:
+        player_points = df.at[player, "Total Points"]
+
+    return (points > player_points) | ((points == player_points) & (players < player))
+
+
+def get_player_rank(df, player):
+    """
+    Returns the position of a player in an unordered leaderboard
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param player: The player
+    :return: The position of the player, starting from 0
+    """
+    return int(np.count_nonzero(get_players_before(df, player)))
+
+
+def select_players(df, positions, k, last=False):
+    """
+    Selects the first (or last) k players of a subset of an unordered leaderboard in leaderboard order. The k-th total
+    points are found with argpartition and only the players that reach them are sorted
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param positions: The row positions of the subset
+    :param k: The number of players
+    :param last: Whether the last players are selected instead of the first ones
+    :return: The row positions of the selected players, in leaderboard order
+    """
+    points = df["Total Points"].to_numpy()[positions]
+
+    if 0 < k < len(positions):
+        keys = points if last else -points
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        kept = keys <= threshold    # Players tied with the k-th one are kept, the player decides between them
+        positions, points = positions[kept], points[kept]
+
+    order = np.lexsort((df.index.to_numpy()[positions], -points))
+    order = order[len(order) - k:] if last else order[:k]
+
+    return positions[order]
+
+
+def get_leaderboard_rows(df, positions, start):
+    """
+    Formats rows of an unordered leaderboard like finalize_leaderboard does, without sorting the rest of it
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param positions: The row positions of the players, in leaderboard order
+    :param start: The position of the first player in the leaderboard, starting from 0
+    :return: The leaderboard dataframe of the rows, indexed by placement
+    """
+    rows = df.iloc[positions].copy()
+    rows["Player"] = rows.index
+    rows.index = get_placement_labels(start, start + len(rows))
+
+    return rows
+
+
+def get_top_k(df, k):
+    """
+    Returns the first players of an unordered leaderboard
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param k: The number of players
+    :return: The leaderboard dataframe of the first k players, indexed by placement
+    """
+    positions = select_players(df, np.arange(len(df)), min(k, len(df)))
+
+    return get_leaderboard_rows(df, positions, 0)
+
+
+def get_rank_window(df, player, radius):
+    """
+    Returns the players placed around a player in an unordered leaderboard
+    :param df: The unordered leaderboard dataframe, indexed by player
+    :param player: The player
+    :param radius: The number of players shown before and after the player
+    :return: The leaderboard dataframe of the window, indexed by placement
+    """
+    before = get_players_before(df, player)
+    after = ~before & (df.index.to_numpy() != player)
+
+    above = select_players(df, np.flatnonzero(before), min(radius, np.count_nonzero(before)), last=True)
+    below = select_players(df, np.flatnonzero(after), min(radius, np.count_nonzero(after)))
+    positions = np.concatenate([above, [df.index.get_loc(player)], below])
+
+    return get_leaderboard_rows(df, positions, np.count_nonzero(before) - len(above))
+
+
 def get_ordinal_suffix(number):
     """
     Returns the ordinal suffix of a number
@@ -52,12 +174,3 @@ def get_ordinal_suffix(number):
     else:
         suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
     return suffix
-
-def generate_ordinal_suffixes(count):
-    """
-    Generates a list of ordinal suffixes
-    :param count: The number of suffixes to generate
-    :return: The list of ordinal suffixes
-    """
-    ordinal_suffixes = [get_ordinal_suffix(i) for i in range(1, count + 1)]
-    return ordinal_suffixes
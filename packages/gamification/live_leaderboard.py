@@ -0,0 +1,283 @@
+import random
+import numpy as np
+import pandas as pd
+from packages.gamification.leaderboards import get_placement_labels
+
+
+class _Node:
+    """
+    Node of the leaderboard treap, ordered by key (-points, player) and heap-ordered by a random priority
+    """
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _get_size(node):
+    return node.size if node is not None else 0
+
+
+def _update_size(node):
+    node.size = 1 + _get_size(node.left) + _get_size(node.right)
+
+
+def _split(node, key):
+    """
+    Splits a treap into the nodes before a key and the nodes from the key on
+    :param node: The root of the treap
+    :param key: The key
+    :return: The roots of both treaps
+    """
+    if node is None:
+        return None, None
+
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update_size(node)
+        return node, right
+
+    left, node.left = _split(node.left, key)
+    _update_size(node)
+    return left, node
+
+
+def _merge(left, right):
+    """
+    Merges two treaps, all the keys of the left one being before the keys of the right one
+    :param left: The root of the left treap
+    :param right: The root of the right treap
+    :return: The root of the merged treap
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update_size(left)
+        return left
+
+    right.left = _merge(left, right.left)
+    _update_size(right)
+    return right
+
+
+def _delete(node, key):
+    """
+    Deletes a key from a treap
+    :param node: The root of the treap
+    :param key: The key, which must be in the treap
+    :return: The root of the treap
+    """
+    if node.key == key:
+        return _merge(node.left, node.right)
+
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update_size(node)
+    return node
+
+
+class LiveLeaderboard:
+    """
+    Class to keep a leaderboard sorted while points come in, without sorting it again for every change. The players
+    are kept in a treap (a randomized balanced search tree) ordered like finalize_leaderboard orders the dataframe,
+    by total points in descending order and then by player, and each node knows the size of its subtree. Adding
+    points, the placement of a player and the start of a top-K or of a neighborhood cost O(log n)
+    """
+
+    def __init__(self, columns=(), seed=None):
+        self.columns = list(columns)
+        self.root = None
+        self.points = {}            # Total points of each player
+        self.column_points = {}     # Points of each player in each column
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_leaderboard(cls, df, columns=(), seed=None):
+        """
+        Builds a live leaderboard from an unordered leaderboard dataframe (see create_unordered_empty_leaderboard),
+        where the index is the player
+        :param df: The unordered leaderboard dataframe
+        :param columns: The point columns of the leaderboard kept for each player
+        :param seed: The seed of the treap priorities
+        :return: The live leaderboard
+        """
+        leaderboard = cls(columns, seed)
+        for player, total_points in zip(df.index, df["Total Points"]):
+            leaderboard.set_points(player, total_points)
+        for column in leaderboard.columns:
+            for player, points in df[column].dropna().items():
+                leaderboard.column_points[player][column] = points
+
+        return leaderboard
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, player):
+        return player in self.points
+
+    def __iter__(self):
+        """
+        Iterates over the players from the first placement to the last
+        :return: The (player, total points) pairs
+        """
+        return self.iter_from(0)
+
+    def _insert(self, player, points):
+        left, right = _split(self.root, (-points, player))
+        self.root = _merge(_merge(left, _Node((-points, player), self._random.random())), right)
+
+    def add_player(self, player):
+        """
+        Adds a player with no points, if the player is not in the leaderboard yet
+        :param player: The player
+        """
+        if player not in self.points:
+            self.set_points(player, 0)
+
+    def set_points(self, player, points):
+        """
+        Sets the total points of a player, adding the player if needed
+        :param player: The player
+        :param points: The total points
+        """
+        if player in self.points:
+            self.root = _delete(self.root, (-self.points[player], player))
+        else:
+            self.column_points[player] = {}
+        self.points[player] = points
+        self._insert(player, points)
+
+    def add_points(self, player, points, column=None):
+        """
+        Adds points to a player, adding the player if needed
+        :param player: The player
+        :param points: The points to add
+        :param column: The column the points are also added to (only the total points if not given)
+        """
+        self.set_points(player, self.points.get(player, 0) + points)
+        if column is not None:
+            self.column_points[player][column] = self.column_points[player].get(column, 0) + points
+
+    def set_column_points(self, player, column, points):
+        """
+        Sets the points of a player in a column, without changing the total points
+        :param player: The player, which must be in the leaderboard
+        :param column: The column
+        :param points: The points
+        """
+        self.column_points[player][column] = points
+
+    def get_points(self, player):
+        return self.points[player]
+
+    def get_rank(self, player):
+        """
+        Returns the placement of a player
+        :param player: The player
+        :return: The placement, starting from 1
+        """
+        key = (-self.points[player], player)
+        rank = 1
+        node = self.root
+        while node.key != key:
+            if key < node.key:
+                node = node.left
+            else:
+                rank += _get_size(node.left) + 1
+                node = node.right
+
+        return rank + _get_size(node.left)
+
+    def iter_from(self, start):
+        """
+        Iterates over the players from a position on
+        :param start: The position of the first player, starting from 0
+        :return: The (player, total points) pairs
+        """
+        # Go down to the start keeping the nodes after it on the stack, then walk the tree in order
+        stack = []
+        node = self.root
+        while node is not None:
+            left_size = _get_size(node.left)
+            if start <= left_size:
+                stack.append(node)
+                if start == left_size:
+                    break
+                node = node.left
+            else:
+                start -= left_size + 1
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            yield node.key[1], self.points[node.key[1]]
+
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def get_top(self, k):
+        """
+        Returns the first players of the leaderboard
+        :param k: The number of players
+        :return: The list of (player, total points) pairs
+        """
+        iterator = self.iter_from(0)
+        return [pair for _, pair in zip(range(k), iterator)]
+
+    def get_neighborhood(self, player, radius):
+        """
+        Returns the players placed around a player
+        :param player: The player
+        :param radius: The number of players shown before and after the player
+        :return: The placement of the first player returned and the list of (player, total points) pairs
+        """
+        position = self.get_rank(player) - 1
+        start = max(0, position - radius)
+        iterator = self.iter_from(start)
+        return start + 1, [pair for _, pair in zip(range(position + radius + 1 - start), iterator)]
+
+    def to_dataframe(self, start=0, stop=None):
+        """
+        Exports a range of placements of the leaderboard to the layout of finalize_leaderboard
+        :param start: The position of the first player, starting from 0
+        :param stop: The position after the last player (the end of the leaderboard if not given)
+        :return: The leaderboard dataframe, indexed by placement
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        players = [player for _, (player, _) in zip(range(stop - start), self.iter_from(start))]
+        data = {"Player": players}
+        for column in self.columns:
+            data[column] = [self.column_points[player].get(column, np.nan) for player in players]
+        data["Total Points"] = [self.points[player] for player in players]
+
+        df = pd.DataFrame(data)
+        df.index = get_placement_labels(start, start + len(df))
+
+        return df
+
+    def to_unordered_dataframe(self):
+        """
+        Exports the points of every player to the layout of the unordered leaderboards (e.g. to append a snapshot to
+        the history)
+        :return: The unordered leaderboard dataframe, indexed by player
+        """
+        players = list(self.points)
+        data = {"Player": players}
+        for column in self.columns:
+            data[column] = [self.column_points[player].get(column, np.nan) for player in players]
+        data["Total Points"] = [self.points[player] for player in players]
+
+        return pd.DataFrame(data, index=players)
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def get_task_ranks(allocations, processing_times):
+    """
+    Ranks the employees that worked on each task from the slowest to the fastest (by unit processing time, ties keep
+    the employee order), all tasks at once
+    :param allocations: The (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :return: The (tasks x employees) rank of each employee in each task, starting from 0 (-1 if the employee did not
+    work on the task), and the number of employees that worked on each task
+    """
+    workers = allocations > 0
+
+    # The employees that did not work on a task are sorted after the ones that did
+    keys = np.where(workers, -np.asarray(processing_times, dtype=np.float64), np.inf)
+    order = np.argsort(keys, axis=1, kind="stable")
+
+    ranks = np.empty(order.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.arange(order.shape[1]), axis=1)
+
+    return np.where(workers, ranks, -1), workers.sum(axis=1)
+
+
+def get_productivity_points(allocations, processing_times, difficulties, points_per_star):
+    """
+    Distributes the points of each task to the employees that worked on it on a linear scale: the points per star
+    times the difficulty are split into x + 2x + ... + nx, and the employee with rank i (the slowest has rank 0) gets
+    round(x * (i + 1)), so the faster employees get the most points
+    :param allocations: The (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param difficulties: The difficulty of each task
+    :param points_per_star: The points to distribute per star of difficulty for each task
+    :return: The (tasks x employees) points (NaN if the employee did not work on the task)
+    """
+    ranks, number_of_workers = get_task_ranks(allocations, processing_times)
+
+    # x + 2x + 3x + ... + nx = points_to_distribute (solve for x), tasks nobody worked on have no points
+    sum_of_components = number_of_workers * (number_of_workers + 1) // 2
+    points_to_distribute = points_per_star * np.asarray(difficulties, dtype=np.float64)
+    x = np.divide(points_to_distribute, sum_of_components, out=np.full(len(sum_of_components), np.nan),
+                  where=sum_of_components > 0)
+
+    # np.round rounds halves to even, like round
+    return np.where(ranks >= 0, np.round(x[:, np.newaxis] * (ranks + 1)), np.nan)
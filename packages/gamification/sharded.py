@@ -0,0 +1,146 @@
+import heapq
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from packages.gamification.leaderboards import (create_unordered_empty_leaderboard, select_players, get_players_before,
+                                                get_placement_labels)
+from packages.gamification.scoring import get_productivity_points
+
+
+DEFAULT_TOP_K = 10  # Number of players each shard sends to the plant-wide merge
+
+# Scoring problem shared by the shards scored in a worker process (set by init_worker)
+worker_problem = {}
+
+
+def assign_teams(number_of_players, number_of_teams):
+    """
+    Splits the players into teams of consecutive players of (almost) the same size
+    :param number_of_players: The number of players
+    :param number_of_teams: The number of teams
+    :return: The team of each player ("Team 1", "Team 2", ...)
+    """
+    team_indices = np.arange(number_of_players) * number_of_teams // max(number_of_players, 1)
+
+    return np.array([f"Team {i + 1}" for i in range(number_of_teams)], dtype=object)[team_indices]
+
+
+def get_team_shards(teams):
+    """
+    Groups the players by team, keeping the teams in the order they first appear
+    :param teams: The team of each player
+    :return: The list of (team, players) shards, the players being the positions of the team members
+    """
+    team_names, first_players, team_codes = np.unique(np.asarray(teams), return_index=True, return_inverse=True)
+    team_order = np.argsort(first_players, kind="stable")
+    team_names = team_names[team_order]
+    team_codes = np.argsort(team_order)[team_codes]
+    order = np.argsort(team_codes, kind="stable")
+    bounds = np.searchsorted(team_codes[order], np.arange(len(team_names) + 1))
+
+    return [(team, order[bounds[i]:bounds[i + 1]]) for i, team in enumerate(team_names)]
+
+
+def init_worker(task_names, allocations, processing_times, difficulties, points_per_star, k):
+    """
+    Stores the scoring problem in the worker process, so it is sent once per worker instead of once per shard
+    """
+    worker_problem.clear()
+    worker_problem.update(task_names=task_names, allocations=allocations, processing_times=processing_times,
+                          difficulties=difficulties, points_per_star=points_per_star, k=k)
+
+
+def score_shard(shard):
+    """
+    Scores the players of one shard on their own: the points of each task are distributed among the team members that
+    worked on it
+    :param shard: A (team, players) tuple
+    :return: The team, its unordered leaderboard dataframe (indexed by player) and the row positions of its top-K
+    players in leaderboard order
+    """
+    team, players = shard
+    task_names = worker_problem["task_names"]
+
+    points = get_productivity_points(worker_problem["allocations"][:, players],
+                                     worker_problem["processing_times"][:, players],
+                                     worker_problem["difficulties"], worker_problem["points_per_star"])
+
+    df = create_unordered_empty_leaderboard(len(players), task_names, players)
+    for task_name, task_points in zip(task_names, points):
+        df[task_name] = task_points
+    df["Total Points"] = np.nansum(points, axis=0)
+
+    top = select_players(df, np.arange(len(df)), min(worker_problem["k"], len(df)))
+
+    return team, df, top
+
+
+def build_team_leaderboards(task_names, allocations, processing_times, difficulties, points_per_star, teams,
+                            k=DEFAULT_TOP_K, max_workers=None):
+    """
+    Builds the productivity leaderboard of each team, scoring the teams independently on a process pool
+    :param task_names: The names of the tasks
+    :param allocations: The (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param difficulties: The difficulty of each task
+    :param points_per_star: The points to distribute per star of difficulty for each task
+    :param teams: The team of each employee
+    :param k: The number of players of each team kept for the plant-wide leaderboard
+    :param max_workers: The number of worker processes (1 scores every team in this process)
+    :return: A dictionary with the unordered leaderboard dataframe and the top-K row positions of each team
+    """
+    shards = get_team_shards(teams)
+    initargs = (list(task_names), np.asarray(allocations), np.asarray(processing_times), np.asarray(difficulties),
+                points_per_star, k)
+
+    if max_workers == 1 or len(shards) == 1:
+        init_worker(*initargs)
+        results = [score_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=initargs) as executor:
+            chunksize = max(1, len(shards) // (4 * (max_workers or os.cpu_count() or 1)))
+            results = list(executor.map(score_shard, shards, chunksize=chunksize))
+
+    return {team: (df, top) for team, df, top in results}
+
+
+def merge_top_k(team_leaderboards, k=DEFAULT_TOP_K):
+    """
+    Builds the plant-wide top-K with a k-way merge of the top-K of each team, without sorting every player
+    :param team_leaderboards: The dictionary returned by build_team_leaderboards
+    :param k: The number of players (at most the k of build_team_leaderboards)
+    :return: The leaderboard dataframe of the first k players of the plant, with their team, indexed by placement
+    """
+    def iter_team(team, df, top):
+        points = df["Total Points"].to_numpy()
+        for position in top:
+            yield -points[position], df.index[position], team, position
+
+    merged = list(itertools.islice(heapq.merge(*[iter_team(team, df, top)
+                                                 for team, (df, top) in team_leaderboards.items()]), k))
+
+    rows = [team_leaderboards[team][0].iloc[[position]].assign(Team=team) for _, _, team, position in merged]
+    if not rows:
+        return pd.DataFrame(columns=["Player", "Team", "Total Points"], index=get_placement_labels(0, 0))
+
+    df = pd.concat(rows)
+    df["Player"] = df.index
+    df.index = get_placement_labels(0, len(df))
+
+    return df
+
+
+def get_plant_rank(team_leaderboards, team, player):
+    """
+    Returns the plant-wide position of a player, counting the players placed before it in each team
+    :param team_leaderboards: The dictionary returned by build_team_leaderboards
+    :param team: The team of the player
+    :param player: The player
+    :return: The position of the player, starting from 0
+    """
+    player_points = team_leaderboards[team][0].at[player, "Total Points"]
+
+    return int(sum(np.count_nonzero(get_players_before(df, player, player_points))
+                   for df, _ in team_leaderboards.values()))
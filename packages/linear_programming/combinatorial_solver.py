@@ -0,0 +1,240 @@
+import numpy as np
+from packages.linear_programming.lp_solver import LinearProgrammingResult, LinearProgrammingModel, SolveMode, Status
+from packages.linear_programming.rounding import TOLERANCE, fill_minimum_hours, is_feasible
+from packages.utils.profiling import PipelineProfile, COMBINATORIAL_SOLVE, RESULT_EXTRACTION
+
+
+FALLBACK_TIME_LIMIT = 30    # Seconds of the PuLP solve run when the heuristic finds nothing and no limit is given
+
+
+# Reasons a throughput cannot be assigned
+TOO_HIGH = 1    # The pieces do not fit in the capacities and maximum hours
+TOO_LOW = -1    # Some employees cannot reach the minimum hours
+
+
+def get_throughput_upper_bound(processing_times, capacities, max_hours_worked):
+    """
+    Returns an upper bound on the number of pieces every task can produce
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param max_hours_worked: The maximum hours worked by an employee
+    :return: The upper bound
+    """
+    fastest_times = processing_times.min(axis=1)
+
+    bounds = [np.floor(capacities / fastest_times + TOLERANCE).min(),   # Capacity of each task at the fastest employee's pace
+              np.floor(max_hours_worked / processing_times + TOLERANCE).sum(axis=1).min(),  # Maximum hours of every employee on a single task
+              np.floor(processing_times.shape[1] * max_hours_worked / fastest_times.sum() + TOLERANCE)]  # Total maximum hours
+
+    return int(max(0, min(bounds)))
+
+
+def get_relative_advantage(processing_times):
+    """
+    Returns how fast each employee is at each task compared to the other tasks, with each task's processing times
+    normalized by the task's median (lower is better)
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :return: The (tasks x employees) relative advantage matrix
+    """
+    normalized_times = processing_times / np.median(processing_times, axis=1, keepdims=True)
+    return normalized_times / normalized_times.mean(axis=0, keepdims=True)
+
+
+def give_pieces(allocations, processing_times, hours, counts, task_index, employees, pieces, throughput):
+    """
+    Gives pieces of a task to employees in order, without exceeding the throughput of the task
+    :param allocations: The allocation matrix (updated in place)
+    :param processing_times: The unit processing time matrix
+    :param hours: The hours worked by each employee (updated in place)
+    :param counts: The number of pieces assigned to each task (updated in place)
+    :param task_index: The index of the task
+    :param employees: The employees, in the order they get the pieces
+    :param pieces: The number of pieces wanted by each employee
+    :param throughput: The number of pieces of each task
+    """
+    cumulative = np.cumsum(pieces)
+    given = np.minimum(pieces, np.maximum(throughput - counts[task_index] - (cumulative - pieces), 0))
+
+    allocations[task_index, employees] += given
+    hours[employees] += given * processing_times[task_index, employees]
+    counts[task_index] += given.sum()
+
+
+def assign_throughput(throughput, processing_times, capacities, min_hours_worked, max_hours_worked, task_order,
+                      employee_orders, task_preferences):
+    """
+    Greedily assigns the same number of pieces of every task to the employees. The employees first get enough pieces
+    of their preferred tasks to reach the minimum hours, then the rest of the pieces of each task go to the employees
+    in the task's order as long as they fit in their remaining hours
+    :param throughput: The number of pieces of each task
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param task_order: The order the tasks are filled in
+    :param employee_orders: The (tasks x employees) order the employees get the pieces of each task
+    :param task_preferences: The (tasks x employees) order of the tasks each employee prefers
+    :return: The allocation matrix, or TOO_HIGH/TOO_LOW if the throughput could not be assigned
+    """
+    number_of_tasks, number_of_employees = processing_times.shape
+    allocations = np.zeros_like(processing_times)
+    hours = np.zeros(number_of_employees)
+    counts = np.zeros(number_of_tasks)
+
+    # Minimum hours, every employee below them tries their next preferred task
+    below_minimum = np.arange(number_of_employees)
+    for preference in task_preferences:
+        if len(below_minimum) == 0:
+            break
+
+        tasks = preference[below_minimum]
+        times = processing_times[tasks, below_minimum]
+        pieces = np.minimum(np.ceil((min_hours_worked - hours[below_minimum]) / times - TOLERANCE),
+                            np.floor((max_hours_worked - hours[below_minimum]) / times + TOLERANCE))
+
+        for task_index in np.unique(tasks):
+            in_task = tasks == task_index
+            order = np.argsort(times[in_task], kind="stable")   # The fastest employees first
+            give_pieces(allocations, processing_times, hours, counts, task_index, below_minimum[in_task][order],
+                        pieces[in_task][order], throughput)
+
+        below_minimum = below_minimum[hours[below_minimum] < min_hours_worked - TOLERANCE]
+
+    loads = (allocations * processing_times).sum(axis=1)
+    if np.any(loads > capacities + TOLERANCE):
+        return TOO_HIGH
+
+    # Remaining pieces of each task, as many as fit in each employee's remaining hours
+    for task_index in task_order:
+        order = employee_orders[task_index]
+        times = processing_times[task_index, order]
+        room = np.floor(np.maximum(max_hours_worked - hours[order], 0) / times + TOLERANCE)
+        if room.sum() < throughput - counts[task_index]:
+            return TOO_HIGH
+
+        give_pieces(allocations, processing_times, hours, counts, task_index, order, room, throughput)
+        if (allocations[task_index] * processing_times[task_index]).sum() > capacities[task_index] + TOLERANCE:
+            return TOO_HIGH
+
+    # Move pieces to the employees still below the minimum hours
+    fill_minimum_hours(allocations, processing_times, capacities, hours, min_hours_worked, max_hours_worked)
+    if np.any(hours < min_hours_worked - TOLERANCE):
+        return TOO_LOW
+
+    return allocations
+
+
+def search_throughput(upper_bound, processing_times, capacities, min_hours_worked, max_hours_worked, task_order,
+                      employee_orders, task_preferences):
+    """
+    Binary searches the highest throughput the greedy assignment can reach. The greedy assignment is not an exact
+    feasibility test, a throughput it rejects may still be feasible
+    :param upper_bound: The upper bound on the throughput
+    :return: The allocation matrix of the highest throughput found, None if none was found
+    """
+    low, high = 0, upper_bound
+    best = None
+    while low <= high:
+        throughput = (low + high) // 2
+        allocations = assign_throughput(throughput, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                        task_order, employee_orders, task_preferences)
+
+        if isinstance(allocations, np.ndarray):
+            best = allocations
+            low = throughput + 1
+        elif allocations == TOO_LOW:    # More pieces are needed to fill the minimum hours
+            low = throughput + 1
+        else:
+            high = throughput - 1
+
+    return best
+
+
+def solve_combinatorial(task_names, processing_times, capacities, min_hours_worked, max_hours_worked, track_memory=False,
+                        fallback=True, time_limit=None):
+    """
+    Solves the balanced-throughput allocation problem heuristically without a MIP solver, with a binary search on the
+    common number of pieces of every task where each candidate is tried with a vectorized greedy assignment. The
+    search is run with the employees ordered by absolute speed and by relative advantage, and the best allocation is
+    kept. The greedy assignment can miss feasible throughputs, so the solution can be well below the optimum (10-20%
+    on small instances): it is only reported as optimal when it reaches the upper bound. When the heuristic finds no
+    feasible allocation, the problem is solved with PuLP instead, always with a time limit
+    :param task_names: The names of the tasks
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param track_memory: Whether the peak memory of each stage is traced
+    :param fallback: Whether the problem is solved with PuLP when the heuristic finds nothing
+    :param time_limit: The time limit in seconds of the PuLP solve of the fallback (FALLBACK_TIME_LIMIT if not given)
+    :return: The linear programming result (the result of the exact PuLP solve if the fallback was used)
+    """
+    profile = PipelineProfile(track_memory)
+
+    with profile.stage(COMBINATORIAL_SOLVE):
+        capacities = np.asarray(capacities, dtype=np.float64)
+        number_of_tasks = len(task_names)
+
+        upper_bound = get_throughput_upper_bound(processing_times, capacities, max_hours_worked)
+
+        # The tasks whose capacity is tightest are filled first
+        task_order = np.argsort(capacities / processing_times.min(axis=1), kind="stable")
+        relative_advantage = get_relative_advantage(processing_times)
+        task_preferences = np.argsort(relative_advantage, axis=0, kind="stable")
+
+        best = None
+        for employee_orders in (np.argsort(processing_times, axis=1, kind="stable"),
+                                np.argsort(relative_advantage, axis=1, kind="stable")):
+            allocations = search_throughput(upper_bound, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                            task_order, employee_orders, task_preferences)
+            if allocations is not None and (best is None or allocations.sum() > best.sum()):
+                best = allocations
+
+    solution_time = profile.get_wall_time(COMBINATORIAL_SOLVE)
+    relaxation_bound = float(upper_bound * number_of_tasks)
+
+    with profile.stage(RESULT_EXTRACTION):
+        if best is None or not is_feasible(best, processing_times, capacities, min_hours_worked, max_hours_worked):
+            if fallback:
+                return LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked,
+                                              max_hours_worked, track_memory).solve(
+                    time_limit=time_limit if time_limit is not None else FALLBACK_TIME_LIMIT)
+
+            return LinearProgrammingResult(Status.NOT_SOLVED, task_names, processing_times, capacities, min_hours_worked,
+                                           max_hours_worked, np.zeros_like(processing_times), solution_time,
+                                           mode=SolveMode.COMBINATORIAL, relaxation_bound=relaxation_bound, profile=profile)
+
+        status = Status.OPTIMAL if best[0].sum() == upper_bound else Status.FEASIBLE
+        return LinearProgrammingResult(status, task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                       best, solution_time, mode=SolveMode.COMBINATORIAL, relaxation_bound=relaxation_bound,
+                                       profile=profile)
+
+
+def cross_check(task_names, processing_times, capacities, min_hours_worked, max_hours_worked, time_limit=None):
+    """
+    Solves the problem with the combinatorial solver and with PuLP and compares both solutions
+    :param task_names: The names of the tasks
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param time_limit: The time limit in seconds of the PuLP solve
+    :return: A dictionary with the status, objective value and solve time of each solver and the relative difference
+    """
+    combinatorial = solve_combinatorial(task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                        fallback=False)
+    pulp = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked).solve(time_limit=time_limit)
+
+    difference = None
+    if pulp.objective_value:
+        difference = (pulp.objective_value - combinatorial.objective_value) / pulp.objective_value
+
+    return {"combinatorial_status": combinatorial.status,
+            "combinatorial_objective": combinatorial.objective_value,
+            "combinatorial_time": combinatorial.solution_time,
+            "combinatorial_feasible": is_feasible(combinatorial.allocations, processing_times, capacities,
+                                                  min_hours_worked, max_hours_worked),
+            "pulp_status": pulp.status,
+            "pulp_objective": pulp.objective_value,
+            "pulp_time": pulp.solution_time,
+            "relative_difference": difference}
@@ -0,0 +1,81 @@
+import math
+import numpy as np
+import pandas as pd
+from pulp import LpConstraintLE, LpConstraintGE, LpConstraintEQ
+
+
+DEFAULT_PAGE_SIZE = 25
+BINDING_TOLERANCE = 1e-6    # Constraints whose slack is within the tolerance are binding
+
+SENSES = {LpConstraintLE: "<=", LpConstraintGE: ">=", LpConstraintEQ: "="}
+
+
+def get_number_of_pages(number_of_rows, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Returns the number of pages needed to show a number of rows (at least one, even if there are no rows)
+    :param number_of_rows: The number of rows
+    :param page_size: The number of rows per page
+    :return: The number of pages
+    """
+    return max(1, math.ceil(number_of_rows / page_size))
+
+
+class ConstraintInspector:
+    """
+    Class to browse a group of constraints of a result page by page. The values, slacks and filters are computed on
+    the arrays of the result, only the rows of the requested page are formatted
+    """
+
+    def __init__(self, result, constraint_group):
+        self.result = result
+        self.group = result.constraints[constraint_group]
+        self.slack = np.broadcast_to(np.asarray(self.group.slack, dtype=np.float64), np.shape(self.group.values))
+        self.binding = np.abs(self.slack) <= BINDING_TOLERANCE
+
+    def __len__(self):
+        return len(self.group.names)
+
+    def get_rows(self, binding_only=False, max_slack=None, sort_by_slack=False):
+        """
+        Returns the rows that pass the filters
+        :param binding_only: Whether only the binding constraints are kept
+        :param max_slack: The slack below which the constraints are kept (no limit if not given)
+        :param sort_by_slack: Whether the rows are sorted by increasing slack instead of by position
+        :return: The array of row positions
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if binding_only:
+            mask &= self.binding
+        if max_slack is not None:
+            mask &= self.slack < max_slack
+
+        rows = np.flatnonzero(mask)
+        if sort_by_slack:
+            rows = rows[np.argsort(self.slack[rows], kind="stable")]
+
+        return rows
+
+    def get_page(self, rows, page=0, page_size=DEFAULT_PAGE_SIZE, expressions=False):
+        """
+        Builds the table of one page of rows
+        :param rows: The row positions (see get_rows)
+        :param page: The page, starting from 0
+        :param page_size: The number of rows per page
+        :param expressions: Whether the full expression of each constraint is shown (only if the result has its model)
+        :return: The dataframe of the page, indexed by row position
+        """
+        visible = rows[page * page_size:(page + 1) * page_size]
+        names = [self.group.names[i] for i in visible]
+
+        df = pd.DataFrame({"Constraint": names,
+                           "Value": np.asarray(self.group.values)[visible],
+                           "Sense": SENSES[self.group.sense],
+                           "RHS": np.asarray(self.group.rhs)[visible],
+                           "Slack": self.slack[visible],
+                           "Binding": self.binding[visible]},
+                          index=pd.Index(visible, name="Row"))
+
+        if expressions and self.result.model is not None:
+            df.insert(1, "Expression", [str(self.result.model.constraints[name]) for name in names])
+
+        return df
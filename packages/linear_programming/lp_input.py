@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+
+class LinearProgrammingInput:
+    """
+    Class to represent the input of the linear programming model in columnar form: a contiguous float64
+    (tasks x employees) unit processing time matrix, and the capacity and difficulty of each task as separate vectors
+    """
+
+    def __init__(self, task_names, processing_times, capacities, difficulties):
+        self.task_names = list(task_names)
+        self.processing_times = np.ascontiguousarray(processing_times, dtype=np.float64)
+        self.capacities = np.asarray(capacities, dtype=np.float64)
+        self.difficulties = np.asarray(difficulties, dtype=np.int64)
+
+    @classmethod
+    def from_dataset_store(cls, datasets):
+        """
+        Builds the input from the stored datasets, stacking the unit processing time column of each dataset into the
+        matrix in one pass (the columns are read straight from the memory-mapped store)
+        :param datasets: The dataset store
+        :return: The linear programming input
+        """
+        task_names = list(datasets)
+        processing_times = np.empty((len(task_names), datasets.get_number_of_employees()), dtype=np.float64)
+        capacities = np.empty(len(task_names), dtype=np.float64)
+        difficulties = np.empty(len(task_names), dtype=np.int64)
+
+        for task_index, task_name in enumerate(task_names):
+            processing_times[task_index] = datasets.get_column(task_name, 'unit_processing_time')
+            capacities[task_index], difficulties[task_index] = datasets.get_settings(task_name)
+
+        return cls(task_names, processing_times, capacities, difficulties)
+
+    def add_task(self, task_name, processing_times, capacity, difficulty):
+        """
+        Adds a task row to the input
+        :param task_name: The name of the task
+        :param processing_times: The unit processing time of the task for each employee
+        :param capacity: The capacity of the task
+        :param difficulty: The difficulty of the task
+        """
+        self.task_names.append(task_name)
+        self.processing_times = np.vstack([self.processing_times, np.asarray(processing_times, dtype=np.float64)])
+        self.capacities = np.append(self.capacities, np.float64(capacity))
+        self.difficulties = np.append(self.difficulties, np.int64(difficulty))
+
+    def remove_task(self, task_name):
+        """
+        Removes a task row from the input
+        :param task_name: The name of the task
+        """
+        task_index = self.task_names.index(task_name)
+
+        del self.task_names[task_index]
+        self.processing_times = np.delete(self.processing_times, task_index, axis=0)
+        self.capacities = np.delete(self.capacities, task_index)
+        self.difficulties = np.delete(self.difficulties, task_index)
+
+    @property
+    def number_of_tasks(self):
+        return self.processing_times.shape[0]
+
+    @property
+    def number_of_employees(self):
+        return self.processing_times.shape[1]
+
+    def get_model_arrays(self):
+        """
+        Returns the arrays used to build the model
+        :return: The task names, the (tasks x employees) unit processing time matrix and the task capacities
+        """
+        return self.task_names, self.processing_times, self.capacities
+
+    def to_dataframe(self):
+        """
+        Returns the input as a dataframe with one row per task, for display
+        :return: The dataframe with the unit processing times, capacity and difficulty of each task
+        """
+        df = pd.DataFrame(self.processing_times, index=pd.Index(self.task_names, name="Task"),
+                          columns=["Employee " + str(i) for i in range(self.number_of_employees)], copy=False)
+
+        return df.assign(Capacity=self.capacities, Difficulty=self.difficulties)
@@ -1,4 +1,8 @@
+import numpy as np
 from pulp import *
+from packages.linear_programming.rounding import round_allocations, is_feasible
+from packages.utils.profiling import (PipelineProfile, MODEL_CONSTRUCTION, CBC_SOLVE, ROUNDING, CBC_POLISH,
+                                      RESULT_EXTRACTION)
 
 class Status:
     """
@@ -6,68 +10,511 @@ class Status:
     """
     NOT_SOLVED = 0
     OPTIMAL = 1
+    FEASIBLE = 2    # Integer solution found that is not proven optimal (time limit, gap or heuristic)
     INFEASIBLE = -1
     UNBOUNDED = -2
     UNDEFINED = -3
 
 
-def solve_linear_programming(dataframe, min_hours_worked, max_hours_worked):
+class SolveMode:
     """
-    Solves the linear programming problem
-    :param dataframe: The dataframe with the unit processing times
+    Class to represent how the linear programming model is solved
+    """
+    EXACT = "exact" # Integer program solved to optimality (or to the time limit/gap)
+    RELAXATION = "relaxation"   # LP relaxation only, the allocations may be fractional
+    ROUNDING = "rounding"   # LP relaxation rounded and repaired to a feasible integer allocation
+    POLISH = "polish"   # Rounded allocation used as the warm start of a time-limited integer solve
+    COMBINATORIAL = "combinatorial" # Greedy heuristic without PuLP, not proven optimal (see combinatorial_solver)
+
+
+# Constraint groups
+EQUALITY = "equality"
+UNIT_PROCESSING_TIME = "unit_processing_time"
+MIN_EMPLOYEE_CAPACITY = "min_employee_capacity"
+MAX_EMPLOYEE_CAPACITY = "max_employee_capacity"
+
+
+class ConstraintGroup:
+    """
+    Class to represent a group of constraints of the same kind by their names, left-hand side values and right-hand sides
+    """
+
+    def __init__(self, names, values, rhs, sense):
+        self.names = names
+        self.values = values
+        self.rhs = rhs
+        self.sense = sense
+
+    @property
+    def slack(self):
+        """
+        The slack of each constraint (0 when binding, the absolute violation is negative for equalities)
+        """
+        if self.sense == LpConstraintLE:
+            return self.rhs - self.values
+        if self.sense == LpConstraintGE:
+            return self.values - self.rhs
+        return 0.0 - np.abs(self.values - self.rhs)
+
+
+class LinearProgrammingResult:
+    """
+    Class to represent the solution of the linear programming model as dense arrays indexed by task and employee
+    """
+
+    def __init__(self, status, task_names, processing_times, capacities, min_hours_worked, max_hours_worked, allocations,
+                 solution_time=0.0, build_time=0.0, model=None, mode=SolveMode.EXACT, relaxation_bound=None, profile=None):
+        self.status = status
+        self.task_names = list(task_names)
+        self.processing_times = processing_times
+        self.capacities = capacities
+        self.min_hours_worked = min_hours_worked
+        self.max_hours_worked = max_hours_worked
+        self.allocations = allocations  # (tasks x employees) number of times each task was done by each employee
+        self.solution_time = solution_time
+        self.build_time = build_time
+        self.model = model  # The PuLP model, only available in the process that solved it
+        self.mode = mode
+        self.relaxation_bound = relaxation_bound   # Objective value of the LP relaxation, if it was solved
+        self.profile = profile  # Times of each stage of the solve (see PipelineProfile)
+
+        hours = allocations * processing_times
+        self.employee_hours = hours.sum(axis=0)
+        self.task_loads = hours.sum(axis=1)
+        self.task_pieces = allocations.sum(axis=1)
+        self.objective_value = float(allocations.sum())
+
+        number_of_tasks, number_of_employees = allocations.shape
+        employee_ids = [str(i) for i in range(number_of_employees)]
+        self.constraints = {
+            EQUALITY: ConstraintGroup([get_constraint_name(EQUALITY, task_name) for task_name in self.task_names[1:]],
+                                      self.task_pieces[1:] - self.task_pieces[0], np.zeros(number_of_tasks - 1), LpConstraintEQ),
+            UNIT_PROCESSING_TIME: ConstraintGroup([get_constraint_name(UNIT_PROCESSING_TIME, task_name) for task_name in self.task_names],
+                                                  self.task_loads, np.asarray(capacities, dtype=np.float64), LpConstraintLE),
+            MIN_EMPLOYEE_CAPACITY: ConstraintGroup([get_constraint_name(MIN_EMPLOYEE_CAPACITY, i) for i in employee_ids],
+                                                   self.employee_hours, np.full(number_of_employees, float(min_hours_worked)), LpConstraintGE),
+            MAX_EMPLOYEE_CAPACITY: ConstraintGroup([get_constraint_name(MAX_EMPLOYEE_CAPACITY, i) for i in employee_ids],
+                                                   self.employee_hours, np.full(number_of_employees, float(max_hours_worked)), LpConstraintLE),
+        }
+
+    @property
+    def total_pieces(self):
+        """
+        The number of pieces produced (the objective value divided by the number of tasks)
+        """
+        return int(self.objective_value / len(self.task_names)) if self.task_names else 0
+
+    @property
+    def gap(self):
+        """
+        The relative distance between the objective value and the relaxation bound (None if there is no bound)
+        """
+        if self.relaxation_bound is None or self.relaxation_bound == 0:
+            return None
+        return (self.relaxation_bound - self.objective_value) / self.relaxation_bound
+
+    @property
+    def total_hours(self):
+        """
+        The total number of hours worked by the employees
+        """
+        return float(self.employee_hours.sum())
+
+    def __getstate__(self):
+        # The PuLP model is not kept when the result is pickled (e.g. sent between processes or cached)
+        state = self.__dict__.copy()
+        state["model"] = None
+        return state
+
+
+def get_variable_name(task_name, employee):
+    """
+    Returns the name of the variable of a task and employee
+    :param task_name: The name of the task
+    :param employee: The employee id
+    :return: The variable name
+    """
+    return "X" + task_name + str(employee)
+
+
+def get_constraint_name(group, key):
+    """
+    Returns the name of a constraint
+    :param group: The constraint group
+    :param key: The task name or employee id of the constraint
+    :return: The constraint name (with the characters PuLP replaces in names already replaced)
+    """
+    return f"{group}_{key}".translate(LpAffineExpression.trans)
+
+
+def get_row_expressions(variables, coefficients):
+    """
+    Builds one affine expression per row of a coefficient matrix, skipping the zero coefficients
+    :param variables: The object array of variables with the same shape as the coefficients
+    :param coefficients: The coefficient matrix
+    :return: The list of expressions
+    """
+    expressions = []
+    for row_variables, row_coefficients in zip(variables, coefficients):
+        nonzero = row_coefficients != 0
+        expressions.append(LpAffineExpression(zip(row_variables[nonzero].tolist(), row_coefficients[nonzero].tolist())))
+
+    return expressions
+
+
+def get_constraint_expression(constraint):
+    """
+    Returns the affine expression of a constraint, whose coefficients can be changed in place
+    :param constraint: The PuLP constraint
+    :return: The expression (the constraint itself in PuLP 2, where constraints are expressions)
+    """
+    return getattr(constraint, "expr", constraint)
+
+
+def remove_variables(model, variables):
+    """
+    Removes variables from the registry of the model, which PuLP only ever adds to
+    :param model: The PuLP model
+    :param variables: The variables, which must no longer appear in the objective or the constraints
+    """
+    removed = {id(variable) for variable in variables}
+    model._variables = [variable for variable in model._variables if id(variable) not in removed]
+    model._variable_ids = {key: variable for key, variable in model._variable_ids.items() if id(variable) not in removed}
+
+
+def build_linear_programming_model(task_names, processing_times, capacities, min_hours_worked, max_hours_worked):
+    """
+    Builds the linear programming model from the (tasks x employees) unit processing time matrix. The coefficients
+    are emitted in bulk, one expression per task and per employee, instead of one cell lookup per variable
+    :param task_names: The names of the tasks
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
     :param min_hours_worked: The minimum hours worked by an employee
     :param max_hours_worked: The maximum hours worked by an employee
-    :return: The linear programming model
+    :return: The linear programming model and the (tasks x employees) object array of its variables
     """
-
-    variables = {task_name : [] for task_name in dataframe.index} # Create a dictionary of lists to store the variables
-    number_of_employees = len(dataframe.columns) - 2
+    number_of_employees = processing_times.shape[1]
 
     # Create model
     model = LpProblem("Maximize_Production", LpMaximize)
 
-    
-    # Create variables
-    for key in variables:   # For each task
-        for i in range(number_of_employees):    # For each employee
-            variables[key].append(LpVariable("X" + key + str(i), lowBound=0, cat=LpInteger))   # Create variable
-
+    # Create variables, one row per task and one column per employee
+    variables = np.array([[LpVariable(get_variable_name(task_name, i), lowBound=0, cat=LpInteger)
+                           for i in range(number_of_employees)] for task_name in task_names], dtype=object).reshape(processing_times.shape)
 
     # Define objective
-    model += lpSum(variables.values()) # For example: (Xprinting1 + Xprinting2 + Xprinting3) + (Xcutting1 + Xcutting2 + Xcutting3) + ...
-    
+    model += LpAffineExpression((variable, 1) for variable in variables.flat) # For example: (Xprinting1 + Xprinting2 + Xprinting3) + (Xcutting1 + Xcutting2 + Xcutting3) + ...
 
     # Add constraints
     # Related to the number of tasks executed being equal between machines
-    values = list(variables.values())
-    for i in range(1, len(values)):    # For each task
-        model += lpSum(values[i]) == lpSum(values[0]) # Sum of each task's variables list must be equal to each other
-
+    first_task_terms = [(variable, -1) for variable in variables[0]]
+    for i in range(1, len(task_names)):    # For each task
+        terms = [(variable, 1) for variable in variables[i]] + first_task_terms
+        model += LpConstraint(LpAffineExpression(terms), LpConstraintEQ, get_constraint_name(EQUALITY, task_names[i]), rhs=0) # Sum of each task's variables list must be equal to each other
 
     # Related to the unit processing times from the dataframe
-    for key in variables:   # For each task
-        aux_list = []
+    for task_name, expression, capacity in zip(task_names, get_row_expressions(variables, processing_times), capacities.tolist()):   # For each task
+        model += LpConstraint(expression, LpConstraintLE, get_constraint_name(UNIT_PROCESSING_TIME, task_name), rhs=capacity) # Sum of each task's processing times must be less than or equal to the task's capacity
 
-        for i in range(number_of_employees):    # For each employee
-            aux_list.append(variables[key][i]*dataframe.loc[key][i])
+    # Related to the employees' capacities
+    for i, expression in enumerate(get_row_expressions(variables.T, processing_times.T)):    # For each employee
+        model += LpConstraint(expression, LpConstraintGE, get_constraint_name(MIN_EMPLOYEE_CAPACITY, i), rhs=min_hours_worked) # In total, the time spent by an employee must be greater than or equal to the minimum hours worked
+        model += LpConstraint(LpAffineExpression(expression), LpConstraintLE, get_constraint_name(MAX_EMPLOYEE_CAPACITY, i), rhs=max_hours_worked) # In total, the time spent by an employee must be less than or equal to the maximum hours worked
 
-        model += lpSum(aux_list) <= dataframe.loc[key]['Capacity'] # Sum of each task's variables list must be less than or equal to the task's capacity
+    return model, variables
 
 
-    # Related to the employees' capacities
-    for i in range(number_of_employees):    # For each employee
-        aux_list = []
+def get_status(model):
+    """
+    Returns the status of a solved model, telling apart proven optimal and only feasible integer solutions
+    :param model: The solved PuLP model
+    :return: The status
+    """
+    if model.status == LpStatusOptimal and getattr(model, "sol_status", LpSolutionOptimal) == LpSolutionIntegerFeasible:
+        return Status.FEASIBLE
+    return model.status
+
+
+def get_allocations(variables):
+    """
+    Reads the solved values of the variables into a dense matrix
+    :param variables: The (tasks x employees) object array of variables
+    :return: The (tasks x employees) allocation matrix
+    """
+    values = [variable.varValue for variable in variables.flat]
+    return np.array([0.0 if value is None else value for value in values], dtype=np.float64).reshape(variables.shape)
+
+
+class LinearProgrammingModel:
+    """
+    Class to keep a built linear programming model between solves. Changing the hour bounds or the task capacities
+    only updates the right-hand sides of the constraints, adding or removing a task only adds or removes its variables
+    and constraints, and each solve is warm-started from the previous solution
+    """
+
+    def __init__(self, task_names, processing_times, capacities, min_hours_worked, max_hours_worked, track_memory=False):
+        self.task_names = list(task_names)
+        self.processing_times = processing_times
+        self.capacities = np.array(capacities, dtype=np.float64)
+        self.min_hours_worked = min_hours_worked
+        self.max_hours_worked = max_hours_worked
+        self.track_memory = track_memory    # Whether the peak memory of each stage is traced (slower)
+
+        self.build_profile = PipelineProfile(track_memory)
+        with self.build_profile.stage(MODEL_CONSTRUCTION):
+            self.model, self.variables = build_linear_programming_model(self.task_names, processing_times, self.capacities,
+                                                                        min_hours_worked, max_hours_worked)
+        self.build_time = self.build_profile.get_wall_time(MODEL_CONSTRUCTION)
+        self.solved = False
+
+    @classmethod
+    def from_problem(cls, model, variables, task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                     build_profile=None):
+        """
+        Wraps a PuLP model that was already built (e.g. read from an MPS file) without building it again
+        :param model: The PuLP model
+        :param variables: The (tasks x employees) object array of its variables
+        :param task_names: The names of the tasks
+        :param processing_times: The (tasks x employees) unit processing time matrix
+        :param capacities: The capacity of each task
+        :param min_hours_worked: The minimum hours worked by an employee
+        :param max_hours_worked: The maximum hours worked by an employee
+        :param build_profile: The times of the stages that produced the model
+        :return: The linear programming model
+        """
+        self = cls.__new__(cls)
+        self.task_names = list(task_names)
+        self.processing_times = processing_times
+        self.capacities = np.array(capacities, dtype=np.float64)
+        self.min_hours_worked = min_hours_worked
+        self.max_hours_worked = max_hours_worked
+        self.track_memory = False
+        self.build_profile = build_profile if build_profile is not None else PipelineProfile(track_memory=False)
+        self.build_time = sum(stage["wall_time"] for stage in self.build_profile.stages.values())
+        self.model, self.variables = model, variables
+        self.solved = False
+
+        return self
+
+    @classmethod
+    def from_input(cls, lp_input, min_hours_worked, max_hours_worked, track_memory=False):
+        """
+        Builds the model from the linear programming input
+        :param lp_input: The linear programming input (see LinearProgrammingInput)
+        :param min_hours_worked: The minimum hours worked by an employee
+        :param max_hours_worked: The maximum hours worked by an employee
+        :param track_memory: Whether the peak memory of each stage is traced
+        :return: The linear programming model
+        """
+        return cls(*lp_input.get_model_arrays(), min_hours_worked, max_hours_worked, track_memory)
+
+    def set_hour_bounds(self, min_hours_worked, max_hours_worked):
+        """
+        Updates the minimum and maximum hours worked by an employee
+        :param min_hours_worked: The minimum hours worked by an employee
+        :param max_hours_worked: The maximum hours worked by an employee
+        """
+        constraints = self.model.constraints
+        number_of_employees = self.processing_times.shape[1]
+
+        if min_hours_worked != self.min_hours_worked:
+            for i in range(number_of_employees):
+                constraints[get_constraint_name(MIN_EMPLOYEE_CAPACITY, i)].changeRHS(min_hours_worked)
+            self.min_hours_worked = min_hours_worked
+
+        if max_hours_worked != self.max_hours_worked:
+            for i in range(number_of_employees):
+                constraints[get_constraint_name(MAX_EMPLOYEE_CAPACITY, i)].changeRHS(max_hours_worked)
+            self.max_hours_worked = max_hours_worked
+
+    def set_capacities(self, capacities):
+        """
+        Updates the capacity of each task
+        :param capacities: The capacity of each task
+        """
+        capacities = np.asarray(capacities, dtype=np.float64)
+
+        for task_index in np.flatnonzero(capacities != self.capacities):
+            constraint_name = get_constraint_name(UNIT_PROCESSING_TIME, self.task_names[task_index])
+            self.model.constraints[constraint_name].changeRHS(float(capacities[task_index]))
+
+        self.capacities = capacities.copy()
+
+    def add_task(self, task_name, processing_times, capacity):
+        """
+        Adds a task to the model: its variables, its equality and unit processing time constraints, and its terms in
+        the constraints of every employee. The other variables keep their values, which the next solve uses as a
+        partial warm start
+        :param task_name: The name of the task
+        :param processing_times: The unit processing time of the task for each employee
+        :param capacity: The capacity of the task
+        """
+        processing_times = np.asarray(processing_times, dtype=np.float64)
+        constraints = self.model.constraints
+
+        variables = np.array([LpVariable(get_variable_name(task_name, i), lowBound=0, cat=LpInteger)
+                              for i in range(len(processing_times))], dtype=object)
+        self.model.objective.addInPlace(LpAffineExpression((variable, 1) for variable in variables))
+
+        if self.task_names:  # The number of pieces of every task is equal to the number of pieces of the first task
+            terms = [(variable, 1) for variable in variables] + [(variable, -1) for variable in self.variables[0]]
+            self.model += LpConstraint(LpAffineExpression(terms), LpConstraintEQ, get_constraint_name(EQUALITY, task_name), rhs=0)
+
+        expression = get_row_expressions(variables[np.newaxis], processing_times[np.newaxis])[0]
+        self.model += LpConstraint(expression, LpConstraintLE, get_constraint_name(UNIT_PROCESSING_TIME, task_name), rhs=float(capacity))
+
+        for i in np.flatnonzero(processing_times):
+            for group in (MIN_EMPLOYEE_CAPACITY, MAX_EMPLOYEE_CAPACITY):
+                get_constraint_expression(constraints[get_constraint_name(group, i)])[variables[i]] = float(processing_times[i])
 
-        for key in variables:   # For each task
-            aux_list.append(variables[key][i]*dataframe.loc[key][i])
-        
-        sum = lpSum(aux_list)
+        self.task_names.append(task_name)
+        self.processing_times = np.vstack([self.processing_times, processing_times])
+        self.capacities = np.append(self.capacities, float(capacity))
+        self.variables = np.vstack([self.variables, variables[np.newaxis]])
 
-        model += sum >= min_hours_worked # In total, the time spent by an employee must be greater than or equal to the minimum hours worked
-        model += sum <= max_hours_worked # In total, the time spent by an employee must be less than or equal to the maximum hours worked
+    def remove_task(self, task_name):
+        """
+        Removes a task from the model with its variables and constraints. The previous solution is kept as the warm
+        start if it is still feasible without the task. Removing the first task moves the equality constraints,
+        which are written against it, to the next task
+        :param task_name: The name of the task
+        """
+        task_index = self.task_names.index(task_name)
+        variables = self.variables[task_index]
+        constraints = self.model.constraints
 
+        for variable in variables:
+            del self.model.objective[variable]
 
-    # Solve model
-    model.solve()
+        for i, variable in enumerate(variables):
+            for group in (MIN_EMPLOYEE_CAPACITY, MAX_EMPLOYEE_CAPACITY):
+                get_constraint_expression(constraints[get_constraint_name(group, i)]).pop(variable, None)
 
-    return model
+        del constraints[get_constraint_name(UNIT_PROCESSING_TIME, task_name)]
+
+        if task_index > 0:
+            del constraints[get_constraint_name(EQUALITY, task_name)]
+        elif len(self.task_names) > 1:
+            first_task_variables = self.variables[1]
+            del constraints[get_constraint_name(EQUALITY, self.task_names[1])]
+
+            for other_task_name in self.task_names[2:]:
+                expression = get_constraint_expression(constraints[get_constraint_name(EQUALITY, other_task_name)])
+                for variable, first_task_variable in zip(variables, first_task_variables):
+                    del expression[variable]
+                    expression[first_task_variable] = -1
+
+        remove_variables(self.model, variables)
+
+        del self.task_names[task_index]
+        self.processing_times = np.delete(self.processing_times, task_index, axis=0)
+        self.capacities = np.delete(self.capacities, task_index)
+        self.variables = np.delete(self.variables, task_index, axis=0)
+
+        # Without tasks there is no solution left to warm start from
+        self.solved = self.solved and bool(self.task_names) and is_feasible(
+            get_allocations(self.variables), self.processing_times, self.capacities, self.min_hours_worked,
+            self.max_hours_worked)
+
+    def solve(self, warm_start=True, mode=SolveMode.EXACT, time_limit=None, gap=None, log_path=None, threads=None):
+        """
+        Solves the model, starting from the previous solution if there is one
+        :param warm_start: Whether to give the previous solution to the solver as the initial solution
+        :param mode: The solve mode (see SolveMode)
+        :param time_limit: The time limit in seconds of the integer solve (EXACT and POLISH modes)
+        :param gap: The relative gap at which the integer solve stops (EXACT and POLISH modes)
+        :param log_path: The file the solver log is written to (printed to the console if not given)
+        :param threads: The number of threads of the solver (the solver default if not given)
+        :return: The linear programming result
+        """
+        # The solver output goes either to the console or to the log file
+        solver_options = {"msg": log_path is None, "logPath": log_path, "threads": threads}
+
+        # The construction of the model is reported with every solve of it
+        profile = PipelineProfile(self.track_memory)
+        profile.update(self.build_profile)
+
+        if mode == SolveMode.EXACT:
+            with profile.stage(CBC_SOLVE):
+                self.model.solve(PULP_CBC_CMD(warmStart=warm_start and self.solved, timeLimit=time_limit, gapRel=gap, **solver_options))
+
+            with profile.stage(RESULT_EXTRACTION):
+                status = get_status(self.model)
+                self.solved = status in (Status.OPTIMAL, Status.FEASIBLE)
+                return self.get_result(status, get_allocations(self.variables), self.model.solutionTime, mode, profile=profile)
+
+        # Solve the LP relaxation (the integrality of the variables is ignored by the solver)
+        with profile.stage(CBC_SOLVE):
+            self.model.solve(PULP_CBC_CMD(mip=False, **solver_options))
+        solution_time = self.model.solutionTime
+        self.solved = False
+
+        with profile.stage(RESULT_EXTRACTION):
+            relaxed_allocations = get_allocations(self.variables)
+            relaxation_bound = float(relaxed_allocations.sum())
+
+            if self.model.status != LpStatusOptimal:
+                return self.get_result(self.model.status, relaxed_allocations, solution_time, mode, profile=profile)
+
+            if mode == SolveMode.RELAXATION:
+                return self.get_result(Status.OPTIMAL, relaxed_allocations, solution_time, mode, relaxation_bound, profile)
+
+        with profile.stage(ROUNDING):
+            allocations, feasible = round_allocations(relaxed_allocations, self.processing_times, self.capacities,
+                                                      self.min_hours_worked, self.max_hours_worked)
+            if feasible:
+                self.set_initial_values(allocations)
+                self.solved = True
+        solution_time += profile.get_wall_time(ROUNDING)
+
+        if mode == SolveMode.POLISH:
+            with profile.stage(CBC_POLISH):
+                self.model.solve(PULP_CBC_CMD(warmStart=feasible, timeLimit=time_limit, gapRel=gap, **solver_options))
+            solution_time += self.model.solutionTime
+            status = get_status(self.model)
+            if status in (Status.OPTIMAL, Status.FEASIBLE):
+                self.solved = True
+                with profile.stage(RESULT_EXTRACTION):
+                    return self.get_result(status, get_allocations(self.variables), solution_time, mode, relaxation_bound, profile)
+
+        with profile.stage(RESULT_EXTRACTION):
+            status = Status.FEASIBLE if feasible else Status.NOT_SOLVED
+            return self.get_result(status, allocations, solution_time, mode, relaxation_bound, profile)
+
+    def set_initial_values(self, allocations):
+        """
+        Sets the values of the variables, used as the warm start of the next solve
+        :param allocations: The (tasks x employees) allocation matrix
+        """
+        for variable, value in zip(self.variables.flat, allocations.flat):
+            variable.setInitialValue(value)
+
+    def get_result(self, status, allocations, solution_time, mode, relaxation_bound=None, profile=None):
+        """
+        Builds the result of a solve
+        :param status: The status
+        :param allocations: The (tasks x employees) allocation matrix
+        :param solution_time: The time spent solving
+        :param mode: The solve mode
+        :param relaxation_bound: The objective value of the LP relaxation
+        :param profile: The times of each stage of the solve
+        :return: The linear programming result
+        """
+        return LinearProgrammingResult(status, self.task_names, self.processing_times, self.capacities,
+                                       self.min_hours_worked, self.max_hours_worked, allocations, solution_time,
+                                       self.build_time, self.model, mode, relaxation_bound, profile)
+
+
+def solve_linear_programming(lp_input, min_hours_worked, max_hours_worked, mode=SolveMode.EXACT, time_limit=None, gap=None):
+    """
+    Solves the linear programming problem
+    :param lp_input: The linear programming input with the unit processing times and capacities
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param mode: The solve mode (see SolveMode)
+    :param time_limit: The time limit in seconds of the integer solve
+    :param gap: The relative gap at which the integer solve stops
+    :return: The linear programming result
+    """
+    model = LinearProgrammingModel.from_input(lp_input, min_hours_worked, max_hours_worked)
+    return model.solve(mode=mode, time_limit=time_limit, gap=gap)
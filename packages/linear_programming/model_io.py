@@ -0,0 +1,213 @@
+import argparse
+import json
+import numpy as np
+from pulp import LpProblem, LpMaximize, LpMinimize
+from packages.linear_programming.lp_solver import (LinearProgrammingModel, LinearProgrammingResult, SolveMode, EQUALITY,
+                                                   UNIT_PROCESSING_TIME, MIN_EMPLOYEE_CAPACITY, MAX_EMPLOYEE_CAPACITY,
+                                                   get_constraint_name)
+from packages.utils.profiling import PipelineProfile, MODEL_IMPORT
+
+
+MPS_EXTENSION = ".mps"
+METADATA_EXTENSION = ".json"    # Sidecar mapping the rows and columns of the MPS file to tasks and employees
+RESULT_EXTENSION = ".result.json"
+
+FORMAT_VERSION = 1
+
+
+def get_model_paths(path):
+    """
+    Returns the paths of the files of a saved model
+    :param path: The path of the saved model, without extension
+    :return: The paths of the MPS file and of its metadata
+    """
+    return path + MPS_EXTENSION, path + METADATA_EXTENSION
+
+
+def read_objective_sense(mps_path):
+    """
+    Reads the objective sense declared in the OBJSENSE section of an MPS file (PuLP reads every file as a minimization)
+    :param mps_path: The path of the MPS file
+    :return: The sense (LpMaximize or LpMinimize), None if the file does not declare it
+    """
+    with open(mps_path) as f:
+        words = []
+        for line in f:
+            if line.startswith("ROWS"):
+                break
+            words.extend(line.split())
+
+    if "OBJSENSE" in words[:-1]:
+        return LpMaximize if words[words.index("OBJSENSE") + 1].startswith("MAX") else LpMinimize
+    return None
+
+
+def get_model_metadata(lp_model):
+    """
+    Returns the metadata of a model, which maps the columns of the MPS file to (task, employee) pairs and its rows to
+    their constraint group and task or employee
+    :param lp_model: The linear programming model
+    :return: The metadata dictionary
+    """
+    number_of_tasks, number_of_employees = lp_model.variables.shape
+    employee_ids = list(range(number_of_employees))
+    row_keys = {EQUALITY: lp_model.task_names[1:], UNIT_PROCESSING_TIME: lp_model.task_names,
+                MIN_EMPLOYEE_CAPACITY: employee_ids, MAX_EMPLOYEE_CAPACITY: employee_ids}
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "name": lp_model.model.name,
+        "sense": lp_model.model.sense,
+        "task_names": lp_model.task_names,
+        "number_of_employees": number_of_employees,
+        "columns": [variable.name for variable in lp_model.variables.flat],  # Row-major, (task, employee)
+        "rows": {group: {"names": [get_constraint_name(group, key) for key in keys], "keys": keys}
+                 for group, keys in row_keys.items()},
+    }
+
+
+def export_model(lp_model, path):
+    """
+    Writes a model to an MPS file and its metadata to a JSON sidecar
+    :param lp_model: The linear programming model
+    :param path: The path of the saved model, without extension
+    :return: The paths of the MPS file and of its metadata
+    """
+    mps_path, metadata_path = get_model_paths(path)
+
+    lp_model.model.writeMPS(mps_path, with_objsense=True)  # Keep the maximization sense in the file
+    with open(metadata_path, "w") as f:
+        json.dump(get_model_metadata(lp_model), f, indent=4)
+
+    return mps_path, metadata_path
+
+
+def import_model(path):
+    """
+    Reads a model written by export_model. The unit processing times, capacities and hour bounds are read back from
+    the constraints of the model
+    :param path: The path of the saved model, without extension
+    :return: The linear programming model
+    """
+    mps_path, metadata_path = get_model_paths(path)
+    profile = PipelineProfile(track_memory=False)
+
+    with profile.stage(MODEL_IMPORT):
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+
+        if metadata.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version: {metadata.get('format_version')}")
+
+        # Models exported before the MPS file declared its sense only have it in the metadata
+        sense = read_objective_sense(mps_path) or metadata["sense"]
+        variables_by_name, model = LpProblem.fromMPS(mps_path, sense=sense)
+        model.name = metadata["name"]
+
+        task_names = metadata["task_names"]
+        shape = (len(task_names), metadata["number_of_employees"])
+        variables = np.empty(shape[0] * shape[1], dtype=object)
+        variables[:] = [variables_by_name[name] for name in metadata["columns"]]
+        variables = variables.reshape(shape)
+
+        # Each unit processing time constraint holds the processing times of its task
+        rows = metadata["rows"]
+        processing_times = np.zeros(shape)
+        capacities = np.zeros(shape[0])
+        for task_index, name in enumerate(rows[UNIT_PROCESSING_TIME]["names"]):
+            constraint = model.constraints[name]
+            processing_times[task_index] = [constraint.get(variable, 0.0) for variable in variables[task_index]]
+            capacities[task_index] = -constraint.constant
+
+        min_hours_worked = -model.constraints[rows[MIN_EMPLOYEE_CAPACITY]["names"][0]].constant
+        max_hours_worked = -model.constraints[rows[MAX_EMPLOYEE_CAPACITY]["names"][0]].constant
+
+    return LinearProgrammingModel.from_problem(model, variables, task_names, processing_times, capacities,
+                                               min_hours_worked, max_hours_worked, profile)
+
+
+def write_result(result, path):
+    """
+    Writes a result to JSON
+    :param result: The linear programming result
+    :param path: The path of the file
+    """
+    allocations = result.allocations
+    if np.allclose(allocations, np.round(allocations)):
+        allocations = np.round(allocations).astype(np.int64)
+
+    data = {
+        "format_version": FORMAT_VERSION,
+        "status": result.status,
+        "mode": result.mode,
+        "objective_value": result.objective_value,
+        "relaxation_bound": result.relaxation_bound,
+        "solution_time": result.solution_time,
+        "build_time": result.build_time,
+        "task_names": result.task_names,
+        "capacities": np.asarray(result.capacities, dtype=np.float64).tolist(),
+        "min_hours_worked": result.min_hours_worked,
+        "max_hours_worked": result.max_hours_worked,
+        "allocations": allocations.tolist(),  # (tasks x employees)
+        "stages": result.profile.stages if result.profile is not None else {},
+    }
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def read_result(file, processing_times):
+    """
+    Reads a result written by write_result
+    :param file: The path of the file or a file object
+    :param processing_times: The (tasks x employees) unit processing time matrix of the solved model
+    :return: The linear programming result
+    """
+    if isinstance(file, str):
+        with open(file) as f:
+            data = json.load(f)
+    else:
+        data = json.load(file)
+
+    if data.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result format version: {data.get('format_version')}")
+
+    allocations = np.array(data["allocations"], dtype=np.float64)
+    if allocations.shape != processing_times.shape:
+        raise ValueError(f"The result has shape {allocations.shape}, the model has shape {processing_times.shape}")
+
+    profile = PipelineProfile(track_memory=False)
+    for name, stage in data["stages"].items():
+        profile.record(name, stage["wall_time"], stage["cpu_time"], stage["peak_memory"], stage["calls"])
+
+    return LinearProgrammingResult(data["status"], data["task_names"], processing_times, np.array(data["capacities"]),
+                                   data["min_hours_worked"], data["max_hours_worked"], allocations,
+                                   data["solution_time"], data["build_time"], mode=data["mode"],
+                                   relaxation_bound=data["relaxation_bound"], profile=profile)
+
+
+def main():
+    """
+    Re-solves a saved model off the interactive path and writes its result next to it
+    """
+    parser = argparse.ArgumentParser(description="Re-solve a linear programming model saved with export_model")
+    parser.add_argument("path", help="Path of the saved model, without extension")
+    parser.add_argument("--mode", default=SolveMode.EXACT,
+                        choices=[SolveMode.EXACT, SolveMode.RELAXATION, SolveMode.ROUNDING, SolveMode.POLISH])
+    parser.add_argument("--time-limit", type=float, help="Time limit in seconds of the integer solve")
+    parser.add_argument("--gap", type=float, help="Relative gap at which the integer solve stops")
+    parser.add_argument("--threads", type=int, help="Number of solver threads")
+    parser.add_argument("--log", help="File the solver log is written to (printed to the console if not given)")
+    parser.add_argument("--output", help=f"Path of the result (the model path with {RESULT_EXTENSION} if not given)")
+    args = parser.parse_args()
+
+    lp_model = import_model(args.path)
+    result = lp_model.solve(mode=args.mode, time_limit=args.time_limit, gap=args.gap, log_path=args.log, threads=args.threads)
+
+    output = args.output or args.path + RESULT_EXTENSION
+    write_result(result, output)
+    print(f"Status {result.status}, objective {result.objective_value:.0f}, {result.solution_time:.2f} seconds: {output}")
+
+
+if __name__ == "__main__":
+    main()
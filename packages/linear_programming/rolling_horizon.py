@@ -0,0 +1,259 @@
+import calendar
+import datetime
+import numpy as np
+import pandas as pd
+from pulp import LpProblem, LpVariable, LpAffineExpression, LpConstraint, LpMaximize, LpInteger, LpConstraintLE, \
+    LpConstraintGE, LpConstraintEQ, PULP_CBC_CMD
+from packages.dataset_generator.business_calendar import DEFAULT_COUNTRY, get_business_day_mask
+from packages.dataset_generator.datagen import HOURS_PER_BUSINESS_DAY, draw_leave_mask
+from packages.linear_programming.lp_solver import Status, get_allocations, get_row_expressions, get_status
+
+
+DEFAULT_NUMBER_OF_MONTHS = 3    # A quarter
+DEFAULT_WINDOW = 4  # Periods (weeks) solved together
+DEFAULT_STEP = 1    # Periods of each window that are committed before the window rolls forward
+
+
+def get_horizon_days(year, month, number_of_months, country=DEFAULT_COUNTRY):
+    """
+    Returns the days of consecutive months from the business day index of each month
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months
+    :param country: The country code used for the holidays
+    :return: The dates, the business day flag of each date, and the (month in the horizon, day of month - 1) index of
+    each date
+    """
+    dates, business_days, month_indexes, day_indexes = [], [], [], []
+    for i in range(number_of_months):
+        this_year, this_month = year + (month - 1 + i) // 12, (month - 1 + i) % 12 + 1
+        number_of_days = calendar.monthrange(this_year, this_month)[1]
+
+        dates.append(np.arange(np.datetime64(datetime.date(this_year, this_month, 1)), number_of_days))
+        business_days.append(get_business_day_mask(country, this_year, this_month)[:number_of_days])
+        month_indexes.append(np.full(number_of_days, i))
+        day_indexes.append(np.arange(number_of_days))
+
+    return np.concatenate(dates), np.concatenate(business_days), np.concatenate(month_indexes), np.concatenate(day_indexes)
+
+
+def get_period_starts(dates):
+    """
+    Returns the first day of each week (period) of a horizon, the first period ends on the first Sunday
+    :param dates: The dates of the horizon
+    :return: The indexes of the first day of each period
+    """
+    weekdays = (dates.astype("datetime64[D]").view(np.int64) - 4) % 7   # 1970-01-01 was a Thursday, Monday == 0
+    return np.flatnonzero((weekdays == 0) | (np.arange(len(dates)) == 0))
+
+
+def get_weekly_availability(number_of_employees, year, month, number_of_months=DEFAULT_NUMBER_OF_MONTHS, leave_masks=None,
+                            seed=None, country=DEFAULT_COUNTRY):
+    """
+    Returns the hours each employee is available in each week of a horizon: the business days of the week that are
+    not leave days, times the hours per business day
+    :param number_of_employees: The number of employees
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months
+    :param leave_masks: The (employees x 31) leave day mask of each month (drawn like the datasets if not given)
+    :param seed: The seed used to draw the leave days
+    :param country: The country code used for the holidays
+    :return: The first date of each week and the (employees x weeks) available hours
+    """
+    dates, business_days, month_indexes, day_indexes = get_horizon_days(year, month, number_of_months, country)
+
+    if leave_masks is None:
+        rng = np.random.default_rng(seed)
+        leave_masks = [draw_leave_mask(rng, number_of_employees) for _ in range(number_of_months)]
+    leave_days = np.stack(leave_masks)[month_indexes, :, day_indexes].T    # (employees x days of the horizon)
+
+    period_starts = get_period_starts(dates)
+    available_days = np.add.reduceat(business_days & ~leave_days, period_starts, axis=1)
+
+    return dates[period_starts], available_days * HOURS_PER_BUSINESS_DAY
+
+
+def get_period_capacities(capacities, year, month, number_of_months=DEFAULT_NUMBER_OF_MONTHS, country=DEFAULT_COUNTRY):
+    """
+    Spreads the monthly capacity of each task over the weeks of a horizon in proportion to their business days
+    :param capacities: The monthly capacity of each task
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months
+    :param country: The country code used for the holidays
+    :return: The (tasks x weeks) capacities
+    """
+    dates, business_days, month_indexes, _ = get_horizon_days(year, month, number_of_months, country)
+
+    business_days_per_month = np.bincount(month_indexes, weights=business_days, minlength=number_of_months)
+    daily_share = np.divide(business_days, business_days_per_month[month_indexes],
+                            out=np.zeros(len(dates)), where=business_days_per_month[month_indexes] > 0)
+    weekly_share = np.add.reduceat(daily_share, get_period_starts(dates))
+
+    return np.asarray(capacities, dtype=np.float64)[:, np.newaxis] * weekly_share
+
+
+class PeriodPlan:
+    """
+    Class to represent the committed plan of one period of the rolling horizon
+    """
+
+    def __init__(self, period, number_of_periods, start_date, status, allocations, processing_times, availability,
+                 work_in_progress):
+        self.period = period
+        self.number_of_periods = number_of_periods  # Periods of the whole horizon
+        self.start_date = start_date
+        self.status = status
+        self.allocations = allocations  # (tasks x employees) pieces of each task done by each employee in the period
+        self.employee_hours = (allocations * processing_times).sum(axis=0)
+        self.availability = availability    # Hours each employee was available in the period
+        self.task_pieces = allocations.sum(axis=1)
+        self.completed_pieces = float(self.task_pieces[-1]) # Pieces that went through the last task
+        self.work_in_progress = work_in_progress    # Pieces waiting for each task at the end of the period
+
+
+def get_period_summary(plan):
+    """
+    Summarizes the plan of a period
+    :param plan: The plan of the period
+    :return: A dictionary with the period, its start date, status, completed pieces, hours and work in progress
+    """
+    return {"period": plan.period,
+            "start_date": pd.Timestamp(plan.start_date),
+            "status": plan.status,
+            "completed_pieces": plan.completed_pieces,
+            "hours_worked": float(plan.employee_hours.sum()),
+            "hours_available": float(plan.availability.sum()),
+            "work_in_progress": float(plan.work_in_progress.sum())}
+
+
+def build_window_model(processing_times, availability, capacities, work_in_progress, min_utilization=0.0):
+    """
+    Builds the model of a window of periods. The tasks are the stages every piece goes through in order, a task can
+    only process the pieces the previous task finished (in this or an earlier period) and the pieces that were waiting
+    for it when the window started. The number of pieces that go through the last task is maximized
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param availability: The (employees x periods) available hours
+    :param capacities: The (tasks x periods) capacities
+    :param work_in_progress: The pieces waiting for each task when the window starts
+    :param min_utilization: The fraction of their available hours the employees must work
+    :return: The model, the (periods x tasks x employees) object array of the pieces variables and the
+    (periods x tasks) object array of the work in progress variables
+    """
+    number_of_tasks, number_of_employees = processing_times.shape
+    number_of_periods = availability.shape[1]
+
+    model = LpProblem("Rolling_Horizon_Window", LpMaximize)
+
+    variables = np.array([[[LpVariable(f"X{t}_{i}_{p}", lowBound=0, cat=LpInteger) for i in range(number_of_employees)]
+                           for t in range(number_of_tasks)] for p in range(number_of_periods)], dtype=object)
+    waiting = np.array([[LpVariable(f"W{t}_{p}", lowBound=0) for t in range(number_of_tasks)]
+                        for p in range(number_of_periods)], dtype=object)
+
+    # Define objective
+    model += LpAffineExpression((variable, 1) for variable in variables[:, -1].flat)
+
+    for p in range(number_of_periods):
+        # Related to the capacity of each task in the period
+        for t, expression in enumerate(get_row_expressions(variables[p], processing_times)):
+            model += LpConstraint(expression, LpConstraintLE, f"capacity_{t}_{p}", rhs=float(capacities[t, p]))
+
+        # Related to the hours each employee is available in the period
+        for i, expression in enumerate(get_row_expressions(variables[p].T, processing_times.T)):
+            model += LpConstraint(expression, LpConstraintLE, f"max_hours_{i}_{p}", rhs=float(availability[i, p]))
+            if min_utilization > 0:
+                model += LpConstraint(LpAffineExpression(expression), LpConstraintGE, f"min_hours_{i}_{p}",
+                                      rhs=float(min_utilization * availability[i, p]))
+
+        # Related to the pieces waiting for each task: what was waiting, plus what the previous task finished, minus
+        # what the task processed
+        for t in range(1, number_of_tasks):
+            terms = [(waiting[p, t], 1)] + [(variable, 1) for variable in variables[p, t]] + \
+                    [(variable, -1) for variable in variables[p, t - 1]]
+            if p > 0:
+                terms.append((waiting[p - 1, t], -1))
+            rhs = float(work_in_progress[t]) if p == 0 else 0.0
+            model += LpConstraint(LpAffineExpression(terms), LpConstraintEQ, f"waiting_{t}_{p}", rhs=rhs)
+
+    return model, variables, waiting
+
+
+def iter_rolling_horizon(processing_times, capacities, year, month, number_of_months=DEFAULT_NUMBER_OF_MONTHS,
+                         window=DEFAULT_WINDOW, step=DEFAULT_STEP, min_utilization=0.0, leave_masks=None, seed=None,
+                         time_limit=None, gap=None, country=DEFAULT_COUNTRY):
+    """
+    Plans a horizon week by week with a rolling horizon: each window of periods is solved, its first periods are
+    committed, the work in progress they leave is carried over and the window moves forward. The solution of the
+    periods shared with the next window is its warm start. Only the model of the active window is kept in memory, the
+    plans are yielded as they are committed
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The monthly capacity of each task
+    :param year: The year of the first month
+    :param month: The first month
+    :param number_of_months: The number of months of the horizon
+    :param window: The number of periods solved together
+    :param step: The number of periods committed from each window
+    :param min_utilization: The fraction of their available hours the employees must work
+    :param leave_masks: The (employees x 31) leave day mask of each month (drawn like the datasets if not given)
+    :param seed: The seed used to draw the leave days
+    :param time_limit: The time limit in seconds of each window
+    :param gap: The relative gap at which each window stops
+    :param country: The country code used for the holidays
+    :return: A generator of the plan of each period (see PeriodPlan)
+    """
+    number_of_tasks, number_of_employees = processing_times.shape
+    period_starts, availability = get_weekly_availability(number_of_employees, year, month, number_of_months,
+                                                          leave_masks, seed, country)
+    period_capacities = get_period_capacities(capacities, year, month, number_of_months, country)
+    number_of_periods = len(period_starts)
+    step = max(1, min(step, window))
+
+    work_in_progress = np.zeros(number_of_tasks)
+    previous_allocations = None
+
+    for first_period in range(0, number_of_periods, step):
+        last_period = min(first_period + window, number_of_periods)
+        model, variables, _ = build_window_model(processing_times, availability[:, first_period:last_period],
+                                                 period_capacities[:, first_period:last_period], work_in_progress,
+                                                 min_utilization)
+
+        # The periods this window shares with the previous one start from the previous solution
+        if previous_allocations is not None:
+            for variable, value in zip(variables[:len(previous_allocations)].flat, previous_allocations.flat):
+                variable.setInitialValue(value)
+
+        model.solve(PULP_CBC_CMD(msg=False, warmStart=previous_allocations is not None, timeLimit=time_limit, gapRel=gap))
+        status = get_status(model)
+
+        if status in (Status.OPTIMAL, Status.FEASIBLE):
+            allocations = np.round(get_allocations(variables))
+            previous_allocations = allocations[step:]
+        else:
+            allocations = np.zeros(variables.shape)
+            previous_allocations = None
+
+        for p in range(min(step, last_period - first_period)):
+            # Carry over the pieces finished by each task that the next task has not processed
+            task_pieces = allocations[p].sum(axis=1)
+            work_in_progress[1:] += task_pieces[:-1] - task_pieces[1:]
+
+            period = first_period + p
+            yield PeriodPlan(period, number_of_periods, period_starts[period], status, allocations[p], processing_times,
+                             availability[:, period], work_in_progress.copy())
+
+
+def solve_rolling_horizon(processing_times, capacities, year, month, **options):
+    """
+    Plans a horizon week by week with a rolling horizon and summarizes each period, so the allocations of only one
+    period are in memory at a time
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The monthly capacity of each task
+    :param year: The year of the first month
+    :param month: The first month
+    :param options: The other options of iter_rolling_horizon (number of months, window, step, ...)
+    :return: A dataframe with one row per period
+    """
+    rows = [get_period_summary(plan) for plan in iter_rolling_horizon(processing_times, capacities, year, month, **options)]
+
+    return pd.DataFrame(rows).set_index("period")
@@ -0,0 +1,149 @@
+import numpy as np
+
+
+TOLERANCE = 1e-6
+
+
+def get_hours(allocations, processing_times):
+    """
+    Returns the hours worked by each employee
+    :param allocations: The (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :return: The hours worked by each employee
+    """
+    return (allocations * processing_times).sum(axis=0)
+
+
+def is_feasible(allocations, processing_times, capacities, min_hours_worked, max_hours_worked):
+    """
+    Checks if an integer allocation satisfies every constraint of the model
+    :param allocations: The (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :return: True if the allocation is feasible
+    """
+    pieces = allocations.sum(axis=1)
+    hours = get_hours(allocations, processing_times)
+    loads = (allocations * processing_times).sum(axis=1)
+
+    return bool(np.all(allocations >= 0)
+                and np.all(np.abs(allocations - np.round(allocations)) <= TOLERANCE)
+                and np.all(pieces == pieces[:1])   # A model without tasks has no pieces to compare
+                and np.all(loads <= capacities + TOLERANCE)
+                and np.all(hours >= min_hours_worked - TOLERANCE)
+                and np.all(hours <= max_hours_worked + TOLERANCE))
+
+
+def remove_surplus(allocations, processing_times, hours, task_index, surplus, min_hours_worked):
+    """
+    Removes pieces of a task, taking them from the employees that stay furthest above the minimum hours
+    :param allocations: The allocation matrix (updated in place)
+    :param processing_times: The unit processing time matrix
+    :param hours: The hours worked by each employee (updated in place)
+    :param task_index: The index of the task
+    :param surplus: The number of pieces to remove
+    :param min_hours_worked: The minimum hours worked by an employee
+    """
+    times = processing_times[task_index]
+    while surplus > 0:
+        workers = np.flatnonzero(allocations[task_index] > 0)
+        # Remove one piece from each of the employees with the most hours left above the minimum after the removal
+        order = workers[np.argsort(-(hours[workers] - times[workers] - min_hours_worked), kind="stable")][:surplus]
+        allocations[task_index, order] -= 1
+        hours[order] -= times[order]
+        surplus -= len(order)
+
+
+def fill_minimum_hours(allocations, processing_times, capacities, hours, min_hours_worked, max_hours_worked):
+    """
+    Moves pieces from other employees to the employees below the minimum hours, keeping the number of pieces of each
+    task, the capacities and the maximum hours unchanged
+    :param allocations: The allocation matrix (updated in place)
+    :param processing_times: The unit processing time matrix
+    :param capacities: The capacity of each task
+    :param hours: The hours worked by each employee (updated in place)
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    """
+    loads = (allocations * processing_times).sum(axis=1)
+
+    for employee in np.flatnonzero(hours < min_hours_worked - TOLERANCE):
+        # Try the tasks the employee is fastest at first
+        for task_index in np.argsort(processing_times[:, employee], kind="stable"):
+            times = processing_times[task_index]
+            employee_time = times[employee]
+
+            while hours[employee] < min_hours_worked - TOLERANCE and hours[employee] + employee_time <= max_hours_worked + TOLERANCE:
+                # Donors keep their minimum hours and the task load must stay within its capacity
+                donors = ((allocations[task_index] > 0) & (hours - times >= min_hours_worked - TOLERANCE)
+                          & (loads[task_index] + employee_time - times <= capacities[task_index] + TOLERANCE))
+                donors[employee] = False
+                if not donors.any():
+                    break
+
+                donor = np.flatnonzero(donors)[np.argmax(times[donors])]  # Take from the slowest donor
+                allocations[task_index, donor] -= 1
+                allocations[task_index, employee] += 1
+                hours[donor] -= times[donor]
+                hours[employee] += employee_time
+                loads[task_index] += employee_time - times[donor]
+
+            if hours[employee] >= min_hours_worked - TOLERANCE:
+                break
+
+
+def add_pieces(allocations, processing_times, capacities, hours, max_hours_worked):
+    """
+    Adds one piece to every task while the capacities and maximum hours allow it
+    :param allocations: The allocation matrix (updated in place)
+    :param processing_times: The unit processing time matrix
+    :param capacities: The capacity of each task
+    :param hours: The hours worked by each employee (updated in place)
+    :param max_hours_worked: The maximum hours worked by an employee
+    """
+    loads = (allocations * processing_times).sum(axis=1)
+
+    while True:
+        chosen = []
+        new_hours = hours.copy()
+        for task_index, times in enumerate(processing_times):
+            candidates = (new_hours + times <= max_hours_worked + TOLERANCE) & (loads[task_index] + times <= capacities[task_index] + TOLERANCE)
+            if not candidates.any():
+                return
+
+            employee = np.flatnonzero(candidates)[np.argmin(times[candidates])]  # Give it to the fastest employee
+            new_hours[employee] += times[employee]
+            chosen.append(employee)
+
+        for task_index, employee in enumerate(chosen):
+            allocations[task_index, employee] += 1
+            loads[task_index] += processing_times[task_index, employee]
+        hours[:] = new_hours
+
+
+def round_allocations(relaxed_allocations, processing_times, capacities, min_hours_worked, max_hours_worked):
+    """
+    Rounds a fractional (LP relaxation) allocation to an integer one with the same number of pieces in every task,
+    repairing the hour bounds and then adding whole pieces while the constraints allow it
+    :param relaxed_allocations: The fractional (tasks x employees) allocation matrix
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :return: The integer allocation matrix and whether it is feasible
+    """
+    allocations = np.floor(relaxed_allocations + TOLERANCE)
+    hours = get_hours(allocations, processing_times)
+
+    # Keep the per-task equality constraints by bringing every task down to the task with the fewest pieces
+    pieces = allocations.sum(axis=1)
+    for task_index in np.flatnonzero(pieces > pieces.min()):
+        remove_surplus(allocations, processing_times, hours, task_index, int(pieces[task_index] - pieces.min()), min_hours_worked)
+
+    fill_minimum_hours(allocations, processing_times, capacities, hours, min_hours_worked, max_hours_worked)
+    add_pieces(allocations, processing_times, capacities, hours, max_hours_worked)
+    fill_minimum_hours(allocations, processing_times, capacities, hours, min_hours_worked, max_hours_worked)
+
+    return allocations, is_feasible(allocations, processing_times, capacities, min_hours_worked, max_hours_worked)
@@ -0,0 +1,112 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from packages.linear_programming.lp_solver import LinearProgrammingModel, SolveMode, Status
+from packages.linear_programming.combinatorial_solver import solve_combinatorial
+
+
+# Problem shared by the scenarios solved in a worker process (set by init_worker)
+worker_problem = {}
+
+
+def get_scenarios(min_hours_grid, max_hours_grid, capacity_grid):
+    """
+    Returns every combination of the grids, skipping the ones where the minimum hours exceed the maximum hours
+    :param min_hours_grid: The minimum hours worked values
+    :param max_hours_grid: The maximum hours worked values
+    :param capacity_grid: The capacity values, each one a number applied to every task or a capacity per task
+    :return: The list of (min_hours_worked, max_hours_worked, capacity) scenarios
+    """
+    return [(min_hours_worked, max_hours_worked, capacity)
+            for min_hours_worked, max_hours_worked, capacity in itertools.product(min_hours_grid, max_hours_grid, capacity_grid)
+            if min_hours_worked <= max_hours_worked]
+
+
+def init_worker(task_names, processing_times, mode, time_limit):
+    """
+    Stores the problem in the worker process, so it is sent once per worker instead of once per scenario
+    """
+    worker_problem.clear()
+    worker_problem.update(task_names=task_names, processing_times=processing_times, mode=mode, time_limit=time_limit,
+                          model=None)
+
+
+def solve_scenario(scenario):
+    """
+    Solves one scenario of the problem stored in the worker
+    :param scenario: A (min_hours_worked, max_hours_worked, capacity) tuple
+    :return: A dictionary with the scenario and its status, objective, pieces, hours used and solve time
+    """
+    min_hours_worked, max_hours_worked, capacity = scenario
+    task_names = worker_problem["task_names"]
+    processing_times = worker_problem["processing_times"]
+    capacities = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (len(task_names),))
+
+    if worker_problem["mode"] == SolveMode.COMBINATORIAL:
+        result = solve_combinatorial(task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                     time_limit=worker_problem["time_limit"])
+    else:
+        # The worker keeps one model and only updates the right-hand sides between scenarios
+        if worker_problem["model"] is None:
+            worker_problem["model"] = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked)
+        model = worker_problem["model"]
+        model.set_hour_bounds(min_hours_worked, max_hours_worked)
+        model.set_capacities(capacities)
+        result = model.solve(mode=worker_problem["mode"], time_limit=worker_problem["time_limit"])
+
+    solved = result.status in (Status.OPTIMAL, Status.FEASIBLE)
+
+    return {"min_hours_worked": min_hours_worked,
+            "max_hours_worked": max_hours_worked,
+            "capacity": capacity if np.ndim(capacity) == 0 else tuple(np.asarray(capacity).tolist()),
+            "status": result.status,
+            "objective": result.objective_value if solved else np.nan,
+            "total_pieces": result.total_pieces if solved else np.nan,
+            "hours_used": result.total_hours if solved else np.nan,
+            "solve_time": result.solution_time}
+
+
+def sweep_scenarios(task_names, processing_times, min_hours_grid, max_hours_grid, capacity_grid,
+                    mode=SolveMode.ROUNDING, time_limit=None, max_workers=None):
+    """
+    Solves every scenario of the grids of hour bounds and capacities on a process pool
+    :param task_names: The names of the tasks
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param min_hours_grid: The minimum hours worked values
+    :param max_hours_grid: The maximum hours worked values
+    :param capacity_grid: The capacity values, each one a number applied to every task or a capacity per task
+    :param mode: The solve mode of every scenario (see SolveMode)
+    :param time_limit: The time limit in seconds of each integer solve
+    :param max_workers: The number of worker processes (1 solves every scenario in this process)
+    :return: A dataframe with one row per scenario
+    """
+    scenarios = get_scenarios(min_hours_grid, max_hours_grid, capacity_grid)
+    initargs = (list(task_names), processing_times, mode, time_limit)
+
+    if max_workers == 1:
+        init_worker(*initargs)
+        rows = [solve_scenario(scenario) for scenario in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=initargs) as executor:
+            chunksize = max(1, len(scenarios) // (4 * (max_workers or os.cpu_count() or 1)))
+            rows = list(executor.map(solve_scenario, scenarios, chunksize=chunksize))
+
+    return pd.DataFrame(rows, columns=["min_hours_worked", "max_hours_worked", "capacity", "status", "objective",
+                                       "total_pieces", "hours_used", "solve_time"])
+
+
+def get_throughput_frontier(sweep):
+    """
+    Returns the scenarios where no other scenario produces more pieces with the same or fewer hours
+    :param sweep: The dataframe returned by sweep_scenarios
+    :return: The frontier dataframe sorted by hours used
+    """
+    solved = sweep.dropna(subset=["total_pieces", "hours_used"])
+    solved = solved.sort_values(["hours_used", "total_pieces"], ascending=[True, False], kind="stable")
+
+    # A scenario is on the frontier if it produces more pieces than every scenario using fewer hours
+    best_so_far = solved["total_pieces"].cummax().shift(fill_value=-np.inf)
+
+    return solved[solved["total_pieces"] > best_so_far].reset_index(drop=True)
@@ -0,0 +1,181 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+DEFAULT_CACHE_DIRECTORY = os.environ.get("SOLUTION_CACHE_DIRECTORY", "solution_cache")
+
+DEFAULT_MAX_ENTRIES = 32    # Results kept in memory
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # Size of the results kept on disk
+
+CACHE_FILE_EXTENSION = ".pkl"
+CACHE_FORMAT_VERSION = 1    # Bump when LinearProgrammingResult changes so older pickles are no longer looked up
+
+
+def get_cache_key(task_names, processing_times, capacities, difficulties, min_hours_worked, max_hours_worked, **solve_options):
+    """
+    Returns the content hash of the inputs of a solve
+    :param task_names: The names of the tasks
+    :param processing_times: The (tasks x employees) unit processing time matrix
+    :param capacities: The capacity of each task
+    :param difficulties: The difficulty of each task
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param solve_options: The options that change the result (solve mode, time limit, ...)
+    :return: The hexadecimal key
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode())
+    processing_times = np.ascontiguousarray(processing_times, dtype=np.float64)
+    digest.update(str(processing_times.shape).encode())
+    digest.update(processing_times.tobytes())
+    digest.update(np.ascontiguousarray(capacities, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(difficulties, dtype=np.float64).tobytes())
+    digest.update(json.dumps([list(task_names), min_hours_worked, max_hours_worked, solve_options],
+                             sort_keys=True, default=str).encode())
+
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """
+    Class to cache linear programming results by content hash, with a LRU tier in memory and a tier on disk shared by
+    every session and process using the same directory. The disk tier evicts the least recently used results when it
+    grows past its size limit
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIRECTORY, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()    # The cache is shared by the sessions of the Streamlit process
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_FILE_EXTENSION)
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Returns a copy of a cached result, so the caller can change it without affecting other sessions
+        :param key: The cache key
+        :return: The result, None if it is not cached
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self.memory[key])
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)  # The modification time orders the disk tier for eviction
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return None
+        except Exception:   # Truncated or written by an incompatible version of the code, so it is never usable
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self._remember(key, result)
+            self.hits += 1
+            self.disk_hits += 1
+
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+        """
+        Caches a result in memory and on disk
+        :param key: The cache key
+        :param result: The linear programming result
+        """
+        # The PuLP model is not cached, so both tiers return the same arrays-only result
+        result = copy.copy(result)
+        result.model = None
+        result = copy.deepcopy(result)  # Later changes made by the caller must not reach the cache
+
+        with self.lock:
+            self._remember(key, result)
+
+        temporary_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._path(key))
+
+        self.evict()
+
+    def _disk_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_FILE_EXTENSION):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:   # Evicted by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used results from disk until the disk tier fits in its size limit
+        """
+        entries = sorted(self._disk_entries())
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def get_stats(self):
+        """
+        Returns the hit/miss counters and the size of each tier
+        :return: A dictionary with the statistics
+        """
+        entries = self._disk_entries()
+        with self.lock:
+            return {"hits": self.hits,
+                    "disk_hits": self.disk_hits,
+                    "misses": self.misses,
+                    "memory_entries": len(self.memory),
+                    "disk_entries": len(entries),
+                    "disk_bytes": sum(size for _, size, _ in entries)}
+
+    def clear(self):
+        """
+        Removes every cached result
+        """
+        with self.lock:
+            self.memory.clear()
+        for _, _, path in self._disk_entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
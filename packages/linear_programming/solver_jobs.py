@@ -0,0 +1,340 @@
+import multiprocessing
+import os
+import re
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from packages.linear_programming.lp_solver import LinearProgrammingModel, SolveMode
+from packages.linear_programming.combinatorial_solver import solve_combinatorial
+
+
+class JobStatus:
+    """
+    Class to represent the status of a solver job
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+DEFAULT_MAX_WORKERS = 2 # Number of solves running at the same time
+
+POLL_INTERVAL = 0.2 # Seconds between checks of a running solve
+
+FINISHED_JOB_MAX_AGE = 60 * 60  # Seconds a finished job is kept for its session to collect it
+DEFAULT_MAX_FINISHED_JOBS = 64  # Finished jobs kept at most (sessions that are closed never collect theirs)
+
+# CBC log lines with the progress of the search (maximization objectives are logged negated)
+INTEGER_SOLUTION_PATTERN = re.compile(r"Integer solution of (-?[\d.eE+-]+)")
+NODE_PROGRESS_PATTERN = re.compile(r"(-?[\d.eE+-]+) best solution, best possible (-?[\d.eE+-]+)")
+CONTINUOUS_OBJECTIVE_PATTERN = re.compile(r"Continuous objective value is (-?[\d.eE+-]+)")
+
+
+@contextmanager
+def terminal_output(log_path):
+    """
+    Sends the output of the processes started inside the context to a log file through a pseudo-terminal, written as
+    it is produced. CBC buffers its output in blocks when it writes to a file or a pipe, so the log stays empty until
+    the solve ends, but it writes every line as soon as it is printed when the output is a terminal
+    :param log_path: The path of the log file
+    :return: True if the output is sent to the log file, False if there are no pseudo-terminals (the caller has to
+    write the log itself)
+    """
+    if not hasattr(os, "openpty"):
+        yield False
+        return
+
+    import termios
+
+    master, slave = os.openpty()
+    attributes = termios.tcgetattr(slave)
+    attributes[1] &= ~termios.OPOST  # Keep the line endings as printed
+    termios.tcsetattr(slave, termios.TCSANOW, attributes)
+
+    def relay():
+        with open(log_path, "wb", buffering=0) as log:
+            while True:
+                try:
+                    data = os.read(master, 4096)
+                except OSError:     # Every process writing to the terminal has exited
+                    break
+                if not data:
+                    break
+                log.write(data)
+
+    relay_thread = threading.Thread(target=relay, daemon=True)
+    relay_thread.start()
+
+    saved = [os.dup(1), os.dup(2)]
+    os.dup2(slave, 1)
+    os.dup2(slave, 2)
+    try:
+        yield True
+    finally:
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in (*saved, slave):
+            os.close(fd)
+        relay_thread.join()
+        os.close(master)
+
+
+def solve_problem(connection, task_names, processing_times, capacities, min_hours_worked, max_hours_worked, mode,
+                  time_limit, gap, log_path):
+    """
+    Solves a problem and sends the result through a pipe (runs inside the job process)
+    """
+    if hasattr(os, "setsid"):
+        os.setsid() # Own process group, so cancelling the job also stops the solver it started
+
+    try:
+        if mode == SolveMode.COMBINATORIAL:
+            result = solve_combinatorial(task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                         time_limit=time_limit)
+        else:
+            model = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked)
+            with terminal_output(log_path) as logged:
+                # The solver prints to the terminal when the output is logged through it
+                result = model.solve(mode=mode, time_limit=time_limit, gap=gap, log_path=None if logged else log_path)
+        connection.send((JobStatus.DONE, result))
+    except Exception as e:
+        connection.send((JobStatus.FAILED, repr(e)))
+    finally:
+        connection.close()
+
+
+def parse_solver_log(log_path):
+    """
+    Reads the progress of a CBC solve from its log
+    :param log_path: The path of the log file
+    :return: A dictionary with the best objective, the best bound and the relative gap found so far (None if unknown)
+    """
+    best_objective = best_bound = None
+    try:
+        with open(log_path) as f:
+            for line in f:
+                if match := NODE_PROGRESS_PATTERN.search(line):
+                    best_objective, best_bound = abs(float(match.group(1))), abs(float(match.group(2)))
+                elif match := INTEGER_SOLUTION_PATTERN.search(line):
+                    best_objective = abs(float(match.group(1)))
+                elif match := CONTINUOUS_OBJECTIVE_PATTERN.search(line):
+                    best_bound = abs(float(match.group(1)))
+    except FileNotFoundError:
+        pass
+
+    gap = None
+    if best_objective is not None and best_bound:
+        gap = abs(best_bound - best_objective) / best_bound
+
+    return {"best_objective": best_objective, "best_bound": best_bound, "gap": gap}
+
+
+class SolverJob:
+    """
+    Class to represent a solve submitted to the job queue
+    """
+
+    def __init__(self, job_id, log_path, arguments):
+        self.job_id = job_id
+        self.log_path = log_path
+        self.arguments = arguments
+        self.status = JobStatus.PENDING
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.process = None
+        self.future = None
+        self.cancel_requested = False
+
+
+class SolverJobQueue:
+    """
+    Class to run solves in background processes from a worker pool shared by every session. Jobs can be polled for
+    their status and solver progress, and cancelled (which also stops the solver process)
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, log_directory=None, max_finished_jobs=DEFAULT_MAX_FINISHED_JOBS,
+                 finished_job_max_age=FINISHED_JOB_MAX_AGE):
+        self.log_directory = log_directory or tempfile.mkdtemp(prefix="solver_jobs_")
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solver_job")
+        # Jobs are started from the executor threads of a multithreaded server, where forking can copy locks held by
+        # other threads and deadlock the child. The fork server is a clean single-threaded process that only preloads
+        # this module, not the Streamlit entry point
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload([__name__])
+        else:
+            self.context = multiprocessing.get_context("spawn")
+        self.max_finished_jobs = max_finished_jobs
+        self.finished_job_max_age = finished_job_max_age
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+               mode=SolveMode.EXACT, time_limit=None, gap=None):
+        """
+        Submits a solve
+        :param task_names: The names of the tasks
+        :param processing_times: The (tasks x employees) unit processing time matrix
+        :param capacities: The capacity of each task
+        :param min_hours_worked: The minimum hours worked by an employee
+        :param max_hours_worked: The maximum hours worked by an employee
+        :param mode: The solve mode (see SolveMode)
+        :param time_limit: The time limit in seconds of the integer solve
+        :param gap: The relative gap at which the integer solve stops
+        :return: The job id
+        """
+        job_id = uuid.uuid4().hex
+        log_path = os.path.join(self.log_directory, f"{job_id}.log")
+        job = SolverJob(job_id, log_path, (list(task_names), processing_times, list(capacities), min_hours_worked,
+                                           max_hours_worked, mode, time_limit, gap, log_path))
+
+        self.remove_finished_jobs()
+        with self.lock:
+            self.jobs[job_id] = job
+        job.future = self.executor.submit(self._run, job)
+
+        return job_id
+
+    def _run(self, job):
+        if job.cancel_requested:
+            return
+
+        receiver, sender = self.context.Pipe(duplex=False)
+        job.process = self.context.Process(target=solve_problem, args=(sender, *job.arguments), daemon=True)
+        job.started_at = time.time()
+        job.status = JobStatus.RUNNING
+        job.process.start()
+        sender.close()
+
+        try:
+            while not job.cancel_requested:
+                if receiver.poll(POLL_INTERVAL):
+                    job.status, payload = receiver.recv()
+                    if job.status == JobStatus.DONE:
+                        job.result = payload
+                    else:
+                        job.error = payload
+                    break
+
+                if not job.process.is_alive() and not receiver.poll():
+                    job.status = JobStatus.FAILED
+                    job.error = f"Solver process exited with code {job.process.exitcode}"
+                    break
+        except EOFError:
+            job.status = JobStatus.FAILED
+            job.error = "Solver process exited without a result"
+        finally:
+            receiver.close()
+            if job.cancel_requested:
+                self._stop_process(job)
+                job.status = JobStatus.CANCELLED
+            job.process.join()
+            job.finished_at = time.time()
+
+    def _stop_process(self, job):
+        if job.process is None or not job.process.is_alive():
+            return
+
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(job.process.pid, signal.SIGTERM)  # The job process and the solver it started
+            else:
+                job.process.terminate()
+        except (ProcessLookupError, PermissionError):
+            job.process.terminate()
+
+    def _get_job(self, job_id):
+        with self.lock:
+            if job_id not in self.jobs:
+                raise KeyError(f"Unknown job: {job_id}")
+            return self.jobs[job_id]
+
+    def get_status(self, job_id):
+        """
+        Returns the status of a job
+        :param job_id: The job id
+        :return: The job status (see JobStatus)
+        """
+        return self._get_job(job_id).status
+
+    def get_progress(self, job_id):
+        """
+        Returns the progress of a job
+        :param job_id: The job id
+        :return: A dictionary with the status, elapsed seconds and the solver's best objective, best bound and gap
+        """
+        job = self._get_job(job_id)
+        end = job.finished_at or time.time()
+        elapsed = end - job.started_at if job.started_at is not None else 0.0
+
+        return {"status": job.status, "elapsed": elapsed, **parse_solver_log(job.log_path)}
+
+    def cancel(self, job_id):
+        """
+        Cancels a job that has not finished yet
+        :param job_id: The job id
+        :return: True if the job was pending or running
+        """
+        job = self._get_job(job_id)
+        if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+            return False
+
+        job.cancel_requested = True
+        if job.future.cancel():    # It had not started yet
+            job.status = JobStatus.CANCELLED
+            job.finished_at = time.time()
+
+        return True
+
+    def get_result(self, job_id):
+        """
+        Returns the result of a finished job
+        :param job_id: The job id
+        :return: The linear programming result, None if the job has not finished successfully
+        """
+        return self._get_job(job_id).result
+
+    def get_error(self, job_id):
+        """
+        Returns the error of a failed job
+        :param job_id: The job id
+        :return: The error message, None if the job has not failed
+        """
+        return self._get_job(job_id).error
+
+    def remove_finished_jobs(self):
+        """
+        Forgets the finished jobs that were not collected in time, and the oldest ones past the limit of finished jobs
+        """
+        now = time.time()
+        with self.lock:
+            finished = sorted((job.finished_at, job_id) for job_id, job in self.jobs.items()
+                              if job.finished_at is not None)
+        number_over_limit = max(len(finished) - self.max_finished_jobs, 0)
+
+        for i, (finished_at, job_id) in enumerate(finished):
+            if i < number_over_limit or now - finished_at > self.finished_job_max_age:
+                self.forget(job_id)
+
+    def forget(self, job_id):
+        """
+        Removes a finished job and its log
+        :param job_id: The job id
+        """
+        with self.lock:
+            job = self.jobs.pop(job_id, None)
+
+        if job is not None:
+            try:
+                os.remove(job.log_path)
+            except FileNotFoundError:
+                pass
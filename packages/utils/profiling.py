@@ -0,0 +1,152 @@
+import os
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+# Stages of the optimization pipeline
+BUILD_DATAFRAME = "build_dataframe"
+MODEL_CONSTRUCTION = "model_construction"
+MODEL_IMPORT = "model_import"
+MODEL_UPDATE = "model_update"
+CBC_SOLVE = "cbc_solve"
+ROUNDING = "rounding"
+CBC_POLISH = "cbc_polish"
+COMBINATORIAL_SOLVE = "combinatorial_solve"
+RESULT_EXTRACTION = "result_extraction"
+CONSTRAINT_TABLES = "constraint_tables"
+
+memory_tracing_lock = threading.RLock()    # tracemalloc is global to the process (nested stages take it again)
+
+
+def get_cpu_time():
+    """
+    Returns the CPU time of the process, including the waited child processes (the CBC solver runs in its own process)
+    :return: The user and system CPU time in seconds
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class PipelineProfile:
+    """
+    Class to record the wall time, CPU time and peak memory of each stage of the optimization pipeline.
+    Timing a stage again adds to its times, so a stage that runs more than once (e.g. the result extraction of a
+    relaxation and of a polish solve) is reported as a whole.
+    The peak memory is the peak of the Python allocations traced by tracemalloc during the stage, above the memory
+    allocated when it started. Tracing slows down allocation heavy stages (the model construction runs about 3 times
+    slower), so it is only done when asked for.
+    Both measures are process-wide: the CPU time and the traced allocations include the other threads of the process
+    (e.g. other Streamlit sessions running at the same time), so they are only reliable when nothing else runs. Traced
+    stages of different threads are run one at a time, so at least they do not restart each other's tracing.
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.stages = {}    # Stage name -> {"wall_time", "cpu_time", "peak_memory", "calls"}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the code run inside the context as a stage
+        :param name: The name of the stage
+        """
+        started_tracing = False
+        start_memory = 0
+        if self.track_memory:
+            memory_tracing_lock.acquire()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+
+        start_wall = time.perf_counter()
+        start_cpu = get_cpu_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall
+            cpu_time = get_cpu_time() - start_cpu
+            peak_memory = None
+            if self.track_memory:
+                peak_memory = max(tracemalloc.get_traced_memory()[1] - start_memory, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+                memory_tracing_lock.release()
+
+            self.record(name, wall_time, cpu_time, peak_memory)
+
+    def record(self, name, wall_time, cpu_time=None, peak_memory=None, calls=1):
+        """
+        Records the times of a stage measured elsewhere
+        :param name: The name of the stage
+        :param wall_time: The wall time in seconds
+        :param cpu_time: The CPU time in seconds
+        :param peak_memory: The peak memory in bytes
+        :param calls: The number of times the stage ran
+        """
+        stage = self.stages.setdefault(name, {"wall_time": 0.0, "cpu_time": None, "peak_memory": None, "calls": 0})
+        stage["wall_time"] += wall_time
+        stage["calls"] += calls
+
+        if cpu_time is not None:
+            stage["cpu_time"] = (stage["cpu_time"] or 0.0) + cpu_time
+
+        if peak_memory is not None:
+            stage["peak_memory"] = max(stage["peak_memory"] or 0, peak_memory)
+
+    def update(self, other):
+        """
+        Adds the stages of another profile to this one
+        :param other: The other profile
+        """
+        for name, stage in other.stages.items():
+            self.record(name, stage["wall_time"], stage["cpu_time"], stage["peak_memory"], stage["calls"])
+
+    def get_wall_time(self, name):
+        """
+        Returns the wall time of a stage
+        :param name: The name of the stage
+        :return: The wall time in seconds (0 if the stage was not timed)
+        """
+        return self.stages[name]["wall_time"] if name in self.stages else 0.0
+
+    def to_dataframe(self):
+        """
+        Returns the stages as a dataframe
+        :return: The dataframe indexed by stage, with the share of the total wall time of each stage
+        """
+        df = pd.DataFrame.from_dict(self.stages, orient="index",
+                                    columns=["wall_time", "cpu_time", "peak_memory", "calls"])
+        df.index.name = "stage"
+
+        total_wall_time = df["wall_time"].sum()
+        df["wall_share"] = df["wall_time"] / total_wall_time if total_wall_time > 0 else 0.0
+
+        return df
+
+    def to_json(self, **metadata):
+        """
+        Returns the stages as JSON
+        :param metadata: Other information to export with the stages (e.g. the problem size)
+        :return: The JSON string
+        """
+        stages = [{"stage": name, **stage} for name, stage in self.stages.items()]
+        return json.dumps({**metadata, "stages": stages}, indent=4)
+
+
+def merge_profiles(*profiles):
+    """
+    Merges profiles into a new one, in order
+    :param profiles: The profiles (None is skipped)
+    :return: The merged profile
+    """
+    merged = PipelineProfile(track_memory=False)
+    for profile in profiles:
+        if profile is not None:
+            merged.update(profile)
+
+    return merged
@@ -1,5 +1,31 @@
 import streamlit as st
 import json
+import os
+import re
+import uuid
+from packages.dataset_generator.dataset_store import DatasetStore, get_workspace_store_directory, remove_stale_stores
+from packages.linear_programming.solution_cache import SolutionCache
+from packages.linear_programming.solver_jobs import SolverJobQueue
+from packages.gamification.history import SnapshotHistory, DEFAULT_HISTORY_DIRECTORY
+
+
+WORKSPACE_PARAMETER = "workspace"     # Query parameter of the URL with the workspace of the session
+WORKSPACE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def get_workspace_id():
+    """
+    Returns the workspace of the session from the URL, or a new workspace if the URL has none. The workspace is kept
+    in the URL, so reloading the page, restarting the server or bookmarking the URL opens the same datasets, while
+    other browser sessions get their own workspace and cannot delete them. Sessions opened with the same URL share
+    the workspace
+    :return: The identifier of the workspace
+    """
+    workspace_id = st.experimental_get_query_params().get(WORKSPACE_PARAMETER, [""])[0]
+    if not WORKSPACE_ID_PATTERN.fullmatch(workspace_id):     # It is used as a directory name
+        workspace_id = uuid.uuid4().hex
+
+    return workspace_id
 
 
 def load_session_state():
@@ -8,24 +34,70 @@ def load_session_state():
     """
     if len(st.session_state) == 0:
         # Dataset Generator
-        st.session_state.datasets = {}  # Datasets dictionary
-        st.session_state.selected_dataset = None    # Selected dataset
+        st.session_state.workspace_id = get_workspace_id()   # Namespace of the files of this session
+        remove_stale_stores()
+        remove_stale_stores(DEFAULT_HISTORY_DIRECTORY)  # The leaderboard histories are kept per workspace too
+        history_directory = os.path.join(DEFAULT_HISTORY_DIRECTORY, st.session_state.workspace_id)
+        os.makedirs(history_directory, exist_ok=True)
+        os.utime(history_directory)     # Mark the history as used (see remove_stale_stores)
+        st.session_state.datasets = DatasetStore(get_workspace_store_directory(st.session_state.workspace_id))  # Datasets dictionary (memory-mapped, private to the workspace)
+        st.session_state.selected_dataset = next(iter(st.session_state.datasets), None)    # Selected dataset
         st.session_state.disabled = False   # Disabled state of the number input
-        st.session_state.number_of_employees = 0 # Number of employees
+        st.session_state.number_of_employees = st.session_state.datasets.get_number_of_employees() # Number of employees
         # Linear Programming
-        st.session_state.lp_dataframe = None    # Dataframe with the unit processing times
+        st.session_state.lp_input = None    # Unit processing times, capacities and difficulties of the tasks (see LinearProgrammingInput)
         st.session_state.lp_model_info = None    # Linear Programming model
+        st.session_state.lp_model_handle = None  # Built Linear Programming model kept between solves
+        st.session_state.lp_export = None   # Files of the exported model (name, bytes)
+        st.session_state.lp_job_id = None   # Background solve of this session
+        st.session_state.lp_job_cache_key = None    # Solution cache key of the background solve
+        st.session_state.lp_build_profile = None    # Stage timings of the dataframe construction
+        st.session_state.lp_render_profile = None   # Stage timings of the last render of the constraint tables
         st.session_state.lp_changed = True # Used to check if the LP model is no longer valid for current datasets
+        st.session_state.lp_changed_tasks = set()   # Tasks added, regenerated or deleted since the LP input was built
         st.session_state.total_pieces = 0 # Total number of pieces
         st.session_state.total_time = 0 # Total time
         # Gamification
         st.session_state.leaderboards= None # Leaderboards dictionary
+        st.session_state.team_leaderboards = None # Productivity leaderboard and top-K of each team (see build_team_leaderboards)
+        st.session_state.live_leaderboards = None # Live leaderboard of each leaderboard, updated as points are awarded
         st.session_state.points_per_star = 0 # Points per star selected
         st.session_state.min_qualitative_value = 0 # Minimum qualitative value selected displayed
         st.session_state.max_qualitative_value = 0 # Maximum qualitative value selected displayed
         st.session_state.productivity_weight = 0 # Productivity weight selected displayed
         st.session_state.qualitative_weight = 0 # Qualitative weight selected displayed
 
+    # Keep the workspace in the URL, also after switching pages
+    if st.experimental_get_query_params().get(WORKSPACE_PARAMETER) != [st.session_state.workspace_id]:
+        st.experimental_set_query_params(**{WORKSPACE_PARAMETER: st.session_state.workspace_id})
+
+
+@st.cache_resource
+def get_solution_cache():
+    """
+    Returns the linear programming solution cache shared by every session
+    """
+    return SolutionCache()
+
+
+@st.cache_resource
+def get_solver_job_queue():
+    """
+    Returns the background solver job queue shared by every session
+    """
+    return SolverJobQueue()
+
+
+@st.cache_resource
+def get_leaderboard_history(workspace_id, leaderboard):
+    """
+    Returns the snapshot history of a leaderboard of a workspace, shared by the sessions of the workspace. Other
+    workspaces number their players the same way, so their snapshots are never mixed
+    :param workspace_id: The identifier of the workspace
+    :param leaderboard: The name of the leaderboard
+    """
+    return SnapshotHistory(os.path.join(DEFAULT_HISTORY_DIRECTORY, workspace_id, leaderboard))
+
 
 @st.cache_data
 def load_lottiefile(filepath: str):
@@ -1,6 +1,9 @@
 import streamlit as st
 import re
 from packages.dataset_generator.datagen import generate_dataset
+from packages.dataset_generator.parallel import generate_datasets_parallel
+from packages.dataset_generator.memory import get_dataset_memory_usage, get_memory_report
+from packages.dataset_generator.dataset_store import is_valid_dataset_name
 from packages.utils.utils import load_session_state, hide_streamlit_style
 
 DATASET = 0
@@ -32,6 +35,7 @@ def run_app():
             with left_column:
                 st.subheader("Dataset Information")
                 st.markdown(f"**Number of Employees:** {st.session_state.number_of_employees}")
+                st.markdown(f"**Memory Usage:** {get_dataset_memory_usage(st.session_state.datasets[st.session_state.selected_dataset][DATASET]) / 1024:.1f} KiB")
 
             with right_column:
                 st.subheader("Dataset Settings")
@@ -42,6 +46,9 @@ def run_app():
 
             st.dataframe(st.session_state.datasets[st.session_state.selected_dataset][DATASET], use_container_width=True)   # Display the selected dataset
 
+            with st.expander("Memory report"):
+                st.dataframe(get_memory_report(st.session_state.datasets), use_container_width=True)
+
         else:
             # No datasets available
             st.info("No datasets available. Please generate a dataset.")
@@ -63,10 +70,12 @@ def run_app():
         with right_column:
             capacity = st.number_input("Capacity (hrs)", min_value=1, value=600)
 
-        dataset_name = st.text_input("Dataset name", "printing")  # User-defined dataset name
+        dataset_name = st.text_input("Dataset name", "printing", help="Separate several names with commas to generate them in parallel")  # User-defined dataset name
 
         difficulty = st.slider("Difficulty", min_value=1, max_value=10, value=5, step=1)
 
+        compact = st.checkbox("Compact dtypes", help="Store the dataset with narrow integer and float32 columns to reduce memory usage")
+
         generate_button = st.button("Generate dataset", use_container_width=True)
 
         left_column, right_column = st.columns(2)
@@ -79,15 +88,23 @@ def run_app():
 
 
         if generate_button:  # Handle the click event of the "Generate Dataset" button
-            if re.search(PATTERN, dataset_name):    # Check if the dataset name contains spaces or numbers
-                st.error("Dataset name cannot contain spaces or numbers.")
+            dataset_names = [name.strip() for name in dataset_name.split(",")]
+
+            if any(re.search(PATTERN, name) or not is_valid_dataset_name(name) for name in dataset_names):    # Check if the dataset names contain spaces or numbers, or cannot be stored
+                st.error("Dataset name cannot contain spaces, numbers or slashes, or start with a dot.")
                 
             else:
-                dataset = generate_dataset(number_of_employees)
+                if len(dataset_names) == 1:
+                    datasets = {dataset_names[0]: generate_dataset(number_of_employees, compact=compact)}
+                else:   # Generate the datasets of every task in parallel
+                    datasets = generate_datasets_parallel(dataset_names, number_of_employees, compact=compact)
+
                 st.session_state.number_of_employees = number_of_employees
-                st.session_state.datasets[dataset_name] = (dataset, capacity, difficulty)
-                st.session_state.selected_dataset = dataset_name  # Update the selected dataset
+                for name, dataset in datasets.items():
+                    st.session_state.datasets[name] = (dataset, capacity, difficulty)
+                st.session_state.selected_dataset = dataset_names[-1]  # Update the selected dataset
                 st.session_state.lp_changed = True
+                st.session_state.lp_changed_tasks.update(dataset_names)
                 st.experimental_rerun()  # Rerun the app to update the dataset selectbox
 
 
@@ -96,12 +113,12 @@ def run_app():
                 st.warning("No datasets to delete.")
             else:
                 del st.session_state.datasets[st.session_state.selected_dataset]
+                st.session_state.lp_changed = True
+                st.session_state.lp_changed_tasks.add(st.session_state.selected_dataset)
 
                 if st.session_state.datasets:   # Check if there are still datasets left
                     # Update the selected dataset to the first dataset in the dictionary
                     st.session_state.selected_dataset = list(st.session_state.datasets.keys())[0]
-                    
-                    st.sessions_state.lp_changed = True
 
                 else:
                     st.session_state.selected_dataset = None
@@ -112,6 +129,8 @@ def run_app():
             if not st.session_state.datasets:   # Check if there are datasets to delete
                 st.warning("No datasets to delete.")
             else:  
+                st.session_state.lp_changed = True
+                st.session_state.lp_changed_tasks.update(st.session_state.datasets)
                 st.session_state.datasets.clear()  # Clear the datasets dictionary
                 st.session_state.selected_dataset = None  # Reset the selected dataset
                 st.experimental_rerun()  # Rerun the app to update the dataset selectbox
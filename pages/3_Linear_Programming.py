@@ -1,90 +1,131 @@
 import streamlit as st
+import datetime
+import os
+import tempfile
 import pandas as pd
 import plotly.express as px
 import numpy as np
-from packages.linear_programming.lp_solver import solve_linear_programming, Status
-from packages.utils.utils import load_session_state, hide_streamlit_style
-
-# Constraint types
-EQUALITY = "equality"
-UNIT_PROCESSING_TIME = "unit_processing_time"
-MIN_EMPLOYEE_CAPACITY = "min_employee_capacity"
-MAX_EMPLOYEE_CAPACITY = "max_employee_capacity"
-
-# Linear Programming model information
-STATUS = 0
-OBJECTIVE = 1
-VARIABLES = 2
-CONSTRAINTS = 3
-SOLUTION_TIME = 4
+from packages.linear_programming.lp_solver import (LinearProgrammingModel, Status, SolveMode, EQUALITY, UNIT_PROCESSING_TIME,
+                                                   MIN_EMPLOYEE_CAPACITY, MAX_EMPLOYEE_CAPACITY)
+from packages.linear_programming.combinatorial_solver import solve_combinatorial, cross_check, FALLBACK_TIME_LIMIT
+from packages.linear_programming.scenario_sweep import sweep_scenarios, get_throughput_frontier
+from packages.linear_programming.solution_cache import get_cache_key
+from packages.linear_programming.solver_jobs import JobStatus
+from packages.linear_programming.model_io import export_model, read_result
+from packages.linear_programming.lp_input import LinearProgrammingInput
+from packages.linear_programming.constraint_inspector import ConstraintInspector, DEFAULT_PAGE_SIZE, get_number_of_pages
+from packages.linear_programming.rolling_horizon import (DEFAULT_NUMBER_OF_MONTHS, DEFAULT_WINDOW, DEFAULT_STEP,
+                                                         iter_rolling_horizon, get_period_summary)
+from packages.utils.utils import load_session_state, hide_streamlit_style, get_solution_cache, get_solver_job_queue
+from packages.utils.profiling import PipelineProfile, merge_profiles, BUILD_DATAFRAME, MODEL_UPDATE, CONSTRAINT_TABLES
+
+# Solve modes displayed in the sidebar
+SOLVE_MODES = {"Exact (integer)": SolveMode.EXACT, "LP relaxation": SolveMode.RELAXATION,
+               "Relaxation + rounding": SolveMode.ROUNDING, "Rounding + time-limited polish": SolveMode.POLISH,
+               "Combinatorial heuristic (no MIP)": SolveMode.COMBINATORIAL}
+SOLVE_MODE_HELP = ("The faster modes report the LP relaxation bound to show how far from optimal their answer is. The "
+                   "combinatorial heuristic can be well below the optimum, and when it finds nothing it falls back to an "
+                   f"exact solve with the time limit ({FALLBACK_TIME_LIMIT} seconds if none is set)")
+
+# Constraint groups displayed in the constraint inspector
+CONSTRAINT_GROUPS = {"Equality Constraints": EQUALITY, "Unit Processing Time Constraints": UNIT_PROCESSING_TIME,
+                     "Employee Work Time Constraints (Minimum)": MIN_EMPLOYEE_CAPACITY,
+                     "Employee Work Time Constraints (Maximum)": MAX_EMPLOYEE_CAPACITY}
+
+ROLLING_HORIZON_GAP = 0.01  # Relative gap at which each window of the rolling horizon stops
 
 
 def build_dataframe():
     """
-    Build the dataframe with the unit processing times
+    Build the linear programming input with the unit processing times (a tasks x employees matrix) and the capacity
+    and difficulty of each task
     """
-    number_of_employees = st.session_state.number_of_employees
-
-    df = pd.DataFrame(columns=["Employee " + str(i) for i in range(number_of_employees)] + ["Capacity"] + ["Difficulty"])
-    df.index.name = "Task"
+    profile = PipelineProfile(is_tracking_memory())
+    with profile.stage(BUILD_DATAFRAME):
+        lp_input = LinearProgrammingInput.from_dataset_store(st.session_state.datasets)
 
-    # Create complete dataframe with unit processing times
-    # Load from datasets
-    for task_name, (dataset, capacity, difficulty) in st.session_state.datasets.items():
-        unit_processing_times = dataset['unit_processing_time'].values
-        df.loc[task_name] = np.append(unit_processing_times, [capacity, difficulty])
-
-    st.session_state.lp_dataframe = df
+    st.session_state.lp_input = lp_input
+    st.session_state.lp_build_profile = profile
     st.session_state.lp_model_info = None
+    st.session_state.lp_model_handle = None # The model must be rebuilt for the new dataframe
+    st.session_state.lp_export = None
+    st.session_state.lp_changed_tasks = set()
 
 
-def get_model_info(lp_model):
+def update_dataframe():
     """
-    Get the information of the linear programming model
-    :param lp_model: The linear programming model
-    :return: The status, objective function, variables, constraints and solution time
+    Update the linear programming input, and the model built for it, with only the datasets added, regenerated or
+    deleted since it was built
     """
-
-    # Get the variables and their values
-    variables = {task_name : [] for task_name in st.session_state.lp_dataframe.index} # Create a dictionary of lists to store the variables
-    for variable in lp_model.variables():
-        # Remove numbers and "X" from the variable name to obtain the task name
-        task_name = variable.name[1:].translate(str.maketrans('', '', '0123456789'))
-
-        variables[task_name].append(variable.value()) # Remove the "X" and the number from the variable name to obtain the task name
+    lp_input = st.session_state.lp_input
+    lp_model = st.session_state.lp_model_handle
+    datasets = st.session_state.datasets
+    changed_tasks = sorted(st.session_state.lp_changed_tasks)
+
+    profile = PipelineProfile(is_tracking_memory())
+    with profile.stage(BUILD_DATAFRAME):
+        for task_name in changed_tasks:
+            if task_name in lp_input.task_names:
+                lp_input.remove_task(task_name)
+
+            if task_name in datasets:
+                capacity, difficulty = datasets.get_settings(task_name)
+                lp_input.add_task(task_name, datasets.get_column(task_name, 'unit_processing_time'), capacity, difficulty)
+
+    if lp_model is not None:
+        with profile.stage(MODEL_UPDATE):
+            for task_name in changed_tasks:
+                if task_name in lp_model.task_names:
+                    lp_model.remove_task(task_name)
+
+                if task_name in lp_input.task_names:
+                    task_index = lp_input.task_names.index(task_name)
+                    lp_model.add_task(task_name, lp_input.processing_times[task_index], lp_input.capacities[task_index])
+
+    st.session_state.lp_build_profile = profile
+    st.session_state.lp_model_info = None
+    st.session_state.lp_export = None
+    st.session_state.lp_changed_tasks = set()
 
 
-    constraints = list(lp_model.constraints.values())
+def is_tracking_memory():
+    """
+    Returns whether the peak memory of the pipeline stages is traced (set in the sidebar)
+    """
+    return st.session_state.get("lp_track_memory", False)
 
-    number_of_tasks = len(st.session_state.lp_dataframe)
 
-    # Related to the number of tasks executed being equal between machines (only if there is more than 1 task)
-    equality_constraints = constraints[0:number_of_tasks-1]
+def get_model_handle(min_hours_worked, max_hours_worked, capacities, track_memory):
+    """
+    Returns the model built for the current dataframe, updated with the hour bounds and capacities
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param capacities: The capacity of each task
+    :param track_memory: Whether the peak memory of each stage is traced
+    :return: The linear programming model
+    """
+    # Reuse the model built for the current dataframe, only the hour bounds and capacities are updated
+    if st.session_state.lp_model_handle is None:
+        st.session_state.lp_model_handle = LinearProgrammingModel.from_input(st.session_state.lp_input, min_hours_worked,
+                                                                                 max_hours_worked, track_memory)
 
-    # Related to the unit processing times from the dataframe
-    unit_processing_time_constraints = constraints[number_of_tasks-1:number_of_tasks-1 + number_of_tasks]
+    st.session_state.lp_model_handle.set_hour_bounds(min_hours_worked, max_hours_worked)
+    st.session_state.lp_model_handle.set_capacities(capacities)
+    st.session_state.lp_model_handle.track_memory = track_memory
 
-    # Related to the employees' capacities (minimum hours required)
-    min_employee_capacity_constraints = constraints[number_of_tasks-1 + number_of_tasks::2]
+    return st.session_state.lp_model_handle
 
-    # Related to the employees' capacities (maximum hours allowed)
-    max_employee_capacity_constraints = constraints[number_of_tasks-1 + number_of_tasks + 1::2]
 
-    # Create a dictionary of lists of constraints
-    constraints = {EQUALITY : equality_constraints, UNIT_PROCESSING_TIME : unit_processing_time_constraints, MIN_EMPLOYEE_CAPACITY : min_employee_capacity_constraints, MAX_EMPLOYEE_CAPACITY : max_employee_capacity_constraints}
+def store_model_info(result):
+    """
+    Store the linear programming result and its totals in the session
+    :param result: The linear programming result
+    """
+    st.session_state.lp_model_info = result
 
     # Store the total pieces produced and the total hours worked
-    # The total number of pieces produced is the value of the objective function divided by the number of tasks
-    st.session_state.total_pieces = int(lp_model.objective.value()/number_of_tasks)
-    
-    hours_worked = 0
-    for constraint in min_employee_capacity_constraints: # Same as using max_employee_capacity_constraints
-        hours_worked += constraint.value() - constraint.constant
-
-    st.session_state.total_time = int(hours_worked)
-
-    return lp_model.status, lp_model.objective, variables, constraints, lp_model.solutionTime
-
+    st.session_state.total_pieces = result.total_pieces
+    st.session_state.total_time = int(result.total_hours)
 
 
 def display_model():
@@ -104,13 +145,19 @@ def display_model():
             st.subheader("Total Hours Worked")   
             st.subheader(f"{st.session_state.total_time} hours")
 
+        result = st.session_state.lp_model_info
+        if result.relaxation_bound is not None:
+            gap = f", gap {result.gap:.2%}" if result.gap is not None else ""   # No gap when the bound is 0
+            st.caption(f"Relaxation bound: {result.relaxation_bound:.2f} (objective {result.objective_value:.0f}{gap})")
+
 
     st.markdown("---")
 
     # Display the objective function
     with st.container():
         st.subheader("Objective Function")
-        st.write(str(st.session_state.lp_model_info[OBJECTIVE]))
+        result = st.session_state.lp_model_info
+        st.write(str(result.model.objective) if result.model is not None else f"Maximize the sum of {result.allocations.size} variables")
 
     st.markdown("##")
     
@@ -118,7 +165,7 @@ def display_model():
     with st.container():
         st.subheader("Variables")
 
-        variables = st.session_state.lp_model_info[VARIABLES]
+        variables = dict(zip(result.task_names, result.allocations))
         
         options = ["All Tasks"] + list(variables.keys())
         option = st.selectbox("Select an option", options)
@@ -167,58 +214,271 @@ def display_model():
             
     st.markdown("##")
 
-    # Display the constraints
-    with st.container():
+    # Display the constraints (timed on every render)
+    render_profile = PipelineProfile(is_tracking_memory())
+    with st.container(), render_profile.stage(CONSTRAINT_TABLES):
         st.subheader("Constraints")
-        
-        equality_constraints_table = unit_processing_time_constraints_table = min_employees_capacity_constraints_table = max_employees_capacity_constraints_table = pd.DataFrame(columns=["Constraint", "Value"])
-        equality_constraints = st.session_state.lp_model_info[CONSTRAINTS][EQUALITY]
-        if equality_constraints != []:  # If there are no equality constraints, don't display the table
-            st.write("Equality Constraints")
-            for constraint in equality_constraints:
-                equality_constraints_table = pd.concat([equality_constraints_table, pd.DataFrame([[str(constraint), constraint.value()-constraint.constant]], columns=["Constraint", "Value"])])   
-            st.table(equality_constraints_table)
-        
-        unit_processing_time_constraints = st.session_state.lp_model_info[CONSTRAINTS][UNIT_PROCESSING_TIME]
-        st.write("Unit Processing Time Constraints")
-        for constraint in unit_processing_time_constraints:
-            unit_processing_time_constraints_table = pd.concat([unit_processing_time_constraints_table, pd.DataFrame([[str(constraint), constraint.value()-constraint.constant]], columns=["Constraint", "Value"])])
-        st.table(unit_processing_time_constraints_table)
 
-        min_employee_capacity_constraints = st.session_state.lp_model_info[CONSTRAINTS][MIN_EMPLOYEE_CAPACITY]
-        st.write("Employee Work Time Constraints (Minimum)")
-        for constraint in min_employee_capacity_constraints:
-            min_employees_capacity_constraints_table = pd.concat([min_employees_capacity_constraints_table, pd.DataFrame([[str(constraint), constraint.value()-constraint.constant]], columns=["Constraint", "Value"])])   
-        st.table(min_employees_capacity_constraints_table)
+        # If there are no equality constraints, don't display their group
+        constraint_groups = [label for label, group in CONSTRAINT_GROUPS.items() if len(result.constraints[group].names) > 0]
+
+        group_column, filter_column, slack_column, page_column = st.columns(4)
+
+        with group_column:
+            inspector = ConstraintInspector(result, CONSTRAINT_GROUPS[st.selectbox("Constraint group", constraint_groups)])
+            show_expressions = st.checkbox("Show expressions", disabled=result.model is None, help="Format the full expression of the constraints of the page")
+
+        with filter_column:
+            binding_only = st.checkbox("Binding only")
+            sort_by_slack = st.checkbox("Sort by slack")
+
+        with slack_column:
+            filter_by_slack = st.checkbox("Slack below")
+            max_slack = st.number_input("Maximum slack", value=1.0, disabled=not filter_by_slack, label_visibility="collapsed")
+
+        rows = inspector.get_rows(binding_only, max_slack if filter_by_slack else None, sort_by_slack)
+
+        with page_column:
+            page = st.number_input("Page", min_value=1, max_value=get_number_of_pages(len(rows)), value=1) - 1
+
+        st.caption(f"{len(rows)} of {len(inspector)} constraints shown, {int(inspector.binding.sum())} binding")
+        st.dataframe(inspector.get_page(rows, page, DEFAULT_PAGE_SIZE, show_expressions), use_container_width=True)
+
+    st.session_state.lp_render_profile = render_profile
+
+
+def display_profile():
+    """
+    Display the wall time, CPU time and peak memory of each stage of the last run of the pipeline
+    """
+    result = st.session_state.lp_model_info
+    # Results cached on disk before the stages were timed have no profile
+    profile = merge_profiles(st.session_state.lp_build_profile, result.profile, st.session_state.lp_render_profile)
+    if len(profile.stages) == 0:
+        return
+
+    with st.expander("Stage timings"):
+        profile_df = profile.to_dataframe()
+        profile_df["peak_memory"] = profile_df["peak_memory"] / 2**20   # Displayed in MiB
+        st.dataframe(profile_df.rename(columns={"wall_time": "Wall (s)", "cpu_time": "CPU (s)", "peak_memory": "Peak (MiB)",
+                                                "calls": "Calls", "wall_share": "Share"}), use_container_width=True)
+        st.caption("The CPU time includes the CBC process, the peak memory only the Python allocations. Both include "
+                   "the other sessions solving at the same time")
+
+        number_of_tasks, number_of_employees = result.allocations.shape
+        st.download_button("Export as JSON", profile.to_json(number_of_tasks=number_of_tasks, number_of_employees=number_of_employees,
+                                                             mode=result.mode, status=result.status),
+                           file_name="lp_stage_timings.json", mime="application/json")
+
+
+def display_solver_job():
+    """
+    Display the progress of the background solve of the session, storing its result when it is done
+    """
+    job_queue = get_solver_job_queue()
+    job_id = st.session_state.lp_job_id
+    try:
+        progress = job_queue.get_progress(job_id)
+    except KeyError:    # Finished too long ago and removed from the queue
+        st.warning("Background solve expired, solve again to see its result")
+        st.session_state.lp_job_id = None
+        st.session_state.lp_job_cache_key = None
+        return
+
+    if progress["status"] in (JobStatus.PENDING, JobStatus.RUNNING):
+        st.info(f"Solving in the background ({progress['status']}, {progress['elapsed']:.1f} seconds elapsed)")
+
+        if progress["best_objective"] is not None:
+            gap = f", gap {progress['gap']:.2%}" if progress["gap"] is not None else ""
+            st.caption(f"Best objective so far: {progress['best_objective']:.0f}{gap}")
+
+        refresh_column, cancel_column, _ = st.columns((1, 1, 4))
+
+        with refresh_column:
+            if st.button("Refresh"):
+                st.experimental_rerun()
+
+        with cancel_column:
+            if st.button("Cancel solve"):
+                job_queue.cancel(job_id)
+                st.experimental_rerun()
+        return
+
+    if progress["status"] == JobStatus.DONE:
+        result = job_queue.get_result(job_id)
+        store_model_info(result)
+        get_solution_cache().put(st.session_state.lp_job_cache_key, result)
+    elif progress["status"] == JobStatus.FAILED:
+        st.error(f"Background solve failed: {job_queue.get_error(job_id)}")
+    else:
+        st.warning("Background solve cancelled")
+
+    job_queue.forget(job_id)
+    st.session_state.lp_job_id = None
+    st.session_state.lp_job_cache_key = None
+
+
+def display_scenario_sweep(solve_mode, time_limit):
+    """
+    Display the scenario sweep over grids of hour bounds and capacities
+    :param solve_mode: The solve mode of every scenario
+    :param time_limit: The time limit of each integer solve
+    """
+    with st.expander("Scenario sweep"):
+        min_column, max_column, capacity_column = st.columns(3)
+
+        with min_column:
+            min_hours_range = st.slider("Minimum hours", min_value=1, max_value=400, value=(80, 160), step=1)
+            min_hours_step = st.number_input("Minimum hours step", min_value=1, value=20)
+
+        with max_column:
+            max_hours_range = st.slider("Maximum hours", min_value=1, max_value=400, value=(200, 240), step=1)
+            max_hours_step = st.number_input("Maximum hours step", min_value=1, value=20)
+
+        with capacity_column:
+            capacity_range = st.slider("Capacity (all tasks)", min_value=1, max_value=10000, value=(400, 800), step=1)
+            capacity_step = st.number_input("Capacity step", min_value=1, value=100)
+
+        if st.button("Run sweep"):
+            lp_input = st.session_state.lp_input
+
+            sweep = sweep_scenarios(lp_input.task_names, lp_input.processing_times,
+                                    range(min_hours_range[0], min_hours_range[1] + 1, min_hours_step),
+                                    range(max_hours_range[0], max_hours_range[1] + 1, max_hours_step),
+                                    range(capacity_range[0], capacity_range[1] + 1, capacity_step),
+                                    mode=solve_mode, time_limit=time_limit)
+            frontier = get_throughput_frontier(sweep)
+
+            table_column, chart_column = st.columns(2)
+
+            with table_column:
+                st.dataframe(sweep, use_container_width=True)
+
+            with chart_column:
+                fig_frontier = px.line(frontier, x="hours_used", y="total_pieces", markers=True, template="plotly_white",
+                                       hover_data=["min_hours_worked", "max_hours_worked", "capacity"],
+                                       labels={"hours_used": "Hours Used", "total_pieces": "Pieces"})
+                st.plotly_chart(fig_frontier, use_container_width=True)
+
+
+def display_rolling_horizon():
+    """
+    Display the week by week plan of the next months, solved with a rolling horizon
+    """
+    with st.expander("Rolling horizon plan"):
+        today = datetime.date.today()
+        next_month = datetime.date(today.year + today.month // 12, today.month % 12 + 1, 1)
+
+        start_column, window_column, limits_column = st.columns(3)
+
+        with start_column:
+            start = st.date_input("First month", value=next_month)
+            number_of_months = st.number_input("Months", min_value=1, max_value=12, value=DEFAULT_NUMBER_OF_MONTHS)
+
+        with window_column:
+            window = st.number_input("Window (weeks)", min_value=1, max_value=8, value=DEFAULT_WINDOW, help="Weeks solved together")
+            step = st.number_input("Step (weeks)", min_value=1, max_value=int(window), value=DEFAULT_STEP, help="Weeks committed from each window")
+
+        with limits_column:
+            min_utilization = st.slider("Minimum utilization", min_value=0.0, max_value=1.0, value=0.0, step=0.05, help="Fraction of their available hours the employees must work")
+            time_limit = st.number_input("Time limit per window (s)", min_value=1, value=10)
+
+        if st.button("Plan horizon"):
+            lp_input = st.session_state.lp_input
+            progress_bar = st.progress(0.0)
+
+            rows = []
+            for plan in iter_rolling_horizon(lp_input.processing_times, lp_input.capacities, start.year, start.month,
+                                             number_of_months, window, step, min_utilization, time_limit=time_limit,
+                                             gap=ROLLING_HORIZON_GAP):
+                rows.append(get_period_summary(plan))
+                progress_bar.progress(len(rows) / plan.number_of_periods)
+
+            plan_df = pd.DataFrame(rows).set_index("period")
+
+            table_column, chart_column = st.columns(2)
+
+            with table_column:
+                st.dataframe(plan_df, use_container_width=True)
+
+            with chart_column:
+                fig_plan = px.line(plan_df, x="start_date", y=["completed_pieces", "work_in_progress"], markers=True,
+                                   template="plotly_white", labels={"start_date": "Week", "value": "Pieces", "variable": ""})
+                st.plotly_chart(fig_plan, use_container_width=True)
 
-        max_employee_capacity_constraints = st.session_state.lp_model_info[CONSTRAINTS][MAX_EMPLOYEE_CAPACITY]
-        st.write("Employee Work Time Constraints (Maximum)")
-        for constraint in max_employee_capacity_constraints:
-            max_employees_capacity_constraints_table = pd.concat([max_employees_capacity_constraints_table, pd.DataFrame([[str(constraint), constraint.value()-constraint.constant]], columns=["Constraint", "Value"])])
-        st.table(max_employees_capacity_constraints_table)
+
+def display_model_export(min_hours_worked, max_hours_worked, capacities, track_memory):
+    """
+    Display the export of the model to MPS and the import of a result solved offline
+    :param min_hours_worked: The minimum hours worked by an employee
+    :param max_hours_worked: The maximum hours worked by an employee
+    :param capacities: The capacity of each task
+    :param track_memory: Whether the peak memory of each stage is traced
+    """
+    with st.expander("Offline solve"):
+        if st.button("Export model"):
+            lp_model = get_model_handle(min_hours_worked, max_hours_worked, capacities, track_memory)
+
+            with tempfile.TemporaryDirectory() as directory:
+                st.session_state.lp_export = []
+                for path in export_model(lp_model, os.path.join(directory, "lp_model")):
+                    with open(path, "rb") as f:
+                        st.session_state.lp_export.append((os.path.basename(path), f.read()))
+
+        for file_name, data in st.session_state.lp_export or []:
+            st.download_button(f"Download {file_name}", data, file_name=file_name)
+
+        st.caption("Re-solve both files with `python -m packages.linear_programming.model_io lp_model --time-limit 3600 --threads 8`")
+
+        result_file = st.file_uploader("Offline result", type="json")
+        if result_file is not None and st.button("Load result"):
+            try:
+                result = read_result(result_file, st.session_state.lp_input.processing_times)
+            except (ValueError, KeyError) as e:
+                st.error(f"Invalid result file: {e}")
+                return
+
+            if result.task_names != st.session_state.lp_input.task_names:
+                st.error("The result was solved for other tasks")
+                return
+
+            st.session_state.leaderboards = None # Reset the leaderboards
+            st.session_state.team_leaderboards = None
+            st.session_state.live_leaderboards = None
+            store_model_info(result)
+            st.experimental_rerun()
 
 
 def run_app():
     # Main content
     with st.container():
-        if st.session_state.lp_dataframe is not None:
+        if st.session_state.lp_input is not None:
             # Make check to verify if datasets have been changed without loading again
             # If so, warn the user
             if st.session_state.lp_changed:
                 st.warning("Datasets have changed. Please build the dataframe again.")
 
+            if st.session_state.lp_job_id is not None:
+                display_solver_job()
+
             st.header("Model information")
 
-            st.dataframe(st.session_state.lp_dataframe, use_container_width=True)
+            st.dataframe(st.session_state.lp_input.to_dataframe(), use_container_width=True)
 
             if st.session_state.lp_model_info is not None:
                 # {0: 'Not Solved', 1: 'Optimal', -1: 'Infeasible', -2: 'Unbounded', -3: 'Undefined'}
-                status = st.session_state.lp_model_info[STATUS]
+                status = st.session_state.lp_model_info.status
 
                 match status:
                     case Status.OPTIMAL:
                         st.success("Optimal Solution Found")
                         display_model()
+                    case Status.FEASIBLE if st.session_state.lp_model_info.mode == SolveMode.COMBINATORIAL:
+                        st.success("Heuristic Solution Found (not proven optimal, it can be well below the optimum)")
+                        display_model()
+                    case Status.FEASIBLE:
+                        st.success("Feasible Solution Found (not proven optimal)")
+                        display_model()
                     case Status.INFEASIBLE:
                         st.error("Infeasible Problem")
                         st.info("Make sure the constraints selected are valid")
@@ -240,6 +500,22 @@ def run_app():
 
         max_hours_worked = st.number_input("Maximum hours of work allowed", min_value=1, value=240)
 
+        solve_mode = SOLVE_MODES[st.selectbox("Solve mode", SOLVE_MODES.keys(), help=SOLVE_MODE_HELP)]
+
+        time_limit = st.number_input("Time limit (s)", min_value=0, value=0, help="Time limit of the integer solve, 0 for no limit") or None
+
+        run_cross_check = solve_mode == SolveMode.COMBINATORIAL and st.checkbox("Cross-check against PuLP")
+
+        solve_in_background = st.checkbox("Solve in background", help="Keep the page responsive while the model is solved, the result appears when it is done")
+
+        track_memory = st.checkbox("Profile memory", value=False, key="lp_track_memory", help="Trace the peak memory of each stage, which slows down the model construction")
+
+        capacities = None
+        if st.session_state.lp_input is not None:
+            with st.expander("Task capacities (hrs)"):
+                capacities = [st.number_input(task_name, min_value=1, value=int(capacity), key=f"capacity_{task_name}")
+                              for task_name, capacity in zip(st.session_state.lp_input.task_names, st.session_state.lp_input.capacities)]
+
         left_column, right_column = st.columns(2)
 
         with left_column:
@@ -249,10 +525,18 @@ def run_app():
             solve_button = st.button("Solve LP model")
 
         # Display the time elapsed if the model has been solved
-        if st.session_state.lp_model_info is not None and st.session_state.lp_model_info[STATUS] == Status.OPTIMAL:
+        if st.session_state.lp_model_info is not None and st.session_state.lp_model_info.status in (Status.OPTIMAL, Status.FEASIBLE):
             st.markdown("---")
             st.subheader("Total time elapsed")
-            st.markdown(f"**{round(st.session_state.lp_model_info[SOLUTION_TIME], 4)}** seconds")
+            st.markdown(f"**{round(st.session_state.lp_model_info.solution_time, 4)}** seconds")
+            st.caption(f"Model construction: {round(st.session_state.lp_model_info.build_time, 4)} seconds")
+            display_profile()
+
+        if st.session_state.lp_input is not None:
+            display_model_export(min_hours_worked, max_hours_worked, capacities, track_memory)
+
+        cache_stats = get_solution_cache().get_stats()
+        st.caption(f"Solution cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['disk_entries']} results on disk")
 
         if build_button:
             if len(st.session_state.datasets) == 0: # If there are no datasets, warn the user
@@ -264,20 +548,71 @@ def run_app():
             else:
                 st.session_state.lp_changed = False
 
-                build_dataframe()
+                # Only the changed tasks are updated if the number of employees is the same
+                lp_input = st.session_state.lp_input
+                if lp_input is not None and lp_input.number_of_employees == st.session_state.number_of_employees:
+                    update_dataframe()
+                else:
+                    build_dataframe()
 
                 st.experimental_rerun()
 
 
         if solve_button:
-            if st.session_state.lp_dataframe is None:   # If the dataframe has not been built, warn the user
+            if st.session_state.lp_input is None:   # If the dataframe has not been built, warn the user
                 st.warning("No problem to solve. Please build the dataframe first.")
 
             else:
                 st.session_state.leaderboards = None # Reset the leaderboards
-                st.session_state.lp_model_info = get_model_info(solve_linear_programming(st.session_state.lp_dataframe, min_hours_worked, max_hours_worked))    
+                st.session_state.team_leaderboards = None
+                st.session_state.live_leaderboards = None
+                lp_input = st.session_state.lp_input
+                lp_input.capacities = np.asarray(capacities, dtype=np.float64)
+
+                # Identical inputs are answered from the cache shared by every session
+                solution_cache = get_solution_cache()
+                task_names, processing_times, _ = lp_input.get_model_arrays()
+                cache_key = get_cache_key(task_names, processing_times, capacities, lp_input.difficulties,
+                                          min_hours_worked, max_hours_worked, mode=solve_mode, time_limit=time_limit)
+                cached_result = None if run_cross_check else solution_cache.get(cache_key)
+
+                if cached_result is not None:
+                    store_model_info(cached_result)
+
+                elif solve_in_background:
+                    job_queue = get_solver_job_queue()
+                    if st.session_state.lp_job_id is not None:   # Only one background solve per session
+                        job_queue.cancel(st.session_state.lp_job_id)
+                        job_queue.forget(st.session_state.lp_job_id)
+
+                    st.session_state.lp_job_id = job_queue.submit(task_names, processing_times, capacities, min_hours_worked,
+                                                                  max_hours_worked, mode=solve_mode, time_limit=time_limit)
+                    st.session_state.lp_job_cache_key = cache_key
+                    st.experimental_rerun()
+
+                elif solve_mode == SolveMode.COMBINATORIAL:
+                    model_arrays = (task_names, processing_times, capacities)
+                    store_model_info(solve_combinatorial(*model_arrays, min_hours_worked, max_hours_worked, track_memory,
+                                                         time_limit=time_limit))
+
+                    if run_cross_check:
+                        st.write(cross_check(*model_arrays, min_hours_worked, max_hours_worked, time_limit))
+                        st.stop()   # Keep the comparison on screen instead of rerunning
+
+                else:
+                    lp_model = get_model_handle(min_hours_worked, max_hours_worked, capacities, track_memory)
+                    store_model_info(lp_model.solve(mode=solve_mode, time_limit=time_limit))
+
+                if cached_result is None:
+                    solution_cache.put(cache_key, st.session_state.lp_model_info)
+
                 st.experimental_rerun()
 
+    # Main content (rendered below the model information, it needs the solve settings from the sidebar)
+    if st.session_state.lp_input is not None:
+        display_scenario_sweep(solve_mode, time_limit)
+        display_rolling_horizon()
+
 
 if __name__ == "__main__":
     st.set_page_config(page_title="Linear Programming", page_icon=":bar_chart:", layout="wide")
@@ -1,16 +1,12 @@
 import streamlit as st
-from packages.utils.utils import load_session_state, hide_streamlit_style
+from packages.utils.utils import load_session_state, hide_streamlit_style, get_leaderboard_history
 import plotly.express as px
 import numpy as np
-from packages.gamification.leaderboards import create_unordered_empty_leaderboard, finalize_leaderboard
-
-# Linear Programming model information
-# STATUS = 0
-# OBJECTIVE = 1
-VARIABLES = 2
-# CONSTRAINTS = 3
-# SOLUTION_TIME = 4
-
+from packages.gamification.leaderboards import (create_unordered_empty_leaderboard, finalize_leaderboard, get_top_k,
+                                                get_rank_window, get_placement_labels)
+from packages.gamification.sharded import assign_teams, build_team_leaderboards, merge_top_k, get_plant_rank
+from packages.gamification.live_leaderboard import LiveLeaderboard
+from packages.gamification.scoring import get_productivity_points
 
 # Leaderboards
 PRODUCTIVITY = "Productivity"
@@ -29,17 +25,31 @@ DEFAULT = "#3d85c6"
 QUALITATIVE_FACTORS = ["Self vs Supervisor assess.", "Engagement"]
 
 
+# Partial views
+PODIUM_SIZE = 3
+RANK_WINDOW_RADIUS = 2  # Players shown before and after the selected player
+
+
+# History
+HISTORY_WINDOWS = {"Last 7 days": 7, "Last 30 days": 30, "All time": None}
+NUMBER_OF_MOVERS = 5
+
+
+# Teams
+PLANT_TOP_K = 10    # Players of the plant-wide leaderboard merged from the team leaderboards
+
+
 def display_as_bar_chart(df):
     placements = df.index
 
+    if len(df) == 0:
+        return
+
     color_discrete_sequence = [DEFAULT] * len(df)  # Initialize the color list with the default color
 
-    # Change the color of the first bar to gold
-    color_discrete_sequence[0] = GOLD
-    # Change the color of the second bar to silver
-    color_discrete_sequence[1] = SILVER
-    # Change the color of the third bar to bronze
-    color_discrete_sequence[2] = BRONZE
+    # Change the color of the first three bars to gold, silver and bronze (small teams can have fewer players)
+    podium_colors = [GOLD, SILVER, BRONZE][:len(df)]
+    color_discrete_sequence[:len(podium_colors)] = podium_colors
 
     fig = px.bar(df,
                  x="Total Points",
@@ -54,7 +64,8 @@ def display_as_bar_chart(df):
         fig.data[i].showlegend = False  # Then, hide legends for the rest of the placements
 
     # Customize the label for the 4th bar's legend
-    fig.data[3].name = '4th and below'
+    if len(fig.data) > 3:
+        fig.data[3].name = '4th and below'
 
     # Update the y-axis labels using the mapping so that the player names are displayed instead of the index
     fig.update_yaxes(tickvals=[bar.y for bar in fig.data], ticktext=[df["Player"][i] for i in range(len(fig.data))])
@@ -62,6 +73,142 @@ def display_as_bar_chart(df):
     st.plotly_chart(fig, use_container_width=True, use_container_height=True)
 
 
+def display_leaderboard(df, show_full, player):
+    """
+    Displays a leaderboard. Unless the full leaderboard is requested, only the podium and the players placed around the
+    selected player are formatted, without sorting the whole leaderboard
+    :param df: The unordered leaderboard dataframe
+    :param show_full: Whether the full leaderboard is displayed
+    :param player: The selected player
+    """
+    if show_full:
+        df = finalize_leaderboard(df.copy())
+
+        # Display the dataframe as a table
+        st.dataframe(df, use_container_width=True)
+
+        # Display the dataframe as a bar chart
+        display_as_bar_chart(df)
+
+    else:
+        st.dataframe(get_top_k(df, PODIUM_SIZE), use_container_width=True)
+        if player in df.index:
+            st.caption("Player " + str(player))
+            st.dataframe(get_rank_window(df, player, RANK_WINDOW_RADIUS), use_container_width=True)
+
+
+def display_live_leaderboard(live_leaderboard, show_full, player):
+    """
+    Displays a live leaderboard, which is kept sorted, so only the displayed placements are exported
+    :param live_leaderboard: The live leaderboard
+    :param show_full: Whether the full leaderboard is displayed
+    :param player: The selected player
+    """
+    if show_full:
+        df = live_leaderboard.to_dataframe()
+
+        # Display the dataframe as a table
+        st.dataframe(df, use_container_width=True)
+
+        # Display the dataframe as a bar chart
+        display_as_bar_chart(df)
+
+    else:
+        st.dataframe(live_leaderboard.to_dataframe(0, PODIUM_SIZE), use_container_width=True)
+        if player in live_leaderboard:
+            position = live_leaderboard.get_rank(player) - 1
+            st.caption("Player " + str(player))
+            st.dataframe(live_leaderboard.to_dataframe(max(position - RANK_WINDOW_RADIUS, 0),
+                                                       position + RANK_WINDOW_RADIUS + 1), use_container_width=True)
+
+
+def award_points(player, qualitative_factor, points):
+    """
+    Adds qualitative points to a player as they come in. Only the player is moved in the qualitative and global live
+    leaderboards, which are not sorted again
+    :param player: The player
+    :param qualitative_factor: The qualitative factor the points are given for
+    :param points: The points
+    """
+    live_leaderboards = st.session_state.live_leaderboards
+
+    live_leaderboards[QUALITATIVE].add_points(player, points, qualitative_factor)
+    qualitative_points = live_leaderboards[QUALITATIVE].get_points(player)
+
+    # Same weighting as build_global_df
+    global_points = round(live_leaderboards[PRODUCTIVITY].get_points(player) * st.session_state.productivity_weight +
+                          qualitative_points * st.session_state.qualitative_weight)
+    live_leaderboards[GLOBAL].set_column_points(player, QUALITATIVE, qualitative_points)
+    live_leaderboards[GLOBAL].set_points(player, global_points)
+
+    # Keep a snapshot of the changed leaderboards for the history
+    timestamp = np.datetime64("now", "s")
+    for leaderboard in (QUALITATIVE, GLOBAL):
+        get_leaderboard_history(st.session_state.workspace_id, leaderboard).append(
+            live_leaderboards[leaderboard].to_unordered_dataframe(), timestamp)
+
+
+def display_team_leaderboards(show_full, player):
+    """
+    Displays the productivity leaderboard of a team and the plant-wide leaderboard merged from the team leaderboards
+    :param show_full: Whether the full team leaderboard is displayed
+    :param player: The selected player
+    """
+    team_leaderboards = st.session_state.team_leaderboards
+
+    team_column, plant_column = st.columns(2, gap="large")
+
+    with team_column:
+        team = st.selectbox("Team", list(team_leaderboards))
+        display_leaderboard(team_leaderboards[team][0], show_full, player)
+
+    with plant_column:
+        st.write("Plant-wide top " + str(PLANT_TOP_K))
+        st.dataframe(merge_top_k(team_leaderboards, PLANT_TOP_K)[["Player", "Team", "Total Points"]],
+                     use_container_width=True)
+
+        player_team = next(team for team, (df, _) in team_leaderboards.items() if player in df.index)
+        plant_rank = get_plant_rank(team_leaderboards, player_team, player)
+        st.write("Player " + str(player) + " (" + player_team + "): " +
+                 get_placement_labels(plant_rank, plant_rank + 1)[0] + " plant-wide")
+
+
+def display_history(player):
+    """
+    Displays the standings, the biggest movers and the placement history of the selected player over a time window of
+    the stored leaderboard snapshots
+    :param player: The selected player
+    """
+    leaderboard_column, window_column = st.columns(2)
+
+    with leaderboard_column:
+        leaderboard = st.selectbox("Leaderboard", [GLOBAL, PRODUCTIVITY, QUALITATIVE])
+
+    with window_column:
+        window = st.selectbox("Window", list(HISTORY_WINDOWS))
+
+    history = get_leaderboard_history(st.session_state.workspace_id, leaderboard)
+    days = HISTORY_WINDOWS[window]
+    start = np.datetime64("now", "s") - np.timedelta64(days, "D") if days is not None else None
+
+    standings_column, movers_column = st.columns(2)
+
+    with standings_column:
+        st.write("Standings")
+        standings = history.get_standings(start)
+        if len(standings) > 0:
+            st.dataframe(get_top_k(standings, PODIUM_SIZE), use_container_width=True)
+            if player in standings.index:
+                st.dataframe(get_rank_window(standings, player, RANK_WINDOW_RADIUS), use_container_width=True)
+
+    with movers_column:
+        st.write("Biggest movers")
+        st.dataframe(history.get_movers(start, k=NUMBER_OF_MOVERS), use_container_width=True)
+
+    st.write("Placement of player " + str(player))
+    st.line_chart(history.get_rank_history(player, start)["rank"])
+
+
 def build_productivity_df(points_per_star):
     """
     Builds the productivity leaderboard dataframe
@@ -71,34 +218,15 @@ def build_productivity_df(points_per_star):
     number_of_players = st.session_state.number_of_employees
     tasks = [task_name for task_name in st.session_state.datasets.keys()]
     df = create_unordered_empty_leaderboard(number_of_players, tasks)
-    
-    for index, row in st.session_state.lp_dataframe.iterrows():
-        task_name = index
-        task_difficulty = row["Difficulty"]
-
-        points_to_distribute = points_per_star * task_difficulty
-
-        # The calculated formula gives the most points to the faster employees who worked on the task (regardless of
-        # the number of tasks executed) List with only the employees that worked on this task
-        task_workers_info = [index for index, value in enumerate(st.session_state.lp_model_info[VARIABLES][task_name])
-                             if value > 0]
-
-        # Sort the list by the processing time by descending order (the slower employees will be at the top)
-        task_workers_info.sort(key=lambda x: st.session_state.lp_dataframe.loc[task_name][x], reverse=True)
-
-        # Get the number of employees that worked on this task
-        number_of_task_workers = len(task_workers_info)
 
-        # x + 2x + 3x + ... + nx = points_to_distribute (solve for x)
-        sum_of_components = number_of_task_workers * (number_of_task_workers + 1) // 2
-        x = points_to_distribute / sum_of_components    
+    # Points of every task at once, (tasks x employees) with NaN for the employees that did not work on the task
+    lp_input = st.session_state.lp_input
+    points = get_productivity_points(st.session_state.lp_model_info.allocations, lp_input.processing_times,
+                                     lp_input.difficulties, points_per_star)
 
-        # Distribute the points to the players
-        for i in range(len(task_workers_info)):
-            points = round(x * (i + 1))  # The points are distributed on a linear scale
-            # Since the index starts from 0, we need to add 1 to the index to get the correct row
-            df.loc[task_workers_info[i], task_name] = points
-            df.loc[task_workers_info[i], "Total Points"] += points
+    for task_name, task_points in zip(lp_input.task_names, points):
+        df[task_name] = task_points
+    df["Total Points"] = np.nansum(points, axis=0)
 
     return df
 
@@ -154,17 +282,34 @@ def run_app():
             with st.container():
                 st.header("Global Leaderboard")
 
-                table_column, chart_column = st.columns((1.25, 1), gap="large")
+                view_column, player_column = st.columns(2)
+
+                with view_column:
+                    show_full = st.checkbox("Show full leaderboards", value=False,
+                                            help="Sort and display every player instead of the podium and the "
+                                                 "players placed around the selected player")
+
+                with player_column:
+                    player = st.number_input("Player", min_value=0, max_value=len(st.session_state.leaderboards[GLOBAL]) - 1,
+                                             value=0, step=1, disabled=show_full)
+
+                if show_full:
+                    table_column, chart_column = st.columns((1.25, 1), gap="large")
+
+                    global_df = st.session_state.live_leaderboards[GLOBAL].to_dataframe()
 
-                with table_column:
-                    st.markdown("##")   # Add some space to align the table with the chart
-                    st.markdown("##")
-                    # Display the dataframe as a table
-                    st.dataframe(st.session_state.leaderboards[GLOBAL], use_container_width=True)
+                    with table_column:
+                        st.markdown("##")   # Add some space to align the table with the chart
+                        st.markdown("##")
+                        # Display the dataframe as a table
+                        st.dataframe(global_df, use_container_width=True)
 
-                with chart_column:
-                    # Display the dataframe as a bar chart
-                    display_as_bar_chart(st.session_state.leaderboards[GLOBAL])
+                    with chart_column:
+                        # Display the dataframe as a bar chart
+                        display_as_bar_chart(global_df)
+
+                else:
+                    display_live_leaderboard(st.session_state.live_leaderboards[GLOBAL], show_full, player)
 
                 st.markdown("---")
 
@@ -184,11 +329,7 @@ def run_app():
                     with points_column:
                         st.write("Points per Star: " + str(st.session_state.points_per_star))
 
-                    # Display the dataframe as a table
-                    st.dataframe(st.session_state.leaderboards[PRODUCTIVITY], use_container_width=True)
-
-                    # Display the dataframe as a bar chart
-                    display_as_bar_chart(st.session_state.leaderboards[PRODUCTIVITY])
+                    display_live_leaderboard(st.session_state.live_leaderboards[PRODUCTIVITY], show_full, player)
 
                 with right_column:
                     st.subheader("Qualitative Leaderboard")
@@ -201,11 +342,20 @@ def run_app():
                     with range_column:
                         st.write("Value range: " + str(st.session_state.min_qualitative_value) + " - " + str(st.session_state.max_qualitative_value))
 
-                    # Display the dataframe as a table
-                    st.dataframe(st.session_state.leaderboards[QUALITATIVE], use_container_width=True)
-        
-                    # Display the dataframe as a bar chart
-                    display_as_bar_chart(st.session_state.leaderboards[QUALITATIVE])
+                    display_live_leaderboard(st.session_state.live_leaderboards[QUALITATIVE], show_full, player)
+
+            if st.session_state.team_leaderboards is not None:
+                st.markdown("---")
+
+                with st.container():
+                    st.subheader("Team Leaderboards")
+
+                    st.write("Teams: " + str(len(st.session_state.team_leaderboards)))
+
+                    display_team_leaderboards(show_full, player)
+
+            with st.expander("History"):
+                display_history(player)
 
         else:
             st.info("No leaderboards available. Please create the leaderboards.")
@@ -232,6 +382,11 @@ def run_app():
         points_per_star = st.number_input("Points per star", min_value=1, value=100
                                           , help="The points to distribute per star of difficulty for each task")
 
+        number_of_teams = st.number_input("Teams", min_value=1, max_value=max(st.session_state.number_of_employees, 1),
+                                          value=1, step=1,
+                                          help="The employees are split into teams scored on their own, and the "
+                                               "plant-wide leaderboard is merged from the team leaderboards")
+
         st.subheader("Qualitative",
                      help="The qualitative leaderboard is randomly generated for each employee based on the minimum and maximum values")
 
@@ -247,6 +402,26 @@ def run_app():
 
         leaderboards_button = st.button("Create leaderboards", use_container_width=True)
 
+        if st.session_state.leaderboards is not None:
+            st.subheader("Award points",
+                         help="Qualitative points given during the day, added to the current leaderboards without "
+                              "creating them again")
+
+            award_player = st.number_input("Awarded player", min_value=0,
+                                           max_value=len(st.session_state.leaderboards[GLOBAL]) - 1, value=0, step=1)
+
+            left_column, right_column = st.columns(2)
+
+            with left_column:
+                award_factor = st.selectbox("Factor", QUALITATIVE_FACTORS)
+
+            with right_column:
+                award_value = st.number_input("Points", min_value=1, value=10, step=1)
+
+            if st.button("Award points", use_container_width=True):
+                award_points(award_player, award_factor, award_value)
+                st.experimental_rerun()
+
         if leaderboards_button:
 
             if st.session_state.lp_model_info is None:  # No LP model available
@@ -272,8 +447,29 @@ def run_app():
 
                 st.session_state.qualitative_weight = qualitative_weight
 
-                st.session_state.leaderboards = {PRODUCTIVITY: finalize_leaderboard(productivity_df), QUALITATIVE: finalize_leaderboard(qualitative_df),
-                                                 GLOBAL: finalize_leaderboard(global_df)}
+                # The leaderboards are kept unordered, they are only sorted when the full leaderboards are displayed
+                st.session_state.leaderboards = {PRODUCTIVITY: productivity_df, QUALITATIVE: qualitative_df,
+                                                 GLOBAL: global_df}
+
+                # Sorted copies of the leaderboards, updated in place as points are awarded
+                st.session_state.live_leaderboards = {
+                    PRODUCTIVITY: LiveLeaderboard.from_leaderboard(productivity_df, list(st.session_state.datasets.keys())),
+                    QUALITATIVE: LiveLeaderboard.from_leaderboard(qualitative_df, QUALITATIVE_FACTORS),
+                    GLOBAL: LiveLeaderboard.from_leaderboard(global_df, [PRODUCTIVITY, QUALITATIVE])}
+
+                if number_of_teams > 1:
+                    lp_input = st.session_state.lp_input
+                    teams = assign_teams(st.session_state.number_of_employees, number_of_teams)
+                    st.session_state.team_leaderboards = build_team_leaderboards(
+                        lp_input.task_names, st.session_state.lp_model_info.allocations, lp_input.processing_times,
+                        lp_input.difficulties, points_per_star, teams, k=PLANT_TOP_K)
+                else:
+                    st.session_state.team_leaderboards = None
+
+                # Keep a snapshot of each leaderboard for the history
+                timestamp = np.datetime64("now", "s")
+                for leaderboard, df in st.session_state.leaderboards.items():
+                    get_leaderboard_history(st.session_state.workspace_id, leaderboard).append(df, timestamp)
 
                 st.experimental_rerun()
 
@@ -0,0 +1,23 @@
+import os
+import sys
+import numpy as np
+
+# The packages are imported from the root of the repository, like the Streamlit pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_instance(seed, number_of_tasks=3, number_of_employees=6, processing_time_range=(0.5, 3.0),
+                  capacity_range=(20, 60)):
+    """
+    Draws a random allocation problem
+    :param seed: The seed of the random generator
+    :param number_of_tasks: The number of tasks
+    :param number_of_employees: The number of employees
+    :param processing_time_range: The range of the unit processing times
+    :param capacity_range: The range of the task capacities
+    :return: The task names, the (tasks x employees) unit processing time matrix and the task capacities
+    """
+    rng = np.random.default_rng(seed)
+    processing_times = rng.uniform(*processing_time_range, (number_of_tasks, number_of_employees)).round(2)
+    capacities = rng.uniform(*capacity_range, number_of_tasks).round()
+    return [f"task{chr(ord('a') + t)}" for t in range(number_of_tasks)], processing_times, capacities
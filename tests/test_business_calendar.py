@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from packages.dataset_generator.business_calendar import count_business_days, leave_days_to_bitmask
+
+# March 2024 in Portugal: 21 weekdays, minus Good Friday (29th)
+YEAR, MONTH = 2024, 3
+BUSINESS_DAYS = 20
+
+
+@pytest.mark.parametrize("leave_days", [[4, 5, 29, 30, 40], np.array([4, 5, 29, 30, 40]),
+                                        np.array([4, 5, 29, 30, 40], dtype=np.int32), (4, 5, 29, 30, 40)])
+def test_leave_days_of_any_integer_type(leave_days):
+    # The 29th is a holiday, the 30th a Saturday and the 40th does not exist
+    assert type(leave_days_to_bitmask(leave_days)) is int
+    assert count_business_days(leave_days, YEAR, MONTH) == BUSINESS_DAYS - 2
+
+
+def test_batch_matches_single_counts():
+    batch = [[], [4, 5], list(range(1, 32))]
+
+    assert list(count_business_days(batch, YEAR, MONTH)) == [count_business_days(leave_days, YEAR, MONTH)
+                                                             for leave_days in batch]
+    assert count_business_days([], YEAR, MONTH) == BUSINESS_DAYS
@@ -0,0 +1,59 @@
+import pytest
+from packages.linear_programming import combinatorial_solver
+from packages.linear_programming.combinatorial_solver import solve_combinatorial
+from packages.linear_programming.lp_solver import LinearProgrammingModel, SolveMode, Status
+from packages.linear_programming.rounding import TOLERANCE, is_feasible
+from conftest import make_instance
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_heuristic_solution_is_feasible_and_below_optimum(seed):
+    task_names, processing_times, capacities = make_instance(seed)
+    min_hours_worked, max_hours_worked = 0, 15
+
+    exact = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked).solve()
+    result = solve_combinatorial(task_names, processing_times, capacities, min_hours_worked, max_hours_worked,
+                                 fallback=False)
+
+    assert exact.status == Status.OPTIMAL
+    assert result.mode == SolveMode.COMBINATORIAL
+    assert result.status in (Status.OPTIMAL, Status.FEASIBLE)
+    assert is_feasible(result.allocations, processing_times, capacities, min_hours_worked, max_hours_worked)
+    assert result.objective_value <= exact.objective_value + TOLERANCE
+    if result.status == Status.OPTIMAL:
+        assert result.objective_value >= exact.objective_value - TOLERANCE
+
+
+def test_falls_back_to_pulp_when_heuristic_finds_nothing(monkeypatch):
+    task_names, processing_times, capacities = make_instance(0)
+    monkeypatch.setattr(combinatorial_solver, "search_throughput", lambda *args: None)
+
+    exact = LinearProgrammingModel(task_names, processing_times, capacities, 0, 15).solve()
+    result = solve_combinatorial(task_names, processing_times, capacities, 0, 15)
+
+    assert result.mode == SolveMode.EXACT
+    assert result.status == Status.OPTIMAL
+    assert result.objective_value == pytest.approx(exact.objective_value)
+
+
+def test_fallback_always_has_a_time_limit(monkeypatch):
+    task_names, processing_times, capacities = make_instance(0)
+    monkeypatch.setattr(combinatorial_solver, "search_throughput", lambda *args: None)
+    time_limits = []
+    solve = LinearProgrammingModel.solve
+    monkeypatch.setattr(LinearProgrammingModel, "solve",
+                        lambda self, **kwargs: time_limits.append(kwargs.get("time_limit")) or solve(self, **kwargs))
+
+    solve_combinatorial(task_names, processing_times, capacities, 0, 15)
+    solve_combinatorial(task_names, processing_times, capacities, 0, 15, time_limit=5)
+
+    assert time_limits == [combinatorial_solver.FALLBACK_TIME_LIMIT, 5]
+
+
+def test_no_fallback_reports_not_solved(monkeypatch):
+    task_names, processing_times, capacities = make_instance(0)
+    monkeypatch.setattr(combinatorial_solver, "search_throughput", lambda *args: None)
+
+    result = solve_combinatorial(task_names, processing_times, capacities, 0, 15, fallback=False)
+
+    assert result.status == Status.NOT_SOLVED
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from packages.dataset_generator.dataset_store import (DatasetStore, get_workspace_store_directory, remove_stale_stores,
+                                                      write_json)
+
+
+def make_dataset(value, number_of_employees=5):
+    return pd.DataFrame({"unit_processing_time": np.full(number_of_employees, value, dtype=np.float64)})
+
+
+def test_workspaces_do_not_share_datasets(tmp_path):
+    first = DatasetStore(get_workspace_store_directory("first", str(tmp_path)))
+    second = DatasetStore(get_workspace_store_directory("second", str(tmp_path)))
+
+    first["printing"] = (make_dataset(1.0), 600, 5)
+    second["printing"] = (make_dataset(2.0), 600, 5)
+    second.clear()
+
+    assert list(first) == ["printing"]
+    assert first.get_column("printing", "unit_processing_time")[0] == 1.0
+    assert len(second) == 0
+
+
+def test_reopened_workspace_keeps_its_datasets(tmp_path):
+    store = DatasetStore(get_workspace_store_directory("workspace", str(tmp_path)))
+    store["printing"] = (make_dataset(1.0), 600, 5)
+
+    # A new session (a reload or a restart of the server) opening the same workspace
+    reopened = DatasetStore(get_workspace_store_directory("workspace", str(tmp_path)))
+
+    assert list(reopened) == ["printing"]
+    assert reopened.get_settings("printing") == (600, 5)
+
+
+def test_only_unused_stores_are_removed(tmp_path):
+    used = DatasetStore(get_workspace_store_directory("used", str(tmp_path)))
+    used["printing"] = (make_dataset(1.0), 600, 5)
+    abandoned = DatasetStore(get_workspace_store_directory("abandoned", str(tmp_path)))
+    abandoned["printing"] = (make_dataset(1.0), 600, 5)
+
+    old = time.time() - 3600
+    for directory in (used.directory, abandoned.directory):
+        os.utime(os.path.join(directory, "manifest.json"), (old, old))
+        os.utime(directory, (old, old))
+    DatasetStore(used.directory)    # Opened again, without writing
+
+    remove_stale_stores(str(tmp_path), max_age=60)
+
+    assert sorted(os.listdir(str(tmp_path))) == ["used"]
+
+
+@pytest.mark.parametrize("name", ["", "a/b", "../printing", ".hidden"])
+def test_invalid_dataset_names(tmp_path, name):
+    store = DatasetStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store[name] = (make_dataset(1.0), 600, 5)
+
+
+def test_overwriting_keeps_open_columns_valid(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    store["printing"] = (make_dataset(1.0), 600, 5)
+    column = store.get_column("printing", "unit_processing_time")
+
+    store["printing"] = (make_dataset(2.0), 300, 3)
+
+    assert np.all(column == 1.0)
+    assert np.all(store.get_column("printing", "unit_processing_time") == 2.0)
+    assert store.get_settings("printing") == (300, 3)
+    assert len(os.listdir(os.path.join(str(tmp_path), "printing"))) == 1     # The previous version was removed
+
+
+def test_concurrent_json_writes(tmp_path):
+    path = os.path.join(str(tmp_path), "manifest.json")
+    errors = []
+
+    def write(thread_index):
+        try:
+            for i in range(200):
+                write_json(path, {"thread": thread_index, "write": i})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path) as f:
+        assert json.load(f)["write"] == 199
+    assert os.listdir(str(tmp_path)) == ["manifest.json"]
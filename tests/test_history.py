@@ -0,0 +1,87 @@
+import multiprocessing
+import threading
+import numpy as np
+import pytest
+from packages.gamification.leaderboards import create_unordered_empty_leaderboard
+from packages.gamification.history import SnapshotHistory
+
+NUMBER_OF_PLAYERS = 5
+
+
+def make_snapshot(points):
+    df = create_unordered_empty_leaderboard(NUMBER_OF_PLAYERS, [])
+    df["Total Points"] = points + np.arange(NUMBER_OF_PLAYERS)
+    return df
+
+
+def append_snapshots(directory, worker, number_of_snapshots):
+    history = SnapshotHistory(directory)
+    for i in range(number_of_snapshots):
+        history.append(make_snapshot(worker * 10_000 + i), np.datetime64("2024-01-01") + np.timedelta64(i, "s"))
+
+
+def test_concurrent_appends_keep_every_row(tmp_path):
+    history = SnapshotHistory(str(tmp_path))   # Shared like the cached history of the Gamification page
+    errors = []
+
+    def append(worker):
+        try:
+            for i in range(300):
+                history.append(make_snapshot(worker * 10_000 + i), np.datetime64("2024-01-01") + np.timedelta64(i, "s"))
+        except Exception as e:
+            errors.append(e)
+
+    def query():
+        # Compactions delete segments while the queries run
+        try:
+            while any(thread.is_alive() for thread in appenders):
+                history.get_standings()
+        except Exception as e:
+            errors.append(e)
+
+    appenders = [threading.Thread(target=append, args=(worker,)) for worker in range(4)]
+    reader = threading.Thread(target=query)
+    for thread in appenders:
+        thread.start()
+    reader.start()
+    for thread in (*appenders, reader):
+        thread.join()
+
+    assert errors == []
+    assert len(history) == 4 * 300 * NUMBER_OF_PLAYERS
+
+    points = np.sort(np.concatenate([rows["points"] for rows in history.iter_rows(player=0)]))
+    np.testing.assert_array_equal(points, np.sort([worker * 10_000 + i for worker in range(4) for i in range(300)]))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_appends_from_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=append_snapshots, args=(str(tmp_path), worker, 100)) for worker in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0, 0, 0]
+    assert len(SnapshotHistory(str(tmp_path))) == 3 * 100 * NUMBER_OF_PLAYERS
+
+
+def test_standings_and_movers(tmp_path):
+    history = SnapshotHistory(str(tmp_path))
+    first = make_snapshot(0)
+    last = first.copy()
+    last.loc[0, "Total Points"] = 100   # Player 0 climbs from last to first
+
+    history.append(first, "2024-01-01")
+    history.append(last, "2024-01-02")
+
+    standings = history.get_standings()
+    assert standings.loc[0, "Total Points"] == 100
+    assert list(history.get_rank_history(0)["rank"]) == [5, 1]
+
+    movers = history.get_movers(k=1)
+    assert list(movers.index) == [0]
+    assert movers.loc[0, "Change"] == 4
+    assert len(history.get_standings("2024-01-02")) == NUMBER_OF_PLAYERS
+    assert len(history.get_standings(end="2023-12-31")) == 0
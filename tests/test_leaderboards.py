@@ -0,0 +1,43 @@
+import sys
+import threading
+import numpy as np
+from packages.gamification import leaderboards
+from packages.gamification.leaderboards import (create_unordered_empty_leaderboard, finalize_leaderboard,
+                                                get_placement_labels, get_top_k, get_rank_window, get_ordinal_suffix)
+
+
+def test_placement_labels_are_built_once_across_threads(monkeypatch):
+    monkeypatch.setattr(leaderboards, "ordinal_labels", [])
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # Switch threads often, in the middle of the label extension
+    barrier = threading.Barrier(8)
+
+    def build(stop):
+        barrier.wait()
+        get_placement_labels(0, stop)
+
+    threads = [threading.Thread(target=build, args=(20_000 + 1000 * i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sys.setswitchinterval(interval)
+
+    assert leaderboards.ordinal_labels == [f"{i}{get_ordinal_suffix(i)}" for i in range(1, 27_001)]
+    assert list(get_placement_labels(10, 13)) == ["11th", "12th", "13th"]
+
+
+def test_partial_views_match_finalize_leaderboard():
+    rng = np.random.default_rng(0)
+    df = create_unordered_empty_leaderboard(100, [])
+    df["Total Points"] = rng.integers(0, 30, 100)
+    expected = finalize_leaderboard(df.copy())
+
+    top = get_top_k(df, 3)
+    assert list(top.index) == ["1st", "2nd", "3rd"]
+    assert list(top["Player"]) == list(expected["Player"][:3])
+
+    player = expected["Player"].iloc[40]
+    window = get_rank_window(df, player, 2)
+    assert list(window.index) == list(expected.index[38:43])
+    assert list(window["Player"]) == list(expected["Player"][38:43])
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from packages.gamification.leaderboards import create_unordered_empty_leaderboard, finalize_leaderboard
+from packages.gamification.live_leaderboard import LiveLeaderboard
+from packages.gamification.history import get_ranks
+
+COLUMNS = ["Engagement"]
+
+
+def make_leaderboard(seed, number_of_players=50):
+    rng = np.random.default_rng(seed)
+    df = create_unordered_empty_leaderboard(number_of_players, COLUMNS)
+    df["Engagement"] = rng.integers(0, 20, number_of_players)  # Few values, so there are ties
+    df["Total Points"] = df["Engagement"]
+    return df
+
+
+def assert_same_leaderboard(live_df, expected_df):
+    assert list(live_df.index) == list(expected_df.index)
+    np.testing.assert_array_equal(live_df[["Player"] + COLUMNS + ["Total Points"]].to_numpy(dtype=np.float64),
+                                  expected_df[["Player"] + COLUMNS + ["Total Points"]].to_numpy(dtype=np.float64))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_updates_keep_finalize_leaderboard_order(seed):
+    df = make_leaderboard(seed)
+    live = LiveLeaderboard.from_leaderboard(df, COLUMNS, seed=seed)
+    assert_same_leaderboard(live.to_dataframe(), finalize_leaderboard(df.copy()))
+
+    rng = np.random.default_rng(seed + 100)
+    for player, points in zip(rng.integers(0, len(df), 200), rng.integers(-5, 10, 200)):
+        live.add_points(player, points, "Engagement")
+        df.at[player, "Engagement"] += points
+        df.at[player, "Total Points"] += points
+
+    expected = finalize_leaderboard(df.copy())
+    assert_same_leaderboard(live.to_dataframe(), expected)
+
+    for placement, player in enumerate(expected["Player"], start=1):
+        assert live.get_rank(player) == placement
+
+    # The snapshots appended to the history are ranked like the live leaderboard
+    unordered = live.to_unordered_dataframe()
+    assert_same_leaderboard(finalize_leaderboard(unordered.copy()), expected)
+    for player, rank in zip(unordered.index, get_ranks(unordered)):
+        assert live.get_rank(player) == rank
+
+
+def test_rank_top_and_ranges():
+    df = make_leaderboard(7)
+    live = LiveLeaderboard.from_leaderboard(df, COLUMNS, seed=7)
+    expected = finalize_leaderboard(df.copy())
+    pairs = list(zip(expected["Player"], expected["Total Points"]))
+
+    assert len(live) == len(df)
+    assert live.get_top(5) == pairs[:5]
+    assert live.get_top(len(df) + 10) == pairs
+    assert list(live.iter_from(len(df))) == []
+    assert_same_leaderboard(live.to_dataframe(10, 15), expected.iloc[10:15])
+    assert_same_leaderboard(live.to_dataframe(45, 60), expected.iloc[45:])
+
+    first_placement, neighborhood = live.get_neighborhood(pairs[20][0], 2)
+    assert (first_placement, neighborhood) == (19, pairs[18:23])
+    first_placement, neighborhood = live.get_neighborhood(pairs[0][0], 2)
+    assert (first_placement, neighborhood) == (1, pairs[:3])
+
+
+def test_new_players_and_set_points():
+    live = LiveLeaderboard(COLUMNS, seed=0)
+    live.add_player(3)
+    live.add_points(1, 10, "Engagement")
+    live.add_points(2, 10)
+    live.set_points(3, 15)
+    live.set_column_points(3, "Engagement", 15)
+
+    assert list(live) == [(3, 15), (1, 10), (2, 10)]
+    assert live.get_rank(2) == 3
+
+    df = live.to_dataframe()
+    assert list(df.index) == ["1st", "2nd", "3rd"]
+    assert list(df["Engagement"].fillna(-1)) == [15, 10, -1]
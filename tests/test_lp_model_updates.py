@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from packages.linear_programming.lp_solver import LinearProgrammingModel, Status, build_linear_programming_model
+from packages.linear_programming.rounding import is_feasible
+from conftest import make_instance
+
+MIN_HOURS_WORKED, MAX_HOURS_WORKED = 0, 15
+
+
+def get_structure(model, variables):
+    """
+    Returns the objective, the constraints and the variables of a model, keyed by name so the order does not matter
+    """
+    def get_terms(expression):
+        return {variable.name: coefficient for variable, coefficient in expression.items()}
+
+    constraints = {name: (get_terms(constraint), constraint.sense, constraint.constant)
+                   for name, constraint in model.constraints.items()}
+
+    return get_terms(model.objective), constraints, sorted(variable.name for variable in model.variables()), \
+        [variable.name for variable in variables.flat]
+
+
+def assert_same_model(lp_model, task_names, processing_times, capacities):
+    model, variables = build_linear_programming_model(task_names, processing_times, capacities, MIN_HOURS_WORKED,
+                                                      MAX_HOURS_WORKED)
+
+    assert lp_model.task_names == list(task_names)
+    np.testing.assert_array_equal(lp_model.processing_times, processing_times)
+    np.testing.assert_array_equal(lp_model.capacities, capacities)
+    assert get_structure(lp_model.model, lp_model.variables) == get_structure(model, variables)
+
+
+@pytest.mark.parametrize("removed", [0, 1, 3])
+def test_remove_and_add_tasks_match_a_fresh_build(removed):
+    task_names, processing_times, capacities = make_instance(0, number_of_tasks=4)
+    lp_model = LinearProgrammingModel(task_names, processing_times, capacities, MIN_HOURS_WORKED, MAX_HOURS_WORKED)
+    lp_model.solve()
+
+    lp_model.remove_task(task_names[removed])
+    kept = [i for i in range(len(task_names)) if i != removed]
+    assert_same_model(lp_model, [task_names[i] for i in kept], processing_times[kept], capacities[kept])
+
+    lp_model.add_task(task_names[removed], processing_times[removed], capacities[removed])
+    order = kept + [removed]
+    assert_same_model(lp_model, [task_names[i] for i in order], processing_times[order], capacities[order])
+
+    result = lp_model.solve()
+    fresh = LinearProgrammingModel([task_names[i] for i in order], processing_times[order], capacities[order],
+                                   MIN_HOURS_WORKED, MAX_HOURS_WORKED).solve()
+    assert result.status == Status.OPTIMAL
+    assert result.objective_value == pytest.approx(fresh.objective_value)
+
+
+def test_remove_the_last_task_and_add_another():
+    task_names, processing_times, capacities = make_instance(1, number_of_tasks=2)
+    lp_model = LinearProgrammingModel(task_names[:1], processing_times[:1], capacities[:1], MIN_HOURS_WORKED,
+                                      MAX_HOURS_WORKED)
+    lp_model.solve()
+
+    lp_model.remove_task(task_names[0])
+    assert lp_model.task_names == []
+    assert not lp_model.solved
+
+    lp_model.add_task(task_names[1], processing_times[1], capacities[1])
+    assert_same_model(lp_model, task_names[1:], processing_times[1:], capacities[1:])
+
+    result = lp_model.solve()
+    fresh = LinearProgrammingModel(task_names[1:], processing_times[1:], capacities[1:], MIN_HOURS_WORKED,
+                                   MAX_HOURS_WORKED).solve()
+    assert result.objective_value == pytest.approx(fresh.objective_value)
+
+
+def test_is_feasible_without_tasks():
+    assert is_feasible(np.zeros((0, 3)), np.zeros((0, 3)), np.zeros(0), 0, 8)
+    assert not is_feasible(np.zeros((0, 3)), np.zeros((0, 3)), np.zeros(0), 1, 8)
@@ -0,0 +1,36 @@
+import json
+import pytest
+from pulp import LpProblem, LpMaximize, PULP_CBC_CMD
+from packages.linear_programming.lp_solver import LinearProgrammingModel, Status
+from packages.linear_programming.model_io import export_model, import_model, read_objective_sense
+from conftest import make_instance
+
+
+def make_model(seed=0):
+    return LinearProgrammingModel(*make_instance(seed), 0, 15)
+
+
+def test_exported_model_keeps_its_objective_sense(tmp_path):
+    lp_model = make_model()
+    expected = lp_model.solve()
+    mps_path, metadata_path = export_model(lp_model, str(tmp_path / "model"))
+
+    # The sense is read from the MPS file, not from the sidecar
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    del metadata["sense"]
+    with open(metadata_path, "w") as f:
+        json.dump(metadata, f)
+
+    assert read_objective_sense(mps_path) == LpMaximize
+
+    _, model = LpProblem.fromMPS(mps_path, sense=read_objective_sense(mps_path))
+    model.solve(PULP_CBC_CMD(msg=False))
+
+    imported = import_model(str(tmp_path / "model")).solve()
+
+    assert expected.status == Status.OPTIMAL
+    assert expected.objective_value > 0
+    assert model.objective.value() == pytest.approx(expected.objective_value)
+    assert imported.status == Status.OPTIMAL
+    assert imported.objective_value == pytest.approx(expected.objective_value)
@@ -0,0 +1,54 @@
+import threading
+import tracemalloc
+from packages.utils.profiling import PipelineProfile
+
+ALLOCATION_SIZE = 4 * 2**20
+
+
+def test_memory_is_only_traced_when_asked_for():
+    timing_only = PipelineProfile()
+    with timing_only.stage("build"):
+        assert not tracemalloc.is_tracing()
+        bytearray(ALLOCATION_SIZE)
+
+    traced = PipelineProfile(track_memory=True)
+    with traced.stage("build"):
+        assert tracemalloc.is_tracing()
+        bytearray(ALLOCATION_SIZE)  # Freed at once, only the peak sees it
+
+    assert timing_only.stages["build"]["peak_memory"] is None
+    assert timing_only.stages["build"]["wall_time"] >= 0
+    assert traced.stages["build"]["peak_memory"] >= ALLOCATION_SIZE
+    assert not tracemalloc.is_tracing()
+
+
+def test_concurrent_traced_stages_keep_tracing_until_they_end():
+    first_started, second_started, first_ended = threading.Event(), threading.Event(), threading.Event()
+    profiles = [PipelineProfile(track_memory=True) for _ in range(2)]
+    tracing = []
+
+    def run_first():
+        with profiles[0].stage("build"):
+            first_started.set()
+            second_started.wait(0.5)    # Only starts after this stage when traced stages are serialized
+            bytearray(ALLOCATION_SIZE)
+        first_ended.set()
+
+    def run_second():
+        first_started.wait(5)
+        with profiles[1].stage("build"):
+            second_started.set()
+            first_ended.wait(5)
+            bytearray(ALLOCATION_SIZE)
+            tracing.append(tracemalloc.is_tracing())
+
+    threads = [threading.Thread(target=run_first), threading.Thread(target=run_second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The first stage started the tracing, ending it must not stop the tracing of the second one
+    assert tracing == [True]
+    assert all(profile.stages["build"]["peak_memory"] >= ALLOCATION_SIZE for profile in profiles)
+    assert not tracemalloc.is_tracing()
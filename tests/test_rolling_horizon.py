@@ -0,0 +1,57 @@
+import numpy as np
+from packages.dataset_generator.datagen import draw_leave_mask
+from packages.linear_programming.lp_solver import Status
+from packages.linear_programming.rolling_horizon import iter_rolling_horizon, get_weekly_availability, \
+    get_period_capacities
+from packages.linear_programming.rounding import TOLERANCE
+from conftest import make_instance
+
+YEAR, MONTH, NUMBER_OF_MONTHS = 2023, 3, 1
+
+
+def make_horizon_instance(seed=0, number_of_employees=4):
+    _, processing_times, capacities = make_instance(seed, number_of_employees=number_of_employees,
+                                                    processing_time_range=(0.5, 2.0), capacity_range=(100, 200))
+    rng = np.random.default_rng(seed)
+    leave_masks = [draw_leave_mask(rng, number_of_employees) for _ in range(NUMBER_OF_MONTHS)]
+    return processing_times, capacities, leave_masks
+
+
+def plan(processing_times, capacities, leave_masks, window, step=1):
+    return list(iter_rolling_horizon(processing_times, capacities, YEAR, MONTH, NUMBER_OF_MONTHS, window=window,
+                                     step=step, leave_masks=leave_masks, gap=0.0))
+
+
+def test_windows_stitch_together():
+    processing_times, capacities, leave_masks = make_horizon_instance()
+    _, availability = get_weekly_availability(processing_times.shape[1], YEAR, MONTH, NUMBER_OF_MONTHS, leave_masks)
+    period_capacities = get_period_capacities(capacities, YEAR, MONTH, NUMBER_OF_MONTHS)
+
+    plans = plan(processing_times, capacities, leave_masks, window=2)
+
+    assert [p.period for p in plans] == list(range(availability.shape[1]))
+    work_in_progress = np.zeros(processing_times.shape[0])
+    for p in plans:
+        assert p.status in (Status.OPTIMAL, Status.FEASIBLE)
+        pieces = p.allocations.sum(axis=1)
+
+        # A task only processes what was waiting for it and what the previous task finished
+        assert np.all(pieces[1:] <= work_in_progress[1:] + pieces[:-1] + TOLERANCE)
+        assert np.all(p.employee_hours <= availability[:, p.period] + TOLERANCE)
+        assert np.all((p.allocations * processing_times).sum(axis=1) <= period_capacities[:, p.period] + TOLERANCE)
+
+        # The work in progress of a period is the one of the previous period plus what it left behind
+        work_in_progress[1:] += pieces[:-1] - pieces[1:]
+        assert np.allclose(p.work_in_progress, work_in_progress)
+        assert np.all(p.work_in_progress >= -TOLERANCE)
+
+
+def test_rolling_horizon_is_bounded_by_the_full_horizon():
+    processing_times, capacities, leave_masks = make_horizon_instance(1)
+
+    full = plan(processing_times, capacities, leave_masks, window=10)   # One window covers the whole month
+    rolling = plan(processing_times, capacities, leave_masks, window=2)
+
+    assert len(full) == len(rolling)
+    assert sum(p.completed_pieces for p in rolling) <= sum(p.completed_pieces for p in full) + TOLERANCE
+    assert sum(p.completed_pieces for p in rolling) > 0
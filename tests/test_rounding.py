@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from packages.linear_programming.lp_solver import LinearProgrammingModel, SolveMode, Status
+from packages.linear_programming.rounding import (TOLERANCE, round_allocations, is_feasible, fill_minimum_hours,
+                                                  get_hours)
+from conftest import make_instance
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("mode", [SolveMode.ROUNDING, SolveMode.POLISH])
+@pytest.mark.parametrize("min_hours_worked", [0, 6])
+def test_rounded_solution_is_feasible_and_bounded(seed, mode, min_hours_worked):
+    task_names, processing_times, capacities = make_instance(seed)
+    max_hours_worked = 15
+
+    exact = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked).solve()
+    result = LinearProgrammingModel(task_names, processing_times, capacities, min_hours_worked, max_hours_worked).solve(
+        mode=mode, time_limit=5)
+
+    assert exact.status == Status.OPTIMAL
+    assert result.status in (Status.OPTIMAL, Status.FEASIBLE)
+    assert is_feasible(result.allocations, processing_times, capacities, min_hours_worked, max_hours_worked)
+    assert result.objective_value <= result.relaxation_bound + TOLERANCE
+    assert result.objective_value <= exact.objective_value + TOLERANCE
+    assert exact.objective_value <= result.relaxation_bound + TOLERANCE
+
+
+def test_relaxation_bounds_exact_solve():
+    task_names, processing_times, capacities = make_instance(7)
+
+    exact = LinearProgrammingModel(task_names, processing_times, capacities, 0, 15).solve()
+    relaxation = LinearProgrammingModel(task_names, processing_times, capacities, 0, 15).solve(mode=SolveMode.RELAXATION)
+
+    assert relaxation.status == Status.OPTIMAL
+    assert exact.objective_value <= relaxation.relaxation_bound + TOLERANCE
+
+
+def test_round_allocations_keeps_tasks_balanced():
+    processing_times = np.ones((2, 3))
+    relaxed_allocations = np.array([[1.5, 2.7, 0.4], [2.2, 1.1, 1.9]])
+    capacities = np.array([10.0, 10.0])
+
+    allocations, feasible = round_allocations(relaxed_allocations, processing_times, capacities, 0, 4)
+
+    assert feasible
+    assert np.array_equal(allocations, np.round(allocations))
+    assert allocations[0].sum() == allocations[1].sum()
+    assert np.all((allocations * processing_times).sum(axis=0) <= 4)
+
+
+def test_fill_minimum_hours_moves_pieces_to_employees_below_the_minimum():
+    processing_times = np.array([[1.0, 2.0, 1.0], [1.0, 1.0, 2.0]])
+    allocations = np.array([[4.0, 0.0, 2.0], [3.0, 3.0, 0.0]])
+    capacities = np.array([20.0, 20.0])
+    hours = get_hours(allocations, processing_times)
+    assert hours[1] < 4
+
+    fill_minimum_hours(allocations, processing_times, capacities, hours, 4, 8)
+
+    np.testing.assert_array_equal(allocations.sum(axis=1), [6, 6])     # Every task keeps its pieces
+    np.testing.assert_allclose(hours, get_hours(allocations, processing_times))
+    assert is_feasible(allocations, processing_times, capacities, 4, 8)
+
+
+def test_round_allocations_repairs_the_minimum_hours():
+    processing_times = np.array([[1.0, 1.0, 1.0], [1.0, 1.0, 1.0]])
+    # The floor of this allocation leaves the last employee without work
+    relaxed_allocations = np.array([[3.0, 2.0, 0.6], [2.0, 3.0, 0.6]])
+    capacities = np.array([10.0, 10.0])
+
+    allocations, feasible = round_allocations(relaxed_allocations, processing_times, capacities, 2, 6)
+
+    assert feasible
+    assert allocations[0].sum() == allocations[1].sum()
+    assert np.all(get_hours(allocations, processing_times) >= 2)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from packages.gamification.scoring import get_productivity_points
+
+POINTS_PER_STAR = 100
+
+
+def get_reference_points(allocations, processing_times, difficulties, points_per_star):
+    """
+    The per-task loop the Gamification page used before the points were vectorized
+    """
+    points = np.full(allocations.shape, np.nan)
+    for task_index in range(allocations.shape[0]):
+        task_processing_times = processing_times[task_index]
+        points_to_distribute = points_per_star * difficulties[task_index]
+
+        task_workers_info = [index for index, value in enumerate(allocations[task_index]) if value > 0]
+        task_workers_info.sort(key=lambda x: task_processing_times[x], reverse=True)
+
+        number_of_task_workers = len(task_workers_info)
+        if number_of_task_workers == 0:     # The loop divided by zero
+            continue
+
+        sum_of_components = number_of_task_workers * (number_of_task_workers + 1) // 2
+        x = points_to_distribute / sum_of_components
+
+        for i in range(len(task_workers_info)):
+            points[task_index, task_workers_info[i]] = round(x * (i + 1))
+
+    return points
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_points_match_the_per_task_loop(seed):
+    rng = np.random.default_rng(seed)
+    allocations = rng.integers(0, 3, (8, 30)) * (rng.random((8, 30)) < 0.6)
+    allocations[0] = 0  # Nobody worked on the first task
+    allocations[1, :] = 1    # Everybody worked on the second one
+    processing_times = rng.choice([0.5, 1.0, 1.25, 2.0], (8, 30))  # Few values, so there are ties
+    processing_times[1] = 1.0    # Only ties
+    difficulties = rng.integers(1, 6, 8)
+
+    points = get_productivity_points(allocations, processing_times, difficulties, POINTS_PER_STAR)
+
+    np.testing.assert_array_equal(points, get_reference_points(allocations, processing_times, difficulties,
+                                                               POINTS_PER_STAR))
+    assert np.isnan(points[0]).all()
+    # Employees tied on processing time keep their order (30 workers share the points in steps of 1 / 465)
+    assert np.array_equal(points[1], np.round(POINTS_PER_STAR * difficulties[1] / 465 * np.arange(1, 31)))
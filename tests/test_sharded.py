@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from packages.gamification.leaderboards import finalize_leaderboard
+from packages.gamification.scoring import get_productivity_points
+from packages.gamification.sharded import assign_teams, build_team_leaderboards, merge_top_k, get_plant_rank
+
+NUMBER_OF_TASKS = 6
+NUMBER_OF_PLAYERS = 23
+POINTS_PER_STAR = 100
+K = 5
+
+
+def make_problem(seed):
+    rng = np.random.default_rng(seed)
+    task_names = [f"task{i:03d}" for i in range(NUMBER_OF_TASKS)]
+    allocations = rng.integers(0, 3, (NUMBER_OF_TASKS, NUMBER_OF_PLAYERS))
+    processing_times = rng.choice([1.0, 1.5, 2.0], (NUMBER_OF_TASKS, NUMBER_OF_PLAYERS))     # Ties on points
+    difficulties = rng.integers(1, 6, NUMBER_OF_TASKS)
+
+    return task_names, allocations, processing_times, difficulties
+
+
+def get_plant_leaderboard(allocations, processing_times, difficulties, teams):
+    """
+    Reference: scores each team on its own and sorts every player of the plant
+    """
+    parts = []
+    for team in pd.unique(teams):
+        players = np.flatnonzero(teams == team)
+        points = get_productivity_points(allocations[:, players], processing_times[:, players], difficulties,
+                                         POINTS_PER_STAR)
+        parts.append(pd.DataFrame({"Team": team, "Total Points": np.nansum(points, axis=0)}, index=players))
+
+    return finalize_leaderboard(pd.concat(parts))
+
+
+# Teams of one to three players have fewer than K players
+@pytest.mark.parametrize("number_of_teams", [1, 4, 8, 23])
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sharded_leaderboards_match_the_full_leaderboard(number_of_teams, max_workers):
+    task_names, allocations, processing_times, difficulties = make_problem(number_of_teams)
+    teams = assign_teams(NUMBER_OF_PLAYERS, number_of_teams)
+    expected = get_plant_leaderboard(allocations, processing_times, difficulties, teams)
+
+    team_leaderboards = build_team_leaderboards(task_names, allocations, processing_times, difficulties,
+                                                POINTS_PER_STAR, teams, k=K, max_workers=max_workers)
+
+    top = merge_top_k(team_leaderboards, K)
+    assert list(top.index) == list(expected.index[:K])
+    assert list(top["Player"]) == list(expected["Player"][:K])
+    assert list(top["Team"]) == list(expected["Team"][:K])
+    np.testing.assert_array_equal(top["Total Points"].to_numpy(dtype=np.float64),
+                                  expected["Total Points"][:K].to_numpy(dtype=np.float64))
+
+    for position, (player, team) in enumerate(zip(expected["Player"], expected["Team"])):
+        assert get_plant_rank(team_leaderboards, team, player) == position
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from packages.linear_programming.lp_solver import LinearProgrammingModel
+from packages.linear_programming import solution_cache
+from packages.linear_programming.solution_cache import SolutionCache, get_cache_key
+from conftest import make_instance
+
+
+def make_key(seed=0):
+    task_names, processing_times, capacities = make_instance(seed)
+    return get_cache_key(task_names, processing_times, capacities, np.ones(len(task_names)), 0, 15, mode="exact")
+
+
+@pytest.fixture(scope="module")
+def result():
+    return LinearProgrammingModel(*make_instance(0), 0, 15).solve()
+
+
+def test_cached_result_is_a_copy(tmp_path, result):
+    cache = SolutionCache(str(tmp_path))
+    key = make_key()
+    cache.put(key, result)
+
+    first = cache.get(key)
+    first.allocations[:] = -1
+    first.task_names.append("changed")
+
+    # Neither the memory tier nor the disk tier see the changes
+    for cached in (cache.get(key), SolutionCache(str(tmp_path)).get(key)):
+        assert cached is not first
+        assert cached.model is None
+        assert np.array_equal(cached.allocations, result.allocations)
+        assert cached.task_names == result.task_names
+
+
+# Truncated, corrupt, and pickles of a module or class that no longer exists
+@pytest.mark.parametrize("contents", [b"", b"not a pickle", b"cpackages.removed_module\nResult\n.",
+                                      b"cpackages.linear_programming.lp_solver\nRemovedResult\n."])
+def test_unloadable_result_is_a_miss(tmp_path, contents):
+    cache = SolutionCache(str(tmp_path))
+    key = make_key()
+    path = tmp_path / (key + ".pkl")
+    path.write_bytes(contents)
+
+    assert cache.get(key) is None
+    assert cache.get_stats()["misses"] == 1
+    assert not path.exists()
+
+
+def test_key_depends_on_the_format_version(monkeypatch):
+    key = make_key()
+    monkeypatch.setattr(solution_cache, "CACHE_FORMAT_VERSION", solution_cache.CACHE_FORMAT_VERSION + 1)
+
+    assert make_key() != key
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import pytest
+from packages.linear_programming.lp_solver import SolveMode
+from packages.linear_programming.solver_jobs import JobStatus, SolverJobQueue, terminal_output
+from conftest import make_instance
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs pseudo-terminals")
+
+
+def test_terminal_output_is_written_while_the_process_runs(tmp_path):
+    log_path = tmp_path / "solver.log"
+    # Python buffers its output in blocks unless it writes to a terminal, like CBC
+    script = "import sys, time; print('Continuous objective value is 5'); time.sleep(2)"
+
+    with terminal_output(str(log_path)) as logged:
+        assert logged
+        process = subprocess.Popen([sys.executable, "-c", script])
+        deadline = time.time() + 1.5
+        while time.time() < deadline and not (log_path.exists() and log_path.stat().st_size):
+            time.sleep(0.05)
+        written_while_running = process.poll() is None and log_path.read_text()
+        process.wait()
+
+    assert "Continuous objective value is 5" in written_while_running
+
+
+def test_progress_is_reported_before_the_job_finishes(tmp_path):
+    rng = np.random.default_rng(0)
+    processing_times = rng.uniform(0.5, 3.0, (40, 40)).round(2)
+    capacities = rng.uniform(20, 60, 40).round()
+    queue = SolverJobQueue(1, str(tmp_path))
+
+    job_id = queue.submit([f"task{i:03d}" for i in range(40)], processing_times, capacities, 0, 15,
+                          mode=SolveMode.EXACT, time_limit=4)
+
+    progress_while_running = None
+    while queue.get_status(job_id) in (JobStatus.PENDING, JobStatus.RUNNING):
+        progress = queue.get_progress(job_id)
+        if progress["status"] == JobStatus.RUNNING and progress["best_bound"] is not None:
+            progress_while_running = progress
+            break
+        time.sleep(0.1)
+    queue.cancel(job_id)
+
+    assert progress_while_running is not None
+    assert progress_while_running["best_bound"] > 0
+
+
+def wait_for(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while queue.get_status(job_id) in (JobStatus.PENDING, JobStatus.RUNNING) and time.time() < deadline:
+        time.sleep(0.1)
+    return queue.get_status(job_id)
+
+
+def test_job_started_from_a_worker_thread_returns_its_result(tmp_path):
+    task_names, processing_times, capacities = make_instance(0)
+    queue = SolverJobQueue(1, str(tmp_path))
+
+    job_id = queue.submit(task_names, processing_times, capacities, 0, 15)
+
+    assert queue.context.get_start_method() != "fork"
+    assert wait_for(queue, job_id) == JobStatus.DONE
+    assert queue.get_result(job_id).objective_value > 0
+
+
+def test_finished_jobs_are_removed(tmp_path):
+    task_names, processing_times, capacities = make_instance(0)
+    queue = SolverJobQueue(1, str(tmp_path), max_finished_jobs=1)
+
+    first, second = (queue.submit(task_names, processing_times, capacities, 0, 15) for _ in range(2))
+    for job_id in (first, second):
+        wait_for(queue, job_id)
+    queue.submit(task_names, processing_times, capacities, 0, 15)
+
+    # Only the most recent finished job is kept, with its log
+    with pytest.raises(KeyError):
+        queue.get_status(first)
+    assert not os.path.exists(os.path.join(str(tmp_path), f"{first}.log"))
+    assert queue.get_status(second) == JobStatus.DONE
+
+    queue.finished_job_max_age = 0
+    time.sleep(0.01)
+    queue.remove_finished_jobs()
+
+    with pytest.raises(KeyError):
+        queue.get_status(second)